@@ -0,0 +1,67 @@
+"""Concurrent enqueue throughput of the asyncio publishing engine.
+
+The ``enqueue`` tool publishes on one shared asyncio connection, each call awaiting its own
+confirm, so concurrent calls overlap their round trips. This benchmark issues ``--calls``
+enqueues at several concurrency levels and reports calls per second, and the speedup over
+awaiting one enqueue at a time:
+
+    python benchmarks/bench_async_publish.py --rabbitmq-host localhost --port 5672 \\
+        --username guest --password guest
+"""
+
+import argparse
+import asyncio
+import time
+
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.connection import RabbitMQConnection
+from mcp_server_rabbitmq.handlers import handle_enqueue_async
+
+
+async def run(connection: AsyncRabbitMQConnection, queue: str, calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i: int):
+        async with semaphore:
+            await handle_enqueue_async(connection, queue, f"message-{i}")
+
+    await asyncio.gather(*(call(i) for i in range(calls)))
+
+
+async def calls_per_second(connection: AsyncRabbitMQConnection, args, concurrency: int) -> float:
+    start = time.perf_counter()
+    await run(connection, args.queue, args.calls, concurrency)
+    return args.calls / (time.perf_counter() - start)
+
+
+async def main(args):
+    rabbitmq = RabbitMQConnection(
+        args.rabbitmq_host, args.port, args.username, args.password, args.use_tls
+    )
+    connection = AsyncRabbitMQConnection(rabbitmq)
+
+    # Warm up so connection setup and the queue declare are not measured
+    await run(connection, args.queue, 1, 1)
+
+    print(f"{'concurrency':>11} {'calls/s':>9} {'speedup':>8}")
+    # One call at a time comes first, as the baseline
+    baseline = None
+    for concurrency in sorted({1, *args.concurrency}):
+        rate = await calls_per_second(connection, args, concurrency)
+        baseline = baseline or rate
+        print(f"{concurrency:>11} {rate:>9.0f} {rate / baseline:>7.1f}x")
+
+    await connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rabbitmq-host", default="localhost")
+    parser.add_argument("--port", type=int, default=5672)
+    parser.add_argument("--username", default="guest")
+    parser.add_argument("--password", default="guest")
+    parser.add_argument("--use-tls", action="store_true")
+    parser.add_argument("--queue", default="mcp-benchmark")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,186 @@
+"""Many MCP clients sharing one server over the streamable HTTP transport.
+
+Starts the AMQP and management API stand-ins, runs the server CLI against them in its own
+process with ``--transport streamable-http`` and connects ``--clients`` MCP clients to it. Each
+client calls a slow management tool and a fast publishing tool in turn, so the report shows
+whether slow broker calls from some clients hold up the others, at each ``--workers`` size:
+
+    python benchmarks/bench_http_clients.py --clients 32 --calls 20 --workers 1 4 16 --api-latency 0.2
+
+Latency percentiles are reported per tool, across all clients, with the overall calls per second.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# The stand-ins live with the tests
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from fastmcp import Client  # noqa: E402
+
+from tests.standin import StandInBroker, StandInManagementAPI  # noqa: E402
+from tests.standin.net import StartGate, free_port  # noqa: E402
+
+QUEUE = "mcp-http-benchmark"
+
+
+def scenarios():
+    """Tool arguments for the i-th call of a client"""
+    return {
+        "list_queues": lambda i: {},
+        "get_queue_info": lambda i: {"queue": QUEUE},
+        "enqueue": lambda i: {"queue": QUEUE, "message": f"message-{i}"},
+        "fanout": lambda i: {"exchange": f"{QUEUE}-fanout", "message": f"message-{i}"},
+    }
+
+
+async def serve(args, broker: StandInBroker, api: StandInManagementAPI, workers: int, port: int):
+    """The server CLI in a subprocess, once it accepts connections"""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-W",
+            "ignore",
+            "-m",
+            "mcp_server_rabbitmq.server",
+            *("--rabbitmq-host", broker.host, "--port", str(broker.port)),
+            *("--username", api.username, "--password", api.password),
+            *("--api-port", str(api.port), "--api-cache-ttl", str(args.api_cache_ttl)),
+            *("--pool-size", str(args.pool_size), "--api-pool-size", str(args.api_pool_size)),
+            *("--transport", "streamable-http", "--server-port", str(port)),
+            *("--workers", str(workers)),
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return process
+    process.kill()
+    raise TimeoutError("Server didn't start")
+
+
+async def run_client(url: str, tools, calls: int, ready: StartGate, latencies, errors):
+    available = scenarios()
+    async with Client(url) as client:
+        await ready.wait()
+        for i in range(calls):
+            name = tools[i % len(tools)]
+            start = time.perf_counter()
+            result = await client.call_tool(name, available[name](i), raise_on_error=False)
+            latencies[name].append(time.perf_counter() - start)
+            if result.is_error:
+                errors[name] += 1
+
+
+async def bench_workers(args, workers: int):
+    with StandInBroker() as broker, StandInManagementAPI(broker) as api:
+        api.latency = args.api_latency
+        port = free_port()
+        server = await serve(args, broker, api, workers, port)
+        url = f"http://127.0.0.1:{port}/mcp/"
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        try:
+            # Create the queue the read tools look up
+            async with Client(url) as client:
+                await client.call_tool("enqueue", {"queue": QUEUE, "message": "seed"})
+
+            ready = StartGate(args.clients + 1)
+            clients = asyncio.gather(
+                *(
+                    run_client(url, args.tools, args.calls, ready, latencies, errors)
+                    for _ in range(args.clients)
+                )
+            )
+            # Time the calls, not the clients connecting
+            await ready.wait()
+            start = time.perf_counter()
+            await clients
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.wait()
+
+    rows = []
+    total = sum(len(values) for values in latencies.values())
+    for name in args.tools:
+        cuts = statistics.quantiles(latencies[name], n=100)
+        rows.append(
+            {
+                "workers": workers,
+                "tool": name,
+                "calls": len(latencies[name]),
+                "p50_ms": cuts[49] * 1000,
+                "p95_ms": cuts[94] * 1000,
+                "p99_ms": cuts[98] * 1000,
+                "calls_per_s": total / elapsed,
+                "errors": errors[name],
+            }
+        )
+    return rows
+
+
+def print_table(rows) -> None:
+    columns = [
+        ("workers", "workers", "{:>7}"),
+        ("tool", "tool", "{:<16}"),
+        ("calls", "calls", "{:>6}"),
+        ("p50_ms", "p50 ms", "{:>8.2f}"),
+        ("p95_ms", "p95 ms", "{:>8.2f}"),
+        ("p99_ms", "p99 ms", "{:>8.2f}"),
+        ("calls_per_s", "all calls/s", "{:>11.0f}"),
+        ("errors", "errors", "{:>6}"),
+    ]
+    widths = [len(fmt.format(rows[0][key])) for key, _, fmt in columns]
+    header = [f"{title:>{width}}" for (_, title, _), width in zip(columns, widths, strict=True)]
+    header[1] = f"{columns[1][1]:<{widths[1]}}"
+    print(" ".join(header))
+    for row in rows:
+        print(" ".join(fmt.format(row[key]) for key, _, fmt in columns))
+
+
+async def main(args) -> None:
+    rows = []
+    for workers in args.workers:
+        rows += await bench_workers(args, workers)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent MCP clients")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per client")
+    parser.add_argument(
+        "--tools",
+        nargs="+",
+        choices=sorted(scenarios()),
+        default=["list_queues", "enqueue"],
+        help="Tools each client calls in turn",
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--api-pool-size", type=int, default=16)
+    parser.add_argument("--api-cache-ttl", type=float, default=0.0)
+    parser.add_argument(
+        "--api-latency", type=float, default=0.2, help="Seconds added to each management call"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    asyncio.run(main(parser.parse_args()))
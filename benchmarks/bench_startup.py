@@ -0,0 +1,91 @@
+"""Cold start time of the server entry point, measured with ``python -X importtime``.
+
+Imports ``mcp_server_rabbitmq.server`` in a fresh interpreter per run, as an MCP client does
+when it spawns the server over stdio, and reports the median total import time, the time
+spent in this package's own modules, and the top-level packages that cost the most:
+
+    python benchmarks/bench_startup.py --runs 10 --top 15
+
+Broker client libraries (pika, requests, urllib3) are only imported once a tool needs them,
+so they should not show up here at all; ``--module`` measures another entry point.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+PACKAGE = "mcp_server_rabbitmq"
+DEFERRED = ("pika", "requests", "urllib3")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(module: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, nesting level) of every import done by ``module``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize(rows: List[Tuple[str, int, int, int]]) -> dict:
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    return {
+        "total_ms": sum(cumulative for _, _, cumulative, level in rows if level == 0) / 1000,
+        "package_ms": by_package[PACKAGE] / 1000,
+        "packages_ms": {name: us / 1000 for name, us in by_package.items()},
+        "deferred_loaded": sorted({p for p in DEFERRED if p in by_package}),
+    }
+
+
+def main(args) -> None:
+    runs = [summarize(import_times(args.module)) for _ in range(args.runs)]
+    packages = {
+        name: statistics.median(run["packages_ms"].get(name, 0.0) for run in runs)
+        for name in runs[-1]["packages_ms"]
+    }
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "total_ms": statistics.median(run["total_ms"] for run in runs),
+        "package_ms": statistics.median(run["package_ms"] for run in runs),
+        "deferred_loaded": runs[-1]["deferred_loaded"],
+        "top_packages_ms": dict(sorted(packages.items(), key=lambda item: -item[1])[: args.top]),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"import {args.module}: median of {args.runs} runs")
+    print(f"  {'total':<24} {report['total_ms']:9.1f} ms")
+    print(f"  {PACKAGE:<24} {report['package_ms']:9.1f} ms")
+    loaded = ", ".join(report["deferred_loaded"]) or "none"
+    print(f"  deferred libraries loaded at startup: {loaded}")
+    print("top-level packages by self time:")
+    for name, ms in report["top_packages_ms"].items():
+        print(f"  {name:<24} {ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=f"{PACKAGE}.server", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    main(parser.parse_args())
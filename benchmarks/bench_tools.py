@@ -0,0 +1,198 @@
+"""Latency and throughput of the MCP tools against an in-process broker stand-in.
+
+Starts a fake AMQP endpoint and management API on localhost, points a ``RabbitMQMCPServer`` at
+them and calls its tools in-process at each concurrency level, reporting latency percentiles,
+calls and messages per second, and how many AMQP and HTTP connections the server opened:
+
+    python benchmarks/bench_tools.py --calls 2000 --concurrency 1 8 32
+
+Tools are invoked the way FastMCP runs them (blocking ones on the server's worker pool); pass
+``--client`` to go through an in-memory MCP client session as well, and ``--json`` for machine
+readable output to compare runs.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# The stand-ins live with the tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastmcp import Client  # noqa: E402
+from fastmcp.exceptions import ToolError  # noqa: E402
+
+from mcp_server_rabbitmq.server import RabbitMQMCPServer  # noqa: E402
+from tests.standin import StandInBroker, StandInManagementAPI  # noqa: E402
+
+QUEUE = "mcp-benchmark"
+EXCHANGE = "mcp-benchmark-fanout"
+
+
+def scenarios(batch_size: int):
+    """Tool arguments for the i-th call, and the messages each call publishes"""
+    batch = [{"body": "x" * 64, "routing_key": QUEUE} for _ in range(batch_size)]
+    return {
+        "enqueue": (lambda i: {"queue": QUEUE, "message": f"message-{i}"}, 1),
+        "fanout": (lambda i: {"exchange": EXCHANGE, "message": f"message-{i}"}, 1),
+        "publish_batch": (lambda i: {"messages": batch}, batch_size),
+        "list_queues": (lambda i: {}, 0),
+        "get_queue_info": (lambda i: {"queue": QUEUE}, 0),
+        "get_exchange_info": (lambda i: {"exchange": EXCHANGE}, 0),
+        "get_queues_info": (lambda i: {"pattern": f"^{QUEUE}$"}, 0),
+        "topology_snapshot": (lambda i: {}, 0),
+        "peek": (lambda i: {"queue": QUEUE, "max_messages": 10}, 0),
+    }
+
+
+class ToolCaller:
+    """Calls tools on a server directly or through an in-memory MCP client"""
+
+    def __init__(self, server: RabbitMQMCPServer, use_client: bool):
+        self.server = server
+        self.use_client = use_client
+        self.client = None
+        self.tools = {}
+
+    async def __aenter__(self) -> "ToolCaller":
+        if self.use_client:
+            self.client = await Client(self.server.mcp).__aenter__()
+        else:
+            self.tools = await self.server.mcp.get_tools()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self.client is not None:
+            await self.client.__aexit__(*exc)
+
+    async def call(self, name: str, arguments: dict) -> str:
+        if self.client is not None:
+            result = await self.client.call_tool(name, arguments)
+        else:
+            result = await self.tools[name].run(arguments)
+        return result.content[0].text
+
+
+async def run_level(caller: ToolCaller, name: str, arguments, calls: int, concurrency: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Read tools raise on failure, write tools return a "Failed ..." message
+                failed = (await caller.call(name, arguments(i))).startswith("Failed")
+            except ToolError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            if failed:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies, time.perf_counter() - start, errors
+
+
+async def bench_tool(args, name: str, arguments, messages_per_call: int):
+    rows = []
+    with StandInBroker() as broker, StandInManagementAPI(broker) as api:
+        api.latency = args.api_latency
+        server = RabbitMQMCPServer(
+            broker.host,
+            broker.port,
+            api.username,
+            api.password,
+            False,
+            api.port,
+            pool_size=args.pool_size,
+            api_cache_ttl=args.api_cache_ttl,
+        )
+        # Create the objects the read tools look up; connections opened here aren't counted
+        tools = await server.mcp.get_tools()
+        await tools["enqueue"].run({"queue": QUEUE, "message": "seed"})
+        await tools["fanout"].run({"exchange": EXCHANGE, "message": "seed"})
+
+        async with ToolCaller(server, args.client) as caller:
+            for concurrency in args.concurrency:
+                before = (broker.connections_opened, api.connections)
+                latencies, elapsed, errors = await run_level(
+                    caller, name, arguments, args.calls, concurrency
+                )
+                cuts = statistics.quantiles(latencies, n=100)
+                rows.append(
+                    {
+                        "tool": name,
+                        "concurrency": concurrency,
+                        "calls": args.calls,
+                        "p50_ms": cuts[49] * 1000,
+                        "p95_ms": cuts[94] * 1000,
+                        "p99_ms": cuts[98] * 1000,
+                        "calls_per_s": args.calls / elapsed,
+                        "msgs_per_s": args.calls * messages_per_call / elapsed,
+                        "amqp_connections": broker.connections_opened - before[0],
+                        "http_connections": api.connections - before[1],
+                        "errors": errors,
+                    }
+                )
+        await server.aclose()
+    return rows
+
+
+def print_table(rows) -> None:
+    columns = [
+        ("tool", "tool", "{:<18}"),
+        ("concurrency", "conc", "{:>5}"),
+        ("p50_ms", "p50 ms", "{:>8.2f}"),
+        ("p95_ms", "p95 ms", "{:>8.2f}"),
+        ("p99_ms", "p99 ms", "{:>8.2f}"),
+        ("calls_per_s", "calls/s", "{:>9.0f}"),
+        ("msgs_per_s", "msgs/s", "{:>9.0f}"),
+        ("amqp_connections", "amqp conns", "{:>10}"),
+        ("http_connections", "http conns", "{:>10}"),
+        ("errors", "errors", "{:>6}"),
+    ]
+    widths = [len(fmt.format(rows[0][key])) for key, _, fmt in columns]
+    header = [f"{title:>{width}}" for (_, title, _), width in zip(columns, widths, strict=True)]
+    header[0] = f"{columns[0][1]:<{widths[0]}}"
+    print(" ".join(header))
+    for row in rows:
+        print(" ".join(fmt.format(row[key]) for key, _, fmt in columns))
+
+
+async def main(args) -> None:
+    available = scenarios(args.batch_size)
+    rows = []
+    for name in args.tools:
+        arguments, messages_per_call = available[name]
+        rows += await bench_tool(args, name, arguments, messages_per_call)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tools",
+        nargs="+",
+        choices=sorted(scenarios(1)),
+        default=["enqueue", "fanout", "publish_batch", "list_queues", "get_queue_info"],
+    )
+    parser.add_argument("--calls", type=int, default=1000, help="Calls per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, default=100, help="Messages per publish_batch")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--api-cache-ttl", type=float, default=5.0)
+    parser.add_argument(
+        "--api-latency", type=float, default=0.0, help="Seconds added to each management call"
+    )
+    parser.add_argument("--client", action="store_true", help="Call through an MCP client")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    asyncio.run(main(parser.parse_args()))
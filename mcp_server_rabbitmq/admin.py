@@ -1,65 +1,304 @@
 import base64
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from mcp_server_rabbitmq.connection import validate_rabbitmq_name
+from mcp_server_rabbitmq.cache import TTLCache
+from mcp_server_rabbitmq.cluster import ClusterNodes, Node, parse_nodes
+from mcp_server_rabbitmq.metrics import (
+    HTTP_DURATION,
+    HTTP_ERRORS,
+    HTTP_RESPONSE_BYTES,
+    endpoint_label,
+)
+from mcp_server_rabbitmq.streaming import iter_json_array
+from mcp_server_rabbitmq.validation import validate_rabbitmq_name
+
+# Responses worth retrying: the management plugin is restarting or overloaded
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Errors after which a request is retried on the next cluster node
+FAILOVER_ERRORS = (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+# Largest page the management API will return
+MAX_PAGE_SIZE = 500
+
+# Bytes read from the socket at a time when streaming a listing
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class RabbitMQAdmin:
-    def __init__(self, host: str, port: int, username: str, password: str, use_tls: bool):
+    """Management API client for one broker or the nodes of a cluster.
+
+    ``host`` may list several nodes ("node1,node2:15673" or a list); each request goes to a
+    healthy node chosen by ``strategy`` and is retried on the next one if the node can't be
+    reached or answers with a 5xx error.
+    """
+
+    def __init__(
+        self,
+        host: Union[str, Sequence[str]],
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.2,
+        cache_ttl: float = 5.0,
+        cache_stale_ttl: float = 10.0,
+        cache_max_size: int = 256,
+        strategy: str = "round-robin",
+        health_check_interval: float = 10.0,
+    ):
         self.protocol = "https" if use_tls else "http"
-        self.base_url = f"{self.protocol}://{host}:{port}/api"
+        self.nodes = ClusterNodes(
+            parse_nodes(host, port),
+            strategy,
+            probe=self._probe,
+            check_interval=health_check_interval,
+            client="api",
+        )
+        self.base_url = self._base_url(self.nodes.nodes[0])
         self.auth = base64.b64encode(f"{username}:{password}".encode()).decode()
         self.headers = {"Authorization": f"Basic {self.auth}", "Content-Type": "application/json"}
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+
+        # One keep-alive session per client so requests reuse TCP/TLS connections
+        retry = Retry(
+            total=max_retries,
+            # With other nodes to fail over to, don't wait on one that refuses connections
+            connect=0 if len(self.nodes.nodes) > 1 else None,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=len(self.nodes.nodes), pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount(f"{self.protocol}://", adapter)
+
+        # Read results keyed by endpoint path, which includes the vhost; 0 TTL disables caching
+        self.cache = TTLCache(cache_ttl, stale_ttl=cache_stale_ttl, max_size=cache_max_size)
+
+    def _base_url(self, node: Node) -> str:
+        return f"{self.protocol}://{node}/api"
+
+    def _send(
+        self,
+        node: Node,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        label = endpoint_label(endpoint)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                f"{self._base_url(node)}/{endpoint}",
+                json=data,
+                timeout=self.timeout,
+                verify=True,
+                stream=stream,
+            )
+        except requests.RequestException as e:
+            HTTP_ERRORS.inc(endpoint=label, reason=type(e).__name__)
+            raise
+        HTTP_DURATION.observe(time.perf_counter() - start, method=method, endpoint=label)
+        if not response.ok:
+            HTTP_ERRORS.inc(endpoint=label, reason=response.status_code)
+        if response.status_code in RETRY_STATUS_CODES:
+            # The node is up but unwell: let the next one answer
+            response.close()
+            response.raise_for_status()
+        return response
 
     def _make_request(
         self, method: str, endpoint: str, data: Optional[Dict] = None
     ) -> requests.Response:
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.request(method, url, headers=self.headers, json=data, verify=True)
+        response = self.nodes.call(
+            lambda node: self._send(node, method, endpoint, data), failover=FAILOVER_ERRORS
+        )
+        HTTP_RESPONSE_BYTES.observe(len(response.content), endpoint=endpoint_label(endpoint))
         response.raise_for_status()
         return response
 
-    def list_queues(self) -> List[Dict]:
-        """List all queues in the RabbitMQ server"""
-        response = self._make_request("GET", "queues")
-        return response.json()
+    def _get(self, endpoint: str):
+        return self.cache.get(endpoint, lambda: self._make_request("GET", endpoint).json())
+
+    def _stream(self, endpoint: str) -> Iterator[Dict]:
+        # Bypasses the cache: the point is to never hold the whole listing
+        response = self.nodes.call(
+            lambda node: self._send(node, "GET", endpoint, stream=True), failover=FAILOVER_ERRORS
+        )
+        received = 0
 
-    def list_exchanges(self) -> List[Dict]:
-        """List all exchanges in the RabbitMQ server"""
-        response = self._make_request("GET", "exchanges")
-        return response.json()
+        def chunks() -> Iterator[bytes]:
+            nonlocal received
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+
+        with response:
+            response.raise_for_status()
+            yield from iter_json_array(chunks())
+        HTTP_RESPONSE_BYTES.observe(received, endpoint=endpoint_label(endpoint))
+
+    def _probe(self, node: Node) -> None:
+        # Fails while the node is unreachable or has a resource alarm in effect
+        self._send(node, "GET", "health/checks/alarms").raise_for_status()
+
+    def close(self) -> None:
+        """Close pooled HTTP connections and stop the node health checks"""
+        self.nodes.close()
+        self.cache.close()
+        self.session.close()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters for cached management API reads"""
+        return self.cache.stats()
+
+    def _list_endpoint(
+        self,
+        kind: str,
+        vhost: Optional[str] = None,
+        page: Optional[int] = None,
+        page_size: int = 100,
+        name: Optional[str] = None,
+        use_regex: bool = False,
+        columns: Optional[List[str]] = None,
+        disable_stats: bool = False,
+    ) -> str:
+        endpoint = kind
+        if vhost is not None:
+            endpoint += "/" + requests.utils.quote(vhost, safe="")
+        params = {}
+        if page is not None:
+            if page < 1:
+                raise ValueError("Page must be at least 1")
+            if not 1 <= page_size <= MAX_PAGE_SIZE:
+                raise ValueError(f"Page size must be between 1 and {MAX_PAGE_SIZE}")
+            params["page"] = page
+            params["page_size"] = page_size
+            # The management API only filters by name when paginating
+            if name:
+                params["name"] = name
+                params["use_regex"] = "true" if use_regex else "false"
+        if columns:
+            params["columns"] = ",".join(columns)
+        if disable_stats:
+            params["disable_stats"] = "true"
+        if params:
+            endpoint += "?" + urlencode(params)
+        return endpoint
+
+    def list_queues(
+        self,
+        vhost: Optional[str] = None,
+        page: Optional[int] = None,
+        page_size: int = 100,
+        name: Optional[str] = None,
+        use_regex: bool = False,
+        columns: Optional[List[str]] = None,
+        disable_stats: bool = False,
+    ) -> Union[List[Dict], Dict]:
+        """List queues in the RabbitMQ server, or one page of them if ``page`` is given"""
+        return self._get(
+            self._list_endpoint(
+                "queues", vhost, page, page_size, name, use_regex, columns, disable_stats
+            )
+        )
+
+    def list_exchanges(
+        self,
+        vhost: Optional[str] = None,
+        page: Optional[int] = None,
+        page_size: int = 100,
+        name: Optional[str] = None,
+        use_regex: bool = False,
+        columns: Optional[List[str]] = None,
+        disable_stats: bool = False,
+    ) -> Union[List[Dict], Dict]:
+        """List exchanges in the RabbitMQ server, or one page of them if ``page`` is given"""
+        return self._get(
+            self._list_endpoint(
+                "exchanges", vhost, page, page_size, name, use_regex, columns, disable_stats
+            )
+        )
+
+    def iter_queues(
+        self,
+        vhost: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        disable_stats: bool = False,
+    ) -> Iterator[Dict]:
+        """Stream queues one at a time without loading the whole listing"""
+        return self._stream(
+            self._list_endpoint("queues", vhost, columns=columns, disable_stats=disable_stats)
+        )
+
+    def iter_exchanges(
+        self,
+        vhost: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        disable_stats: bool = False,
+    ) -> Iterator[Dict]:
+        """Stream exchanges one at a time without loading the whole listing"""
+        return self._stream(
+            self._list_endpoint("exchanges", vhost, columns=columns, disable_stats=disable_stats)
+        )
+
+    def iter_bindings(self, vhost: Optional[str] = None) -> Iterator[Dict]:
+        """Stream bindings one at a time without loading the whole listing"""
+        return self._stream(self._list_endpoint("bindings", vhost))
 
     def get_queue_info(self, queue: str, vhost: str = "/") -> Dict:
         """Get detailed information about a specific queue"""
         vhost_encoded = requests.utils.quote(vhost, safe="")
-        response = self._make_request("GET", f"queues/{vhost_encoded}/{queue}")
-        return response.json()
+        return self._get(f"queues/{vhost_encoded}/{queue}")
 
     def delete_queue(self, queue: str, vhost: str = "/") -> None:
         """Delete a queue"""
         validate_rabbitmq_name(queue, "Queue name")
         vhost_encoded = requests.utils.quote(vhost, safe="")
         self._make_request("DELETE", f"queues/{vhost_encoded}/{queue}")
+        # Deleting a queue also removes its bindings, so drop everything
+        self.cache.invalidate()
 
     def purge_queue(self, queue: str, vhost: str = "/") -> None:
         """Remove all messages from a queue"""
         validate_rabbitmq_name(queue, "Queue name")
         vhost_encoded = requests.utils.quote(vhost, safe="")
         self._make_request("DELETE", f"queues/{vhost_encoded}/{queue}/contents")
+        self.invalidate_queues()
+
+    def invalidate_queues(self) -> None:
+        """Drop cached queue details and listings, after their message counts changed"""
+        self.cache.invalidate("queues", "overview")
 
     def get_exchange_info(self, exchange: str, vhost: str = "/") -> Dict:
         """Get detailed information about a specific exchange"""
         vhost_encoded = requests.utils.quote(vhost, safe="")
-        response = self._make_request("GET", f"exchanges/{vhost_encoded}/{exchange}")
-        return response.json()
+        return self._get(f"exchanges/{vhost_encoded}/{exchange}")
 
     def delete_exchange(self, exchange: str, vhost: str = "/") -> None:
         """Delete an exchange"""
         validate_rabbitmq_name(exchange, "Exchange name")
         vhost_encoded = requests.utils.quote(vhost, safe="")
         self._make_request("DELETE", f"exchanges/{vhost_encoded}/{exchange}")
+        self.cache.invalidate()
 
     def get_bindings(
         self, queue: Optional[str] = None, exchange: Optional[str] = None, vhost: str = "/"
@@ -68,17 +307,12 @@ class RabbitMQAdmin:
         vhost_encoded = requests.utils.quote(vhost, safe="")
         if queue:
             validate_rabbitmq_name(queue, "Queue name")
-            response = self._make_request("GET", f"queues/{vhost_encoded}/{queue}/bindings")
-        elif exchange:
+            return self._get(f"queues/{vhost_encoded}/{queue}/bindings")
+        if exchange:
             validate_rabbitmq_name(exchange, "Exchange name")
-            response = self._make_request(
-                "GET", f"exchanges/{vhost_encoded}/{exchange}/bindings/source"
-            )
-        else:
-            response = self._make_request("GET", f"bindings/{vhost_encoded}")
-        return response.json()
+            return self._get(f"exchanges/{vhost_encoded}/{exchange}/bindings/source")
+        return self._get(f"bindings/{vhost_encoded}")
 
     def get_overview(self) -> Dict:
         """Get overview of RabbitMQ server including version, stats, and listeners"""
-        response = self._make_request("GET", "overview")
-        return response.json()
+        return self._get("overview")
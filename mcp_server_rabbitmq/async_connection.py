@@ -0,0 +1,300 @@
+"""Asyncio-native AMQP connection for the publishing tools."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from pika import BasicProperties, spec
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.exceptions import AMQPConnectionError, ChannelClosed, ConnectionBlockedTimeout
+
+from mcp_server_rabbitmq.cluster import Node
+from mcp_server_rabbitmq.connection import DeclarationCache, RabbitMQConnection
+from mcp_server_rabbitmq.constant import ACK, NACK, RETURNED
+from mcp_server_rabbitmq.metrics import (
+    AMQP_CONNECT_DURATION,
+    AMQP_CONNECT_ERRORS,
+    PUBLISH_THROTTLED,
+)
+from mcp_server_rabbitmq.ratelimit import Throttled
+
+
+class AsyncRabbitMQConnection:
+    """A single connection and confirm-mode channel shared by concurrent coroutines.
+
+    The connection runs on the caller's event loop through pika's ``AsyncioConnection``, so
+    publishes never block the loop: each one is written immediately and its coroutine then
+    awaits the broker's confirm, letting any number of publishes be in flight at once. The
+    connection is opened on first use and reopened after it or its channel closes.
+    """
+
+    def __init__(
+        self,
+        rabbitmq: RabbitMQConnection,
+        timeout: float = 30.0,
+        declare_ttl: float = 300.0,
+        blocked_timeout: float = 5.0,
+    ):
+        self.rabbitmq = rabbitmq
+        self.timeout = timeout
+        self.blocked_timeout = blocked_timeout
+        self.declared = DeclarationCache(declare_ttl)
+        # Reason the broker gave for blocking publishers (a resource alarm), while it lasts
+        self.blocked: Optional[str] = None
+        self._unblocked: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection: Optional[AsyncioConnection] = None
+        self._channel_ready: Optional[asyncio.Future] = None
+        self._closed: Optional[asyncio.Future] = None
+        self._publish_seq = 0
+        # Outstanding confirms by delivery tag, in publish order
+        self._confirms: Dict[int, asyncio.Future] = {}
+        # Where unconfirmed mandatory publishes went, and those the broker returned
+        self._mandatory: Dict[int, tuple] = {}
+        self._returned: Set[int] = set()
+        # Outstanding RPCs (declares) that fail if the channel closes, by request
+        self._rpcs: Set[asyncio.Future] = set()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    async def publish(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: Any,
+        properties: Optional[BasicProperties] = None,
+        mandatory: bool = False,
+    ) -> str:
+        """Publish a message; returns ``"ack"`` once acked by the broker, ``"nack"`` if nacked.
+
+        With ``mandatory``, a message that no queue receives is ``"returned"`` by the broker.
+        """
+        channel = await self._get_channel()
+        confirm = self._loop.create_future()
+        self._publish_seq += 1
+        self._confirms[self._publish_seq] = confirm
+        if mandatory:
+            self._mandatory[self._publish_seq] = (exchange, routing_key)
+        channel.basic_publish(exchange, routing_key, body, properties, mandatory)
+        try:
+            return await asyncio.wait_for(confirm, self.timeout)
+        except ConnectionBlockedTimeout as e:
+            # The broker stopped reading before it got to this message
+            PUBLISH_THROTTLED.inc(reason="blocked")
+            raise Throttled(f"Broker blocked publishers for over {self.blocked_timeout:g}s") from e
+
+    async def wait_unblocked(self) -> None:
+        """Wait up to ``blocked_timeout`` for the broker to lift a block on publishing.
+
+        A blocked broker stops reading from publishers, so a publish would only wait out its
+        confirm timeout; raises Throttled if the block outlasts the wait.
+        """
+        reason = self.blocked
+        if reason is None:
+            return
+        connection = self._connection
+        try:
+            await asyncio.wait_for(self._unblocked.wait(), self.blocked_timeout)
+        except asyncio.TimeoutError:
+            pass
+        # Still blocked, or the connection was closed for staying blocked too long
+        if self.blocked is not None or self._connection is not connection:
+            PUBLISH_THROTTLED.inc(reason="blocked")
+            raise Throttled(f"Broker is blocking publishers: {reason}")
+
+    async def queue_declare(self, queue: str, **kwargs) -> None:
+        """Declare a queue unless this connection already declared it the same way"""
+        channel = await self._get_channel()
+        key = DeclarationCache.key("queue", queue, **kwargs)
+        if key not in self.declared:
+            await self._coalesced_rpc(
+                key, lambda callback: channel.queue_declare(queue, callback=callback, **kwargs)
+            )
+            self.declared.add(key)
+
+    async def exchange_declare(self, exchange: str, **kwargs) -> None:
+        """Declare an exchange unless this connection already declared it the same way"""
+        channel = await self._get_channel()
+        key = DeclarationCache.key("exchange", exchange, **kwargs)
+        if key not in self.declared:
+            await self._coalesced_rpc(
+                key,
+                lambda callback: channel.exchange_declare(exchange, callback=callback, **kwargs),
+            )
+            self.declared.add(key)
+
+    def forget_declared(self, kind: str, name: Optional[str] = None) -> None:
+        """Declare a deleted queue or exchange again before the next publish to it"""
+        self.declared.forget(kind, name)
+
+    async def close(self) -> None:
+        """Close the connection, waiting up to ``timeout`` for the broker to confirm"""
+        connection = self._connection
+        self._connection = None
+        self._channel_ready = None
+        if connection is None or self._loop is not asyncio.get_running_loop():
+            return
+        if connection.is_open:
+            self._closed = self._loop.create_future()
+            connection.close()
+            await asyncio.wait_for(asyncio.shield(self._closed), self.timeout)
+
+    async def _coalesced_rpc(self, key: tuple, call) -> Any:
+        # RPCs on a channel run one at a time, so identical declares issued concurrently share
+        # a single round trip instead of queueing behind each other
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = self._loop.create_future()
+            self._rpcs.add(future)
+
+            def callback(frame) -> None:
+                self._inflight.pop(key, None)
+                self._rpcs.discard(future)
+                if not future.done():
+                    future.set_result(frame)
+
+            call(callback)
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    async def _get_channel(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections are bound to the loop they were opened on
+            self._connection = None
+            self._channel_ready = None
+            self._loop = loop
+            self._unblocked = asyncio.Event()
+            self._set_blocked(None)
+        ready = self._channel_ready
+        if ready is None or (ready.done() and ready.exception() is not None):
+            ready = self._channel_ready = loop.create_future()
+            if self._connection is not None and self._connection.is_open:
+                self._open_channel(self._connection, ready)
+            else:
+                self._open_connection(ready)
+        # Shield so one cancelled caller doesn't abort the open for everyone waiting on it
+        return await asyncio.wait_for(asyncio.shield(ready), self.timeout)
+
+    def _open_connection(self, ready: asyncio.Future, nodes: Optional[List[Node]] = None) -> None:
+        # Try the cluster's nodes in order until one accepts the connection
+        if nodes is None:
+            nodes = self.rabbitmq.nodes.candidates()
+        node, nodes = nodes[0], nodes[1:]
+        start = time.perf_counter()
+
+        def on_open(connection) -> None:
+            elapsed = time.perf_counter() - start
+            AMQP_CONNECT_DURATION.observe(elapsed, client="asyncio")
+            self.rabbitmq.nodes.mark_success(node, elapsed)
+            self._open_channel(connection, ready)
+
+        def on_open_error(connection, error) -> None:
+            AMQP_CONNECT_ERRORS.inc(client="asyncio")
+            self.rabbitmq.nodes.mark_failure(node)
+            if nodes and not ready.done() and connection is self._connection:
+                self._open_connection(ready, nodes)
+            elif not ready.done():
+                ready.set_exception(AMQPConnectionError(error))
+
+        def on_closed(connection, reason) -> None:
+            if connection is self._connection:
+                self._connection = None
+                self._channel_ready = None
+                self._set_blocked(None)
+            if self._closed is not None and not self._closed.done():
+                self._closed.set_result(None)
+            self._fail_pending(reason)
+            if not ready.done():
+                ready.set_exception(AMQPConnectionError(reason))
+
+        def on_blocked(connection, method_frame) -> None:
+            if connection is self._connection:
+                self._set_blocked(method_frame.method.reason or "resource alarm")
+
+        def on_unblocked(connection, method_frame) -> None:
+            if connection is self._connection:
+                self._set_blocked(None)
+
+        self._connection = AsyncioConnection(
+            self.rabbitmq.parameters_for(node),
+            on_open_callback=on_open,
+            on_open_error_callback=on_open_error,
+            on_close_callback=on_closed,
+            custom_ioloop=self._loop,
+        )
+        self._connection.add_on_connection_blocked_callback(on_blocked)
+        self._connection.add_on_connection_unblocked_callback(on_unblocked)
+
+    def _set_blocked(self, reason: Optional[str]) -> None:
+        self.blocked = reason
+        if self._unblocked is None:
+            return
+        if reason is None:
+            self._unblocked.set()
+        else:
+            self._unblocked.clear()
+
+    def _open_channel(self, connection: AsyncioConnection, ready: asyncio.Future) -> None:
+        def on_channel_open(channel) -> None:
+            channel.add_on_close_callback(on_channel_closed)
+            channel.add_on_return_callback(self._on_return)
+            channel.confirm_delivery(
+                ack_nack_callback=self._on_confirm, callback=lambda _: on_selected(channel)
+            )
+
+        def on_selected(channel) -> None:
+            self._publish_seq = 0
+            if not ready.done():
+                ready.set_result(channel)
+
+        def on_channel_closed(channel, reason) -> None:
+            if self._channel_ready is ready:
+                self._channel_ready = None
+            self._fail_pending(reason)
+            if not ready.done():
+                ready.set_exception(reason)
+
+        connection.channel(on_open_callback=on_channel_open)
+
+    def _on_return(self, channel, method, properties, body) -> None:
+        # The broker sends basic.return just before the ack of the same message, so it belongs
+        # to the earliest unconfirmed mandatory publish to the same place
+        route = (method.exchange, method.routing_key)
+        for tag, published in self._mandatory.items():
+            if published == route:
+                del self._mandatory[tag]
+                self._returned.add(tag)
+                return
+
+    def _on_confirm(self, method_frame) -> None:
+        method = method_frame.method
+        acked = isinstance(method, spec.Basic.Ack)
+        tags = [method.delivery_tag]
+        if method.multiple:
+            # Confirms are keyed in publish order, so stop at the first later tag
+            tags = []
+            for tag in self._confirms:
+                if tag > method.delivery_tag:
+                    break
+                tags.append(tag)
+        for tag in tags:
+            confirm = self._confirms.pop(tag, None)
+            self._mandatory.pop(tag, None)
+            returned = tag in self._returned
+            self._returned.discard(tag)
+            if confirm is not None and not confirm.done():
+                confirm.set_result(NACK if not acked else RETURNED if returned else ACK)
+
+    def _fail_pending(self, reason: BaseException) -> None:
+        # Called whenever the channel or connection closes: declarations may be gone too
+        self.declared.clear()
+        if not isinstance(reason, BaseException):
+            reason = ChannelClosed(-1, str(reason))
+        pending = list(self._confirms.values()) + list(self._rpcs)
+        self._confirms.clear()
+        self._mandatory.clear()
+        self._returned.clear()
+        self._rpcs.clear()
+        self._inflight.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(reason)
@@ -0,0 +1,118 @@
+"""In-memory caching for management API reads."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+
+class _Entry:
+    __slots__ = ("value", "stored")
+
+    def __init__(self, value: Any, stored: float):
+        self.value = value
+        self.stored = stored
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries go stale after ``ttl`` seconds.
+
+    A stale entry is still served for up to ``stale_ttl`` more seconds while a background
+    thread reloads it (stale-while-revalidate); past that, lookups reload synchronously.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_size: int = 256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so loads that started earlier don't store outdated values
+        self._generation = 0
+        self._refreshing: Set[Hashable] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, calling ``load`` to fill or refresh it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry.stored
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    self._refresh(key, load)
+                    return entry.value
+            self.misses += 1
+            generation = self._generation
+        value = load()
+        self._store(key, value, generation)
+        return value
+
+    def invalidate(self, *prefixes: str) -> None:
+        """Drop entries whose key starts with any of ``prefixes``, or everything if none given"""
+        with self._lock:
+            self._generation += 1
+            if not prefixes:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if str(k).startswith(prefixes)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _Entry(value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _refresh(self, key: Hashable, load: Callable[[], Any]) -> None:
+        # Called with self._lock held
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="rabbitmq-cache-refresh"
+            )
+        self._executor.submit(self._reload, key, load, self._generation)
+
+    def _reload(self, key: Hashable, load: Callable[[], Any], generation: int) -> None:
+        try:
+            self._store(key, load(), generation)
+        except Exception:
+            # Keep serving the stale value; the next lookup past the stale window reloads
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,175 @@
+"""Node selection, health checking and failover across the nodes of a RabbitMQ cluster."""
+
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from mcp_server_rabbitmq.metrics import NODE_FAILURES
+
+STRATEGIES = ("round-robin", "least-latency")
+
+# Weight of the newest sample in a node's moving average latency
+LATENCY_SMOOTHING = 0.3
+
+T = TypeVar("T")
+
+
+class Node:
+    """One cluster node and what is known about its health"""
+
+    __slots__ = ("host", "port", "latency", "failures", "down_until")
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.down_until = 0.0
+
+    def __str__(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        return f"{host}:{self.port}"
+
+    def __repr__(self) -> str:
+        return f"Node({str(self)!r})"
+
+
+def parse_nodes(hosts: Union[str, Sequence[str]], default_port: int) -> List[Node]:
+    """Nodes from "host", "host:port" or "[ipv6]:port" entries, comma-separated or a list"""
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    nodes = []
+    for entry in hosts:
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, port = entry, default_port
+        if entry.startswith("["):
+            host, _, rest = entry[1:].partition("]")
+            if rest.startswith(":"):
+                port = int(rest[1:])
+        elif entry.count(":") == 1:
+            host, port_text = entry.split(":")
+            port = int(port_text)
+        nodes.append(Node(host, int(port)))
+    if not nodes:
+        raise ValueError("At least one RabbitMQ host is required")
+    return nodes
+
+
+class ClusterNodes:
+    """The nodes a client can talk to, ordered per request by health and strategy.
+
+    Healthy nodes come first, rotated (``round-robin``) or fastest first (``least-latency``,
+    by moving average of request and health check times); nodes that recently failed come
+    last, so they are only tried when nothing else works. A node that fails is avoided for
+    ``retry_after`` seconds, or until a background health check (every
+    ``check_interval`` seconds, when there is more than one node) reaches it again.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[Node],
+        strategy: str = "round-robin",
+        probe: Optional[Callable[[Node], None]] = None,
+        check_interval: float = 10.0,
+        retry_after: float = 5.0,
+        client: str = "amqp",
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Node strategy must be one of {', '.join(STRATEGIES)}")
+        self.nodes = list(nodes)
+        self.strategy = strategy
+        self.probe = probe
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.client = client
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+        if probe is not None and check_interval > 0 and len(self.nodes) > 1:
+            self._checker = threading.Thread(
+                target=self._check_loop, name=f"rabbitmq-{client}-health", daemon=True
+            )
+            self._checker.start()
+
+    def candidates(self) -> List[Node]:
+        """Every node, in the order a request should try them"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [n for n in self.nodes if n.down_until <= now]
+            down = sorted(
+                (n for n in self.nodes if n.down_until > now), key=lambda n: n.down_until
+            )
+            if self.strategy == "least-latency":
+                # Nodes not measured yet go first, so every node gets measured
+                healthy.sort(key=lambda n: -1.0 if n.latency is None else n.latency)
+            elif healthy:
+                start = self._next % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+                self._next += 1
+        return healthy + down
+
+    def call(self, fn: Callable[[Node], T], failover: Tuple[Type[BaseException], ...]) -> T:
+        """Run ``fn`` against the first node that doesn't raise one of ``failover``"""
+        error: Optional[BaseException] = None
+        for node in self.candidates():
+            start = time.perf_counter()
+            try:
+                result = fn(node)
+            except failover as e:
+                self.mark_failure(node)
+                error = e
+                continue
+            self.mark_success(node, time.perf_counter() - start)
+            return result
+        raise error
+
+    def mark_success(self, node: Node, latency: float) -> None:
+        with self._lock:
+            node.down_until = 0.0
+            if node.latency is None:
+                node.latency = latency
+            else:
+                node.latency += LATENCY_SMOOTHING * (latency - node.latency)
+
+    def mark_failure(self, node: Node) -> None:
+        with self._lock:
+            node.failures += 1
+            node.down_until = time.monotonic() + self.retry_after
+        NODE_FAILURES.inc(client=self.client, node=str(node))
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "node": str(n),
+                    "healthy": n.down_until <= now,
+                    "latency_ms": None if n.latency is None else round(n.latency * 1000, 3),
+                    "failures": n.failures,
+                }
+                for n in self.nodes
+            ]
+
+    def close(self) -> None:
+        """Stop the health checks"""
+        self._stop.set()
+        if self._checker is not None:
+            self._checker.join(timeout=self.check_interval)
+
+    def _check_loop(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def check(self) -> None:
+        """Probe every node once, updating its health and latency"""
+        for node in self.nodes:
+            start = time.perf_counter()
+            try:
+                self.probe(node)
+            except Exception:
+                self.mark_failure(node)
+            else:
+                self.mark_success(node, time.perf_counter() - start)
@@ -1,32 +1,607 @@
-import ssl
+import socket
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 
 import pika
+from pika import spec
+from pika.exceptions import AMQPError, ConnectionBlockedTimeout
+
+from mcp_server_rabbitmq.cluster import ClusterNodes, Node, parse_nodes
+from mcp_server_rabbitmq.constant import ACK, NACK, RETURNED, UNCONFIRMED
+from mcp_server_rabbitmq.metrics import (
+    AMQP_CONNECT_DURATION,
+    AMQP_CONNECT_ERRORS,
+    PUBLISH_THROTTLED,
+)
+from mcp_server_rabbitmq.ratelimit import Throttled
+from mcp_server_rabbitmq.tls import amqp_ssl_context
+from mcp_server_rabbitmq.validation import validate_rabbitmq_name  # noqa: F401
+
+# How long to block on socket I/O between checks while waiting for publisher confirms
+CONFIRM_POLL_INTERVAL = 0.001
+
+# Default bound on unacked deliveries in flight to a consumer that acks as it goes
+MAX_PREFETCH = 1000
+
+# Largest prefetch count the broker accepts, and so the most messages one peek can hold
+MAX_UNACKED = 65535
+
+# How often to service I/O while waiting for the broker to unblock publishers
+BLOCKED_POLL_INTERVAL = 0.05
+
+# Most messages the temporary queue of an exchange sample holds before dropping the oldest
+SAMPLE_QUEUE_MAX_LENGTH = 10000
 
 
 class RabbitMQConnection:
-    def __init__(self, host: str, port: int, username: str, password: str, use_tls: bool):
+    """Connection settings for one broker or the nodes of a cluster.
+
+    ``host`` may list several nodes ("node1,node2:5673" or a list); each new connection goes
+    to a healthy node chosen by ``strategy``, failing over to the others if it can't connect.
+    Connections blocked by a broker resource alarm for over ``blocked_timeout`` seconds are
+    closed.
+    """
+
+    def __init__(
+        self,
+        host: Union[str, Sequence[str]],
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool,
+        heartbeat: Optional[int] = None,
+        strategy: str = "round-robin",
+        health_check_interval: float = 10.0,
+        connect_timeout: float = 5.0,
+        blocked_timeout: Optional[float] = None,
+    ):
         self.protocol = "amqps" if use_tls else "amqp"
-        self.url = f"{self.protocol}://{username}:{password}@{host}:{port}"
-        self.parameters = pika.URLParameters(self.url)
+        self.connect_timeout = connect_timeout
+        self.nodes = ClusterNodes(
+            parse_nodes(host, port),
+            strategy,
+            probe=self._probe,
+            check_interval=health_check_interval,
+            client="amqp",
+        )
 
-        if use_tls:
-            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-            ssl_context.set_ciphers("ECDHE+AESGCM:!ECDSA")
-            self.parameters.ssl_options = pika.SSLOptions(context=ssl_context)
+        # One TLS context for every connection, so reconnects can resume the TLS session
+        self.ssl_context = amqp_ssl_context() if use_tls else None
+        ssl_options = pika.SSLOptions(context=self.ssl_context) if use_tls else None
+
+        self._parameters: Dict[str, pika.URLParameters] = {}
+        for node in self.nodes.nodes:
+            parameters = pika.URLParameters(f"{self.protocol}://{username}:{password}@{node}")
+            if heartbeat is not None:
+                parameters.heartbeat = heartbeat
+            if blocked_timeout is not None:
+                # pika tears down a connection blocked for longer, so calls stuck writing to a
+                # broker under a resource alarm fail instead of hanging
+                parameters.blocked_connection_timeout = blocked_timeout
+            if ssl_options is not None:
+                parameters.ssl_options = ssl_options
+            self._parameters[str(node)] = parameters
+
+        first = self.nodes.nodes[0]
+        self.url = f"{self.protocol}://{username}:{password}@{first}"
+        self.parameters = self._parameters[str(first)]
+
+    def parameters_for(self, node: Node) -> pika.URLParameters:
+        """Connection parameters for one node of the cluster"""
+        return self._parameters[str(node)]
 
     def get_channel(self) -> tuple[pika.BlockingConnection, pika.channel.Channel]:
-        connection = pika.BlockingConnection(self.parameters)
-        channel = connection.channel()
+        return self.nodes.call(self._open_channel, failover=(AMQPError,))
+
+    def _open_channel(self, node: Node) -> tuple[pika.BlockingConnection, pika.channel.Channel]:
+        start = time.perf_counter()
+        try:
+            connection = pika.BlockingConnection(self.parameters_for(node))
+            channel = connection.channel()
+        except AMQPError:
+            AMQP_CONNECT_ERRORS.inc(client="blocking")
+            raise
+        AMQP_CONNECT_DURATION.observe(time.perf_counter() - start, client="blocking")
         return connection, channel
 
+    def _probe(self, node: Node) -> None:
+        # A TCP connect shows the listener is up without the cost of an AMQP handshake
+        with socket.create_connection((node.host, node.port), timeout=self.connect_timeout):
+            pass
 
-def validate_rabbitmq_name(name: str, field_name: str) -> None:
-    """Validate RabbitMQ queue/exchange names"""
-    if not name or not name.strip():
-        raise ValueError(f"{field_name} cannot be empty")
-    if not all(c.isalnum() or c in "-_.:" for c in name):
-        raise ValueError(
-            f"{field_name} can only contain letters, digits, hyphen, underscore, period, or colon"
-        )
-    if len(name) > 255:
-        raise ValueError(f"{field_name} must be less than 255 characters")
+    def close(self) -> None:
+        """Stop the background node health checks"""
+        self.nodes.close()
+
+
+class DeclarationCache:
+    """Queues and exchanges already declared on one connection, so repeats skip the RPC.
+
+    Entries expire after ``ttl`` seconds (0 disables caching) and the owner clears the cache
+    whenever its channel closes, which is also how the broker reports NOT_FOUND. Queues and
+    exchanges deleted behind the cache's back are forgotten with ``forget``, which other
+    threads may call.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._expiry: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, name: str, **declare_kwargs) -> tuple:
+        # Durability, arguments and passive mode change what the broker checks
+        return (kind, name, repr(sorted(declare_kwargs.items())))
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            expiry = self._expiry.get(key)
+            if expiry is None:
+                return False
+            if expiry <= time.monotonic():
+                del self._expiry[key]
+                return False
+            return True
+
+    def add(self, key: tuple) -> None:
+        if self.ttl > 0:
+            with self._lock:
+                self._expiry[key] = time.monotonic() + self.ttl
+
+    def forget(self, kind: str, name: Optional[str] = None) -> None:
+        """Forget the declarations of one queue or exchange, or with no name all of ``kind``"""
+        with self._lock:
+            for key in [k for k in self._expiry if k[0] == kind and name in (None, k[1])]:
+                del self._expiry[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+
+
+class _Confirms:
+    """Tracks publisher confirms by delivery tag for one confirm-mode channel.
+
+    Given the ``(exchange, routing_key)`` of each message published as mandatory, messages the
+    broker returns as unroutable are confirmed as returned rather than acked.
+    """
+
+    def __init__(self, count: int, routes: Optional[Sequence[tuple]] = None):
+        # Each message's status, None until it is confirmed
+        self.results: List[Optional[str]] = [None] * count
+        self.remaining = count
+        self._routes = routes
+        self._returned: set = set()
+        self._floor = 0
+
+    def on_return(self, channel, method, properties, body) -> None:
+        # The broker sends basic.return just before the ack of the same message, so it belongs
+        # to the earliest unconfirmed message published to the same place
+        route = (method.exchange, method.routing_key)
+        for index in range(self._floor, len(self.results)):
+            if (
+                self.results[index] is None
+                and index not in self._returned
+                and self._routes[index] == route
+            ):
+                self._returned.add(index)
+                return
+
+    def on_confirm(self, method_frame) -> None:
+        method = method_frame.method
+        acked = isinstance(method, spec.Basic.Ack)
+        start = self._floor if method.multiple else method.delivery_tag - 1
+        for index in range(start, min(method.delivery_tag, len(self.results))):
+            if self.results[index] is None:
+                if not acked:
+                    self.results[index] = NACK
+                else:
+                    self.results[index] = RETURNED if index in self._returned else ACK
+                self.remaining -= 1
+        while self._floor < len(self.results) and self.results[self._floor] is not None:
+            self._floor += 1
+
+
+class PooledConnection:
+    """A broker connection and its channel, leased from a RabbitMQConnectionPool"""
+
+    def __init__(
+        self,
+        connection: pika.BlockingConnection,
+        channel: pika.channel.Channel,
+        declared: Optional[DeclarationCache] = None,
+        blocked_timeout: float = 5.0,
+    ):
+        self.connection = connection
+        self.channel = channel
+        self.declared = declared if declared is not None else DeclarationCache()
+        self.blocked_timeout = blocked_timeout
+        # Reason the broker gave for blocking publishers (a resource alarm), while it lasts
+        self.blocked: Optional[str] = None
+        connection.add_on_connection_blocked_callback(self._on_blocked)
+        connection.add_on_connection_unblocked_callback(self._on_unblocked)
+
+    def _on_blocked(self, connection, method_frame) -> None:
+        self.blocked = method_frame.method.reason or "resource alarm"
+
+    def _on_unblocked(self, connection, method_frame) -> None:
+        self.blocked = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection.is_open and self.channel.is_open
+
+    def queue_declare(self, queue: str, **kwargs) -> None:
+        """Declare a queue unless this connection already declared it the same way"""
+        key = DeclarationCache.key("queue", queue, **kwargs)
+        if key not in self.declared:
+            self.channel.queue_declare(queue, **kwargs)
+            self.declared.add(key)
+
+    def exchange_declare(self, exchange: str, **kwargs) -> None:
+        """Declare an exchange unless this connection already declared it the same way"""
+        key = DeclarationCache.key("exchange", exchange, **kwargs)
+        if key not in self.declared:
+            self.channel.exchange_declare(exchange=exchange, **kwargs)
+            self.declared.add(key)
+
+    def wait_unblocked(self) -> None:
+        """Wait up to ``blocked_timeout`` for the broker to lift a block on publishing.
+
+        A blocked broker stops reading from publishers, so publishing anyway would hang;
+        raises Throttled if the block outlasts the wait.
+        """
+        deadline = time.monotonic() + self.blocked_timeout
+        while self.blocked is not None and self.connection.is_open:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                PUBLISH_THROTTLED.inc(reason="blocked")
+                raise Throttled(f"Broker is blocking publishers: {self.blocked}")
+            self.connection.process_data_events(time_limit=min(remaining, BLOCKED_POLL_INTERVAL))
+
+    def ping(self) -> bool:
+        """Service pending I/O (heartbeats, close frames) without blocking"""
+        try:
+            self.connection.process_data_events(time_limit=0)
+        except AMQPError:
+            return False
+        return self.is_open
+
+    def publish_confirmed(
+        self, publishes: Sequence[tuple], timeout: float = 30.0, mandatory: bool = False
+    ) -> List[str]:
+        """Publish on a dedicated confirm-mode channel and wait for the broker's confirms.
+
+        ``publishes`` holds ``(exchange, routing_key, body, properties)`` tuples. Returns, per
+        message, ``"ack"``, ``"nack"`` or ``"unconfirmed"`` if there was no confirm within
+        ``timeout``. With ``mandatory``, messages that no queue receives are ``"returned"``.
+        """
+        routes = [(exchange, key) for exchange, key, _, _ in publishes] if mandatory else None
+        confirms = _Confirms(len(publishes), routes)
+        deadline = time.monotonic() + timeout
+        channel = self.connection.channel()
+        try:
+            # BlockingChannel.confirm_delivery() waits for each confirm in turn; registering
+            # on the underlying channel lets the whole batch be in flight at once
+            selected: List[object] = []
+            channel._impl.confirm_delivery(
+                ack_nack_callback=confirms.on_confirm, callback=selected.append
+            )
+            if mandatory:
+                channel._impl.add_on_return_callback(confirms.on_return)
+            while not selected and channel.is_open and time.monotonic() < deadline:
+                self.connection.process_data_events(time_limit=CONFIRM_POLL_INTERVAL)
+            for exchange, routing_key, body, properties in publishes:
+                channel.basic_publish(exchange, routing_key, body, properties, mandatory)
+            while confirms.remaining and channel.is_open and time.monotonic() < deadline:
+                self.connection.process_data_events(time_limit=CONFIRM_POLL_INTERVAL)
+        finally:
+            if channel.is_open:
+                channel.close()
+        return [result or UNCONFIRMED for result in confirms.results]
+
+    def consume(
+        self,
+        queue: str,
+        max_messages: int,
+        ack: bool = True,
+        prefetch: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: float = 5.0,
+    ) -> List[tuple]:
+        """Receive up to ``max_messages`` of the messages ready on ``queue`` through a consumer.
+
+        Deliveries stream in on a dedicated channel instead of costing a ``basic_get`` round trip
+        each. Stops at ``max_bytes`` of bodies (always taking at least one message) or after
+        ``timeout``. With ``ack`` set, received messages are acked in batches as they arrive so
+        ``prefetch`` bounds those in flight; otherwise they are all held unacked and requeued
+        with a single frame at the end. Deliveries beyond the limits are requeued when the
+        channel closes. Returns ``(method, properties, body)`` tuples.
+        """
+        deadline = time.monotonic() + timeout
+        received: List[tuple] = []
+        channel = self.connection.channel()
+        try:
+            ready = channel.queue_declare(queue, passive=True).method.message_count
+            limit = min(max_messages, ready)
+            if limit <= 0:
+                return received
+            if ack:
+                prefetch = prefetch or min(limit, MAX_PREFETCH)
+            else:
+                # Nothing is acked until the end, so every message must fit in the window
+                prefetch = min(max(prefetch or 0, limit), MAX_UNACKED)
+            state = {"bytes": 0, "acked": 0, "full": False}
+
+            def on_message(channel, method, properties, body) -> None:
+                if state["full"]:
+                    return
+                size = state["bytes"] + len(body)
+                if max_bytes is not None and received and size > max_bytes:
+                    state["full"] = True
+                    return
+                received.append((method, properties, body))
+                state["bytes"] = size
+                state["full"] = len(received) >= limit
+                if ack and len(received) - state["acked"] >= max(prefetch // 2, 1):
+                    channel.basic_ack(method.delivery_tag, multiple=True)
+                    state["acked"] = len(received)
+
+            channel.basic_qos(prefetch_count=prefetch)
+            consumer_tag = channel.basic_consume(queue, on_message)
+            while not state["full"] and channel.is_open:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.connection.process_data_events(time_limit=remaining)
+            if channel.is_open:
+                channel.basic_cancel(consumer_tag)
+                # Delivery tags are sequential, so one frame settles everything received
+                last_tag = received[-1][0].delivery_tag if received else None
+                if last_tag is not None and ack and state["acked"] < len(received):
+                    channel.basic_ack(last_tag, multiple=True)
+                elif last_tag is not None and not ack:
+                    channel.basic_nack(last_tag, multiple=True, requeue=True)
+        finally:
+            if channel.is_open:
+                channel.close()
+        return received
+
+    def sample(
+        self,
+        exchange: str,
+        bindings: Sequence[tuple],
+        on_message: Callable[[Any, Any, bytes], None],
+        max_messages: int,
+        duration: float,
+        prefetch: int = 100,
+        max_length: int = SAMPLE_QUEUE_MAX_LENGTH,
+        on_consume: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """Pass copies of the messages routed through ``exchange`` to ``on_message``.
+
+        Binds a temporary exclusive, auto-delete queue to the exchange with each
+        ``(routing_key, arguments)`` of ``bindings`` and consumes it until ``max_messages``
+        have arrived or ``duration`` seconds have passed, acking in batches so at most
+        ``prefetch`` are in flight. The queue keeps at most ``max_length`` messages, dropping
+        the oldest, so a busy exchange can't grow it while the consumer catches up. Returns how
+        many messages were left unread in the queue, which is removed afterwards.
+
+        ``duration`` counts from when consuming starts, after the queue is declared and bound;
+        ``on_consume`` is called at that point.
+        """
+        channel = self.connection.channel()
+        try:
+            queue = channel.queue_declare(
+                "", exclusive=True, auto_delete=True, arguments={"x-max-length": max_length}
+            ).method.queue
+            for routing_key, arguments in bindings:
+                channel.queue_bind(queue, exchange, routing_key, arguments)
+            state = {"received": 0, "acked": 0}
+
+            def on_delivery(channel, method, properties, body) -> None:
+                if state["received"] >= max_messages:
+                    return
+                state["received"] += 1
+                on_message(method, properties, body)
+                if state["received"] - state["acked"] >= max(prefetch // 2, 1):
+                    channel.basic_ack(method.delivery_tag, multiple=True)
+                    state["acked"] = state["received"]
+
+            channel.basic_qos(prefetch_count=prefetch)
+            consumer_tag = channel.basic_consume(queue, on_delivery)
+            deadline = time.monotonic() + duration
+            if on_consume is not None:
+                on_consume()
+            while state["received"] < max_messages and channel.is_open:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.connection.process_data_events(time_limit=remaining)
+            unread = 0
+            if channel.is_open:
+                unread = channel.queue_declare(queue, passive=True).method.message_count
+                # The queue is deleted with its last consumer, unacked messages and all
+                channel.basic_cancel(consumer_tag)
+        finally:
+            if channel.is_open:
+                channel.close()
+        return unread
+
+    def close(self) -> None:
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except AMQPError:
+            pass
+
+
+class RabbitMQConnectionPool:
+    """Thread-safe pool of long-lived connections, each with a single channel.
+
+    Connections are opened on demand up to ``max_size`` and handed out exclusively, since
+    ``pika.BlockingConnection`` must not be shared between threads. Idle connections are
+    serviced by a background thread so broker heartbeats keep flowing, and broken connections
+    are dropped and replaced on the next acquire.
+    """
+
+    def __init__(
+        self,
+        rabbitmq: RabbitMQConnection,
+        max_size: int = 4,
+        heartbeat_interval: float = 30.0,
+        acquire_timeout: float = 10.0,
+        declare_ttl: float = 300.0,
+        blocked_timeout: float = 5.0,
+    ):
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.rabbitmq = rabbitmq
+        self.max_size = max_size
+        self.declare_ttl = declare_ttl
+        self.blocked_timeout = blocked_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.acquire_timeout = acquire_timeout
+        self._idle: deque[PooledConnection] = deque()
+        # Declaration caches of the open connections, idle or leased
+        self._caches: "weakref.WeakSet[DeclarationCache]" = weakref.WeakSet()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @property
+    def size(self) -> int:
+        """Number of connections currently open, idle or leased"""
+        return self._size
+
+    @contextmanager
+    def acquire(self) -> Iterator[PooledConnection]:
+        """Lease a connection for the duration of the ``with`` block"""
+        pooled = self._checkout()
+        try:
+            yield pooled
+        except ConnectionBlockedTimeout as e:
+            PUBLISH_THROTTLED.inc(reason="blocked")
+            raise Throttled(f"Broker blocked publishers for over {self.blocked_timeout:g}s") from e
+        finally:
+            self._release(pooled)
+
+    @contextmanager
+    def dedicated(self) -> Iterator[PooledConnection]:
+        """Open a connection of its own for the ``with`` block, closed afterwards.
+
+        It is not counted against ``max_size``, so long-running work such as sampling an
+        exchange doesn't keep a pooled connection from the short tool calls.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        connection, channel = self.rabbitmq.get_channel()
+        pooled = PooledConnection(connection, channel, blocked_timeout=self.blocked_timeout)
+        try:
+            yield pooled
+        finally:
+            pooled.close()
+
+    def forget_declared(self, kind: str, name: Optional[str] = None) -> None:
+        """Make every connection declare a deleted queue or exchange again before using it"""
+        with self._cond:
+            caches = list(self._caches)
+        for cache in caches:
+            cache.forget(kind, name)
+
+    def close(self) -> None:
+        """Close idle connections and stop the heartbeat thread; leased ones close on release"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._stop.set()
+        for pooled in idle:
+            pooled.close()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout=self.heartbeat_interval)
+
+    def _checkout(self) -> PooledConnection:
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                while self._idle:
+                    # LIFO keeps the most recently used connections warm
+                    pooled = self._idle.pop()
+                    if pooled.ping():
+                        return pooled
+                    self._size -= 1
+                    pooled.close()
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out waiting for a connection from the pool (size {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+        try:
+            connection, channel = self.rabbitmq.get_channel()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._start_heartbeat()
+        declared = DeclarationCache(self.declare_ttl)
+        with self._cond:
+            self._caches.add(declared)
+        return PooledConnection(connection, channel, declared, self.blocked_timeout)
+
+    def _release(self, pooled: PooledConnection) -> None:
+        if pooled.connection.is_open and not pooled.channel.is_open:
+            # A channel-level error (e.g. NOT_FOUND) closes only the channel; whatever it
+            # declared may be gone, so forget it
+            pooled.declared.clear()
+            try:
+                pooled.channel = pooled.connection.channel()
+            except AMQPError:
+                pass
+        with self._cond:
+            if not self._closed and pooled.is_open:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+            self._size -= 1
+            self._cond.notify()
+        pooled.close()
+
+    def _start_heartbeat(self) -> None:
+        with self._cond:
+            if self._heartbeat_thread is not None or self.heartbeat_interval <= 0:
+                return
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat_loop, name="rabbitmq-pool-heartbeat", daemon=True
+            )
+            self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            dead = []
+            with self._cond:
+                for pooled in list(self._idle):
+                    if not pooled.ping():
+                        self._idle.remove(pooled)
+                        self._size -= 1
+                        dead.append(pooled)
+                if dead:
+                    self._cond.notify_all()
+            for pooled in dead:
+                pooled.close()
@@ -1,3 +1,10 @@
 """Constants for the RabbitMQ MCP server."""
 
 MCP_SERVER_VERSION = "2.0.0"
+
+# Outcomes of a publish awaiting its confirm, as reported per message by the publishing tools
+ACK = "ack"
+NACK = "nack"
+# Acked, but no queue received it: a mandatory publish the broker returned as unroutable
+RETURNED = "returned"
+UNCONFIRMED = "unconfirmed"
@@ -1,50 +1,880 @@
-from typing import List
+import asyncio
+import base64
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
 
-from .admin import RabbitMQAdmin
-from .connection import RabbitMQConnection
+from .constant import ACK, NACK, RETURNED, UNCONFIRMED
+from .models import MessageProperties, PublishMessage
+from .payload import DEFAULT_COMPRESS_THRESHOLD, Payload, build_message
+from .ratelimit import RateLimiter
+from .reservoir import MessageReservoir
+from .results import name_filter, project, table
+from .sampler import QueueSampler
+from .validation import validate_rabbitmq_name
 
+if TYPE_CHECKING:
+    # Only for annotations: pika and requests load with the clients, not with the handlers
+    from pika import BasicProperties
 
-def handle_enqueue(rabbitmq: RabbitMQConnection, queue: str, message: str):
-    connection, channel = rabbitmq.get_channel()
-    channel.queue_declare(queue)
-    channel.basic_publish(exchange="", routing_key=queue, body=message)
-    connection.close()
+    from .admin import RabbitMQAdmin
+    from .async_connection import AsyncRabbitMQConnection
+    from .connection import RabbitMQConnectionPool
 
+# Columns of the get_queues_info and get_exchanges_info tables unless fields are given
+QUEUE_TABLE_COLUMNS = [
+    "name",
+    "type",
+    "state",
+    "messages",
+    "messages_ready",
+    "messages_unacknowledged",
+    "consumers",
+    "message_stats.publish_details.rate",
+    "message_stats.deliver_get_details.rate",
+]
+EXCHANGE_TABLE_COLUMNS = [
+    "name",
+    "type",
+    "durable",
+    "auto_delete",
+    "internal",
+    "message_stats.publish_in_details.rate",
+    "message_stats.publish_out_details.rate",
+]
 
-def handle_fanout(rabbitmq: RabbitMQConnection, exchange: str, message: str):
-    connection, channel = rabbitmq.get_channel()
-    channel.exchange_declare(exchange=exchange, exchange_type="fanout")
-    channel.basic_publish(exchange=exchange, routing_key="", body=message)
-    connection.close()
+# Largest page the management API returns, for listings filtered by a pattern
+INFO_PAGE_SIZE = 500
+# Pages of a pattern listing fetched by default before the table is cut short
+INFO_MAX_PAGES = 10
 
+# Bounds on sample_exchange, which holds a connection and the sample while it runs
+MAX_SAMPLE_DURATION = 300.0
+MAX_SAMPLE_SIZE = 1000
+MAX_SAMPLE_BODY_BYTES = 65536
+MAX_SAMPLE_PREFETCH = 1000
 
-def handle_list_queues(rabbitmq_admin: RabbitMQAdmin) -> List[str]:
-    result = rabbitmq_admin.list_queues()
-    return [queue["name"] for queue in result]
 
+def declare_options(
+    passive: bool = False, durable: bool = False, arguments: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Keyword arguments for queue/exchange declares, leaving out broker defaults"""
+    # A passive declare only checks that the object exists, whatever its settings
+    if passive:
+        return {"passive": True}
+    options: Dict[str, Any] = {}
+    if durable:
+        options["durable"] = True
+    if arguments:
+        options["arguments"] = arguments
+    return options
 
-def handle_list_exchanges(rabbitmq_admin: RabbitMQAdmin) -> List[str]:
-    result = rabbitmq_admin.list_exchanges()
-    return [exchange["name"] for exchange in result]
 
+def _rate_limit(
+    rate_limiter: Optional[RateLimiter], exchange: str, routing_keys: List[str]
+) -> None:
+    """Take a token per message from the exchange's bucket, or for the default exchange from
+    the bucket of each queue the messages go to"""
+    if rate_limiter is None:
+        return
+    if exchange:
+        rate_limiter.acquire({("exchange", exchange): len(routing_keys)})
+    else:
+        counts = Counter(routing_keys)
+        rate_limiter.acquire({("queue", queue): count for queue, count in counts.items()})
 
-def handle_get_queue_info(rabbitmq_admin: RabbitMQAdmin, queue: str, vhost: str = "/") -> dict:
-    return rabbitmq_admin.get_queue_info(queue, vhost)
 
+def _returned_to_queues(statuses: List[Any], publishes: List[tuple]) -> List[int]:
+    """Indexes of the messages to queues (through the default exchange) that came back.
 
-def handle_delete_queue(rabbitmq_admin: RabbitMQAdmin, queue: str, vhost: str = "/") -> None:
+    Such a queue was deleted though it was cached as declared, so it is declared again and
+    its messages are retried once.
+    """
+    return [
+        i
+        for i, (status, publish) in enumerate(zip(statuses, publishes, strict=True))
+        if status == RETURNED and publish[0] == ""
+    ]
+
+
+def _statuses_summary(statuses: List[str]) -> dict:
+    return {
+        "acked": statuses.count(ACK),
+        "nacked": statuses.count(NACK),
+        "returned": statuses.count(RETURNED),
+        "unconfirmed": statuses.count(UNCONFIRMED),
+    }
+
+
+async def _publish_async(
+    connection: "AsyncRabbitMQConnection", publishes: List[tuple], queue_options: dict
+) -> List[Any]:
+    """Publish ``(exchange, routing_key, body, properties)`` tuples as mandatory and await
+    their confirms together, returning each status or exception"""
+
+    async def publish_all(indexes: List[int]) -> list:
+        return await asyncio.gather(
+            *(connection.publish(*publishes[i], mandatory=True) for i in indexes),
+            return_exceptions=True,
+        )
+
+    statuses = await publish_all(list(range(len(publishes))))
+    retry = _returned_to_queues(statuses, publishes)
+    if retry:
+        for queue in sorted({publishes[i][1] for i in retry}):
+            connection.forget_declared("queue", queue)
+            await connection.queue_declare(queue, **queue_options)
+        for i, status in zip(retry, await publish_all(retry), strict=True):
+            statuses[i] = status
+    return statuses
+
+
+async def handle_enqueue_async(
+    connection: "AsyncRabbitMQConnection",
+    queue: str,
+    message: Payload,
+    passive: bool = False,
+    durable: bool = False,
+    arguments: Optional[Dict[str, Any]] = None,
+    body_encoding: str = "utf-8",
+    compression: Optional[str] = None,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    headers: Optional[Dict[str, Any]] = None,
+    properties: Optional[MessageProperties] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+):
+    body, basic_properties = build_message(
+        message, body_encoding, compression, compress_threshold, headers, properties
+    )
+    _rate_limit(rate_limiter, "", [queue])
+    options = declare_options(passive, durable, arguments)
+    await connection.queue_declare(queue, **options)
+    await connection.wait_unblocked()
+    (status,) = await _publish_async(connection, [("", queue, body, basic_properties)], options)
+    if isinstance(status, BaseException):
+        raise status
+    if status == RETURNED:
+        raise RuntimeError(f"Message to queue {queue} was returned as unroutable")
+    if status != ACK:
+        raise RuntimeError(f"Broker rejected the message to queue {queue}")
+
+
+async def handle_fanout_async(
+    connection: "AsyncRabbitMQConnection",
+    exchange: str,
+    message: Payload,
+    passive: bool = False,
+    durable: bool = False,
+    body_encoding: str = "utf-8",
+    compression: Optional[str] = None,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    headers: Optional[Dict[str, Any]] = None,
+    properties: Optional[MessageProperties] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+):
+    body, basic_properties = build_message(
+        message, body_encoding, compression, compress_threshold, headers, properties
+    )
+    _rate_limit(rate_limiter, exchange, [""])
+    await connection.exchange_declare(
+        exchange, exchange_type="fanout", **declare_options(passive, durable)
+    )
+    await connection.wait_unblocked()
+    if await connection.publish(exchange, "", body, basic_properties) != ACK:
+        raise RuntimeError(f"Broker rejected the message to exchange {exchange}")
+
+
+async def handle_publish_async(
+    connection: "AsyncRabbitMQConnection",
+    exchange: str,
+    message: Payload,
+    routing_keys: List[str],
+    exchange_type: str = "direct",
+    passive: bool = False,
+    durable: bool = False,
+    body_encoding: str = "utf-8",
+    compression: Optional[str] = None,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    headers: Optional[Dict[str, Any]] = None,
+    properties: Optional[MessageProperties] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """Publish one message to an exchange once per routing key.
+
+    The copies go out back to back on the shared channel and their confirms are awaited
+    together, so N routing keys cost one round trip rather than N. With the default exchange
+    ("") each key names a queue, declared first as by enqueue; the broker's own amq.*
+    exchanges can't be redeclared, so they are only checked to exist. Copies no queue receives
+    are returned by the broker and reported as returned, after one retry for queues that had
+    been deleted.
+    """
+    if not routing_keys:
+        raise ValueError("At least one routing key is required")
+    body, basic_properties = build_message(
+        message, body_encoding, compression, compress_threshold, headers, properties
+    )
+    queues = sorted(set(routing_keys)) if exchange == "" else []
+    for queue in queues:
+        validate_rabbitmq_name(queue, "Queue name")
+    _rate_limit(rate_limiter, exchange, routing_keys)
+
+    start = time.perf_counter()
+    if exchange.startswith("amq."):
+        await connection.exchange_declare(exchange, passive=True)
+    elif exchange:
+        await connection.exchange_declare(
+            exchange, exchange_type=exchange_type, **declare_options(passive, durable)
+        )
+    options = declare_options(passive, durable)
+    for queue in queues:
+        await connection.queue_declare(queue, **options)
+    await connection.wait_unblocked()
+    publishes = [(exchange, key, body, basic_properties) for key in routing_keys]
+    confirms = await _publish_async(connection, publishes, options)
+    elapsed = time.perf_counter() - start
+
+    statuses = []
+    for confirm in confirms:
+        if isinstance(confirm, asyncio.TimeoutError):
+            statuses.append(UNCONFIRMED)
+        elif isinstance(confirm, BaseException):
+            raise confirm
+        else:
+            statuses.append(confirm)
+    return {
+        "exchange": exchange,
+        "published": len(routing_keys),
+        **_statuses_summary(statuses),
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "results": [
+            {"routing_key": key, "status": status}
+            for key, status in zip(routing_keys, statuses, strict=True)
+        ],
+    }
+
+
+def handle_publish_batch(
+    pool: "RabbitMQConnectionPool",
+    messages: List[PublishMessage],
+    exchange: str = "",
+    routing_key: str = "",
+    passive: bool = False,
+    durable: bool = False,
+    timeout: float = 30.0,
+    compression: Optional[str] = None,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    publishes = []
+    for message in messages:
+        body, properties = build_message(
+            message.body,
+            message.body_encoding,
+            compression,
+            compress_threshold,
+            message.headers,
+            message.properties,
+        )
+        key = routing_key if message.routing_key is None else message.routing_key
+        publishes.append((exchange, key, body, properties))
+
+    # Like enqueue, publishing through the default exchange declares the target queues
+    queues = sorted({key for _, key, _, _ in publishes}) if exchange == "" else []
+    for queue in queues:
+        validate_rabbitmq_name(queue, "Queue name")
+    _rate_limit(rate_limiter, exchange, [key for _, key, _, _ in publishes])
+
+    start = time.perf_counter()
+    options = declare_options(passive, durable)
+    with pool.acquire() as pooled:
+        for queue in queues:
+            pooled.queue_declare(queue, **options)
+        pooled.wait_unblocked()
+        statuses = pooled.publish_confirmed(publishes, timeout, mandatory=True)
+        retry = _returned_to_queues(statuses, publishes)
+        if retry:
+            for queue in sorted({publishes[i][1] for i in retry}):
+                pooled.declared.forget("queue", queue)
+                pooled.queue_declare(queue, **options)
+            retried = pooled.publish_confirmed(
+                [publishes[i] for i in retry], timeout, mandatory=True
+            )
+            for i, status in zip(retry, retried, strict=True):
+                statuses[i] = status
+    elapsed = time.perf_counter() - start
+
+    return {
+        "published": len(publishes),
+        **_statuses_summary(statuses),
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "messages_per_second": round(len(publishes) / elapsed, 1) if elapsed else None,
+        "results": [{"index": i, "status": status} for i, status in enumerate(statuses)],
+    }
+
+
+def _message_dict(method, properties: "BasicProperties", body: bytes) -> dict:
+    message = {
+        "exchange": method.exchange,
+        "routing_key": method.routing_key,
+        "redelivered": method.redelivered,
+        "properties": {k: v for k, v in vars(properties).items() if v is not None},
+    }
+    try:
+        message["body"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        message["body"] = base64.b64encode(body).decode("ascii")
+        message["body_encoding"] = "base64"
+    return message
+
+
+def handle_consume(
+    pool: "RabbitMQConnectionPool",
+    queue: str,
+    max_messages: int = 10,
+    ack: bool = True,
+    prefetch: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    timeout: float = 5.0,
+) -> dict:
+    if max_messages < 1:
+        raise ValueError("max_messages must be at least 1")
+    with pool.acquire() as pooled:
+        received = pooled.consume(
+            queue, max_messages, ack=ack, prefetch=prefetch, max_bytes=max_bytes, timeout=timeout
+        )
+    return {
+        "count": len(received),
+        "bytes": sum(len(body) for _, _, body in received),
+        "acked": ack,
+        "messages": [_message_dict(*delivery) for delivery in received],
+    }
+
+
+def handle_peek(
+    pool: "RabbitMQConnectionPool",
+    queue: str,
+    max_messages: int = 10,
+    max_bytes: Optional[int] = None,
+    timeout: float = 5.0,
+) -> dict:
+    return handle_consume(
+        pool, queue, max_messages, ack=False, max_bytes=max_bytes, timeout=timeout
+    )
+
+
+def _sample_bindings(
+    rabbitmq_admin: "RabbitMQAdmin", exchange: str, routing_keys: Optional[List[str]]
+) -> tuple:
+    """The exchange's type and the (routing_key, arguments) bindings that see all its traffic"""
+    exchange_type = rabbitmq_admin.get_exchange_info(exchange)["type"]
+    if routing_keys is not None:
+        if not routing_keys:
+            raise ValueError("routing_keys cannot be empty")
+        return exchange_type, [(key, None) for key in dict.fromkeys(routing_keys)]
+    if exchange_type == "fanout":
+        return exchange_type, [("", None)]
+    if exchange_type == "topic":
+        return exchange_type, [("#", None)]
+    if exchange_type == "headers":
+        # A headers binding without headers to match matches every message
+        return exchange_type, [("", {})]
+    # Other exchanges only route what is bound, so listen on the keys their queues use
+    bindings = {}
+    for binding in rabbitmq_admin.get_bindings(exchange=exchange):
+        arguments = binding.get("arguments") or None
+        bindings[(binding["routing_key"], repr(arguments))] = (binding["routing_key"], arguments)
+    if not bindings:
+        raise ValueError(f"Exchange {exchange} has no bindings to sample; pass routing_keys")
+    return exchange_type, list(bindings.values())
+
+
+def handle_sample_exchange(
+    pool: "RabbitMQConnectionPool",
+    rabbitmq_admin: "RabbitMQAdmin",
+    exchange: str,
+    routing_keys: Optional[List[str]] = None,
+    duration: float = 10.0,
+    max_messages: int = 10000,
+    sample_size: int = 10,
+    max_body_bytes: int = 256,
+    prefetch: int = 100,
+) -> dict:
+    """Rate and size statistics and a random sample of the messages routed by an exchange"""
+    validate_rabbitmq_name(exchange, "Exchange name")
+    if not 0 < duration <= MAX_SAMPLE_DURATION:
+        raise ValueError(f"Duration must be between 0 and {MAX_SAMPLE_DURATION} seconds")
+    if max_messages < 1:
+        raise ValueError("max_messages must be at least 1")
+    if not 1 <= sample_size <= MAX_SAMPLE_SIZE:
+        raise ValueError(f"Sample size must be between 1 and {MAX_SAMPLE_SIZE}")
+    if not 0 <= max_body_bytes <= MAX_SAMPLE_BODY_BYTES:
+        raise ValueError(f"max_body_bytes must be between 0 and {MAX_SAMPLE_BODY_BYTES}")
+    if not 1 <= prefetch <= MAX_SAMPLE_PREFETCH:
+        raise ValueError(f"Prefetch must be between 1 and {MAX_SAMPLE_PREFETCH}")
+    exchange_type, bindings = _sample_bindings(rabbitmq_admin, exchange, routing_keys)
+
+    reservoir = MessageReservoir(sample_size, max_body_bytes)
+
+    def on_message(method, properties: "BasicProperties", body: bytes) -> None:
+        reservoir.add(
+            method.routing_key,
+            {k: v for k, v in vars(properties).items() if v is not None},
+            body,
+        )
+
+    # A sample can run for minutes, so it gets its own connection rather than a pooled one
+    with pool.dedicated() as pooled:
+        # Rates cover the time spent consuming, not connecting, declaring and binding
+        unread = pooled.sample(
+            exchange,
+            bindings,
+            on_message,
+            max_messages,
+            duration,
+            prefetch=prefetch,
+            on_consume=reservoir.start,
+        )
+    return {
+        "exchange": exchange,
+        "type": exchange_type,
+        "bindings": [{"routing_key": key, "arguments": arguments} for key, arguments in bindings],
+        "stopped": "max_messages" if reservoir.count >= max_messages else "duration",
+        "unread": unread,
+        **reservoir.stats(),
+    }
+
+
+def iter_names(
+    items: Iterable[dict], name: Optional[str] = None, use_regex: bool = False
+) -> Iterator[str]:
+    """Names of the given queues/exchanges, filtered like the management API's name filter"""
+    matches = name_filter(name, use_regex)
+    for item in items:
+        if matches(item["name"]):
+            yield item["name"]
+
+
+def _page_of_names(result: dict) -> dict:
+    return {
+        "names": [item["name"] for item in result["items"]],
+        "page": result["page"],
+        "page_count": result["page_count"],
+        "filtered_count": result["filtered_count"],
+        "total_count": result["total_count"],
+    }
+
+
+def handle_list_queues(
+    rabbitmq_admin: "RabbitMQAdmin",
+    vhost: Optional[str] = None,
+    page: Optional[int] = 1,
+    page_size: int = 100,
+    name: Optional[str] = None,
+    use_regex: bool = False,
+) -> dict:
+    # Only names are returned, so skip the per-queue stats and every other field
+    if page is None:
+        # Stream the whole listing so memory is bounded by the names, not the payload
+        items = rabbitmq_admin.iter_queues(vhost=vhost, columns=["name"], disable_stats=True)
+        names = list(iter_names(items, name, use_regex))
+        return {"names": names, "filtered_count": len(names)}
+    result = rabbitmq_admin.list_queues(
+        vhost=vhost,
+        page=page,
+        page_size=page_size,
+        name=name,
+        use_regex=use_regex,
+        columns=["name"],
+        disable_stats=True,
+    )
+    return _page_of_names(result)
+
+
+def handle_list_exchanges(
+    rabbitmq_admin: "RabbitMQAdmin",
+    vhost: Optional[str] = None,
+    page: Optional[int] = 1,
+    page_size: int = 100,
+    name: Optional[str] = None,
+    use_regex: bool = False,
+) -> dict:
+    if page is None:
+        items = rabbitmq_admin.iter_exchanges(vhost=vhost, columns=["name"], disable_stats=True)
+        names = list(iter_names(items, name, use_regex))
+        return {"names": names, "filtered_count": len(names)}
+    result = rabbitmq_admin.list_exchanges(
+        vhost=vhost,
+        page=page,
+        page_size=page_size,
+        name=name,
+        use_regex=use_regex,
+        columns=["name"],
+        disable_stats=True,
+    )
+    return _page_of_names(result)
+
+
+def handle_get_queue_info(
+    rabbitmq_admin: "RabbitMQAdmin",
+    queue: str,
+    vhost: str = "/",
+    fields: Optional[List[str]] = None,
+) -> dict:
+    return project(rabbitmq_admin.get_queue_info(queue, vhost), fields)
+
+
+def handle_delete_queue(rabbitmq_admin: "RabbitMQAdmin", queue: str, vhost: str = "/") -> None:
     rabbitmq_admin.delete_queue(queue, vhost)
 
 
-def handle_purge_queue(rabbitmq_admin: RabbitMQAdmin, queue: str, vhost: str = "/") -> None:
+def handle_purge_queue(rabbitmq_admin: "RabbitMQAdmin", queue: str, vhost: str = "/") -> None:
     rabbitmq_admin.purge_queue(queue, vhost)
 
 
-def handle_delete_exchange(rabbitmq_admin: RabbitMQAdmin, exchange: str, vhost: str = "/") -> None:
+def handle_delete_exchange(
+    rabbitmq_admin: "RabbitMQAdmin", exchange: str, vhost: str = "/"
+) -> None:
     rabbitmq_admin.delete_exchange(exchange, vhost)
 
 
+def _bulk_targets(
+    rabbitmq_admin: "RabbitMQAdmin",
+    kind: str,
+    names: Optional[List[str]],
+    pattern: Optional[str],
+    vhost: str,
+) -> List[str]:
+    if (names is None) == (pattern is None):
+        raise ValueError("Pass either names or pattern")
+    if names is not None:
+        return list(dict.fromkeys(names))
+    if not pattern:
+        raise ValueError("Pattern cannot be empty")
+    listing = rabbitmq_admin.iter_queues if kind == "queues" else rabbitmq_admin.iter_exchanges
+    matched = iter_names(
+        listing(vhost=vhost, columns=["name"], disable_stats=True), pattern, use_regex=True
+    )
+    if kind == "exchanges":
+        # The default and amq.* exchanges can't be deleted
+        return [n for n in matched if n and not n.startswith("amq.")]
+    return list(matched)
+
+
+def _run_bulk(
+    names: List[str], action, done: str, dry_run: bool, concurrency: int, pool_size: int
+) -> dict:
+    """Apply ``action`` to every name on a bounded thread pool, reporting each outcome"""
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    def run(name: str) -> dict:
+        if dry_run:
+            return {"name": name, "status": f"would be {done}"}
+        try:
+            action(name)
+        except Exception as e:
+            return {"name": name, "status": "failed", "error": f"{e}"}
+        return {"name": name, "status": done}
+
+    start = time.perf_counter()
+    # More workers than pooled HTTP connections would only open throwaway connections
+    workers = max(1, min(concurrency, pool_size, len(names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, names))
+    failed = sum(r["status"] == "failed" for r in results)
+    return {
+        "dry_run": dry_run,
+        "matched": len(names),
+        "succeeded": 0 if dry_run else len(names) - failed,
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "results": results,
+    }
+
+
+def handle_bulk_delete_queues(
+    rabbitmq_admin: "RabbitMQAdmin",
+    names: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    vhost: str = "/",
+    dry_run: bool = False,
+    concurrency: int = 8,
+) -> dict:
+    targets = _bulk_targets(rabbitmq_admin, "queues", names, pattern, vhost)
+    return _run_bulk(
+        targets,
+        lambda name: rabbitmq_admin.delete_queue(name, vhost),
+        "deleted",
+        dry_run,
+        concurrency,
+        rabbitmq_admin.pool_size,
+    )
+
+
+def handle_bulk_purge_queues(
+    rabbitmq_admin: "RabbitMQAdmin",
+    names: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    vhost: str = "/",
+    dry_run: bool = False,
+    concurrency: int = 8,
+) -> dict:
+    targets = _bulk_targets(rabbitmq_admin, "queues", names, pattern, vhost)
+    return _run_bulk(
+        targets,
+        lambda name: rabbitmq_admin.purge_queue(name, vhost),
+        "purged",
+        dry_run,
+        concurrency,
+        rabbitmq_admin.pool_size,
+    )
+
+
+def handle_bulk_delete_exchanges(
+    rabbitmq_admin: "RabbitMQAdmin",
+    names: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    vhost: str = "/",
+    dry_run: bool = False,
+    concurrency: int = 8,
+) -> dict:
+    targets = _bulk_targets(rabbitmq_admin, "exchanges", names, pattern, vhost)
+    return _run_bulk(
+        targets,
+        lambda name: rabbitmq_admin.delete_exchange(name, vhost),
+        "deleted",
+        dry_run,
+        concurrency,
+        rabbitmq_admin.pool_size,
+    )
+
+
 def handle_get_exchange_info(
-    rabbitmq_admin: RabbitMQAdmin, exchange: str, vhost: str = "/"
+    rabbitmq_admin: "RabbitMQAdmin",
+    exchange: str,
+    vhost: str = "/",
+    fields: Optional[List[str]] = None,
+) -> dict:
+    return project(rabbitmq_admin.get_exchange_info(exchange, vhost), fields)
+
+
+def _info_table(
+    rabbitmq_admin: "RabbitMQAdmin",
+    kind: str,
+    names: Optional[List[str]],
+    pattern: Optional[str],
+    vhost: str,
+    columns: List[str],
+    concurrency: int,
+    max_pages: int = INFO_MAX_PAGES,
+) -> dict:
+    """Details of many queues or exchanges as one table.
+
+    A pattern is matched by the management API itself, so the whole table usually takes one
+    filtered listing request; at most max_pages pages are fetched, and the table is marked
+    truncated if the broker has more. A list of names is fetched one object per request, in
+    parallel over the pooled session; names that don't exist are reported as missing.
+    """
+    if (names is None) == (pattern is None):
+        raise ValueError("Pass either names or pattern")
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    if max_pages < 1:
+        raise ValueError("Max pages must be at least 1")
+    start = time.perf_counter()
+    missing: List[str] = []
+    errors: List[dict] = []
+    page_count: Optional[int] = None
+    if pattern is not None:
+        if not pattern:
+            raise ValueError("Pattern cannot be empty")
+        listing = rabbitmq_admin.list_queues if kind == "queues" else rabbitmq_admin.list_exchanges
+        items: List[dict] = []
+        request_count = 0
+        page_count = 1
+        while request_count < min(page_count, max_pages):
+            request_count += 1
+            result = listing(
+                vhost,
+                page=request_count,
+                page_size=INFO_PAGE_SIZE,
+                name=pattern,
+                use_regex=True,
+                columns=columns,
+            )
+            items += result["items"]
+            page_count = result["page_count"]
+    else:
+        names = list(dict.fromkeys(names))
+        label = "Queue name" if kind == "queues" else "Exchange name"
+        for name in names:
+            validate_rabbitmq_name(name, label)
+        get = (
+            rabbitmq_admin.get_queue_info if kind == "queues" else rabbitmq_admin.get_exchange_info
+        )
+
+        def fetch(name: str) -> Optional[dict]:
+            try:
+                return get(name, vhost)
+            except Exception as e:
+                response = getattr(e, "response", None)
+                if getattr(response, "status_code", None) == 404:
+                    missing.append(name)
+                else:
+                    errors.append({"name": name, "error": f"{e}"})
+                return None
+
+        request_count = len(names)
+        # More workers than pooled HTTP connections would only open throwaway connections
+        workers = max(1, min(concurrency, rabbitmq_admin.pool_size, len(names)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            items = [item for item in executor.map(fetch, names) if item is not None]
+        missing.sort(key=names.index)
+
+    return {
+        "vhost": vhost,
+        "count": len(items),
+        **table(items, columns),
+        "missing": missing,
+        "errors": errors,
+        "page_count": page_count,
+        "truncated": page_count is not None and request_count < page_count,
+        "requests": request_count,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def handle_get_queues_info(
+    rabbitmq_admin: "RabbitMQAdmin",
+    names: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    vhost: str = "/",
+    fields: Optional[List[str]] = None,
+    concurrency: int = 8,
+    max_pages: int = INFO_MAX_PAGES,
+) -> dict:
+    return _info_table(
+        rabbitmq_admin,
+        "queues",
+        names,
+        pattern,
+        vhost,
+        fields or QUEUE_TABLE_COLUMNS,
+        concurrency,
+        max_pages,
+    )
+
+
+def handle_get_exchanges_info(
+    rabbitmq_admin: "RabbitMQAdmin",
+    names: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    vhost: str = "/",
+    fields: Optional[List[str]] = None,
+    concurrency: int = 8,
+    max_pages: int = INFO_MAX_PAGES,
+) -> dict:
+    return _info_table(
+        rabbitmq_admin,
+        "exchanges",
+        names,
+        pattern,
+        vhost,
+        fields or EXCHANGE_TABLE_COLUMNS,
+        concurrency,
+        max_pages,
+    )
+
+
+def handle_topology_snapshot(rabbitmq_admin: "RabbitMQAdmin", vhost: Optional[str] = None) -> dict:
+    """Overview plus every exchange, queue and binding, indexed by vhost and name.
+
+    The four listings are fetched concurrently; queues, exchanges and bindings are streamed and
+    folded into the graph as they arrive. Each exchange lists its outgoing bindings and each
+    queue the exchanges bound to it. The default exchange's implicit per-queue bindings are
+    left out.
+    """
+    graph: Dict[str, dict] = {}
+    lock = threading.Lock()
+
+    def vhost_graph(name: str) -> dict:
+        return graph.setdefault(name, {"exchanges": {}, "queues": {}})
+
+    def fetch_exchanges() -> None:
+        for exchange in rabbitmq_admin.iter_exchanges(
+            vhost, columns=["name", "vhost", "type", "durable"], disable_stats=True
+        ):
+            with lock:
+                exchanges = vhost_graph(exchange["vhost"])["exchanges"]
+                node = exchanges.setdefault(exchange["name"], {})
+                node.update(type=exchange["type"], durable=exchange["durable"])
+
+    def fetch_queues() -> None:
+        for queue in rabbitmq_admin.iter_queues(
+            vhost, columns=["name", "vhost", "durable", "messages", "consumers"]
+        ):
+            with lock:
+                queues = vhost_graph(queue["vhost"])["queues"]
+                node = queues.setdefault(queue["name"], {})
+                node.update(
+                    durable=queue["durable"],
+                    messages=queue.get("messages", 0),
+                    consumers=queue.get("consumers", 0),
+                )
+
+    def fetch_bindings() -> None:
+        for binding in rabbitmq_admin.iter_bindings(vhost):
+            if not binding["source"]:
+                continue
+            edge = {
+                "destination": binding["destination"],
+                "destination_type": binding["destination_type"],
+                "routing_key": binding["routing_key"],
+            }
+            if binding.get("arguments"):
+                edge["arguments"] = binding["arguments"]
+            with lock:
+                vgraph = vhost_graph(binding["vhost"])
+                source = vgraph["exchanges"].setdefault(binding["source"], {})
+                source.setdefault("bindings", []).append(edge)
+                if binding["destination_type"] == "queue":
+                    queue = vgraph["queues"].setdefault(binding["destination"], {})
+                    queue.setdefault("bound_from", []).append(binding["source"])
+
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="rabbitmq-topology") as pool:
+        overview = pool.submit(rabbitmq_admin.get_overview)
+        fetches = [pool.submit(f) for f in (fetch_exchanges, fetch_queues, fetch_bindings)]
+        for fetch in fetches:
+            fetch.result()
+        overview = overview.result()
+
+    return {
+        "overview": {
+            "rabbitmq_version": overview.get("rabbitmq_version"),
+            "cluster_name": overview.get("cluster_name"),
+            "object_totals": overview.get("object_totals"),
+            "queue_totals": overview.get("queue_totals"),
+        },
+        "vhosts": graph,
+    }
+
+
+def handle_queue_trends(
+    sampler: QueueSampler,
+    vhost: Optional[str] = None,
+    name: Optional[str] = None,
+    use_regex: bool = False,
+    limit: int = 20,
 ) -> dict:
-    return rabbitmq_admin.get_exchange_info(exchange, vhost)
+    """Trends of the sampled queues matching the filters, deepest first"""
+    if limit < 1:
+        raise ValueError("Limit must be at least 1")
+    filtered_count, queues = sampler.trends(vhost, name, use_regex, limit)
+    return {
+        "interval_seconds": sampler.interval,
+        "filtered_count": filtered_count,
+        "queues": queues,
+        "last_error": sampler.last_error,
+    }
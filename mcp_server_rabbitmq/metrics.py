@@ -0,0 +1,297 @@
+"""Latency, size and error metrics for tools and broker I/O, in Prometheus text format."""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds, from sub-millisecond cache hits to slow management API listings
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Bytes, 256 B to 64 MiB in powers of four
+SIZE_BUCKETS = tuple(256 * 4**i for i in range(10))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, k)} {v:g}" for k, v in values]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {",".join(k) or "total": v for k, v in sorted(self._values.items())}
+
+
+class _Series:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Bucketed distribution per label set, with quantiles estimated from the buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[n]) for n in self.labels))
+        return series.count if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series = sorted((k, list(s.counts), s.sum, s.count) for k, s in self._series.items())
+        for key, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{bound if bound == "+Inf" else f"{bound:g}"}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            series = {k: (list(s.counts), s.sum, s.count) for k, s in self._series.items()}
+        return {
+            ",".join(key) or "total": {
+                "count": count,
+                "mean": round(total / count, 6),
+                "p50": round(self._quantile(counts, count, 0.50), 6),
+                "p95": round(self._quantile(counts, count, 0.95), 6),
+                "p99": round(self._quantile(counts, count, 0.99), 6),
+            }
+            for key, (counts, total, count) in sorted(series.items())
+        }
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> float:
+        # Linear interpolation within the bucket holding the rank, like histogram_quantile()
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return 0.0
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics: List = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+
+REGISTRY = Registry()
+
+TOOL_DURATION = REGISTRY.register(
+    Histogram("mcp_rabbitmq_tool_duration_seconds", "Time to run an MCP tool", ["tool"])
+)
+TOOL_ERRORS = REGISTRY.register(
+    Counter("mcp_rabbitmq_tool_errors_total", "MCP tool calls that failed", ["tool"])
+)
+AMQP_CONNECT_DURATION = REGISTRY.register(
+    Histogram(
+        "mcp_rabbitmq_amqp_connect_duration_seconds",
+        "Time to open an AMQP connection and channel",
+        ["client"],
+    )
+)
+AMQP_CONNECT_ERRORS = REGISTRY.register(
+    Counter(
+        "mcp_rabbitmq_amqp_connect_errors_total",
+        "AMQP connections that failed to open",
+        ["client"],
+    )
+)
+TLS_HANDSHAKES = REGISTRY.register(
+    Counter(
+        "mcp_rabbitmq_tls_handshakes_total",
+        "TLS handshakes with the broker, by whether they resumed an earlier session",
+        ["client", "resumed"],
+    )
+)
+NODE_FAILURES = REGISTRY.register(
+    Counter(
+        "mcp_rabbitmq_node_failures_total",
+        "Requests and health checks that failed against a cluster node",
+        ["client", "node"],
+    )
+)
+PUBLISH_THROTTLED = REGISTRY.register(
+    Counter(
+        "mcp_rabbitmq_publish_throttled_total",
+        "Publishes refused by a rate limit or while the broker blocked publishers",
+        ["reason"],
+    )
+)
+HTTP_DURATION = REGISTRY.register(
+    Histogram(
+        "mcp_rabbitmq_http_request_duration_seconds",
+        "Management API round-trip time, to the end of the body (headers when streaming)",
+        ["method", "endpoint"],
+    )
+)
+HTTP_RESPONSE_BYTES = REGISTRY.register(
+    Histogram(
+        "mcp_rabbitmq_http_response_bytes",
+        "Management API response body size",
+        ["endpoint"],
+        buckets=SIZE_BUCKETS,
+    )
+)
+HTTP_ERRORS = REGISTRY.register(
+    Counter(
+        "mcp_rabbitmq_http_errors_total",
+        "Management API requests that failed, by status code or exception",
+        ["endpoint", "reason"],
+    )
+)
+
+
+def endpoint_label(endpoint: str) -> str:
+    """The resource an API path addresses, without names, to keep label cardinality low"""
+    return endpoint.split("?", 1)[0].split("/", 1)[0]
+
+
+def instrument_tool(fn: Callable, name: Optional[str] = None) -> Callable:
+    """Wrap a tool function to record its duration and failures.
+
+    Tools report failures by returning a "Failed ..." message rather than raising, so those
+    count as errors too.
+    """
+    tool = name or fn.__name__
+
+    def record(start: float, result=None, failed: bool = False) -> None:
+        TOOL_DURATION.observe(time.perf_counter() - start, tool=tool)
+        if failed or (isinstance(result, str) and result.startswith("Failed")):
+            TOOL_ERRORS.inc(tool=tool)
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                record(start, failed=True)
+                raise
+            record(start, result)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            record(start, failed=True)
+            raise
+        record(start, result)
+        return result
+
+    return wrapper
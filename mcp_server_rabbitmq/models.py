@@ -0,0 +1,34 @@
+"""Pydantic models for structured tool arguments."""
+
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class MessageProperties(BaseModel):
+    """AMQP basic properties that can be set on a published message"""
+
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    delivery_mode: Optional[int] = Field(None, ge=1, le=2, description="1 transient, 2 persistent")
+    priority: Optional[int] = Field(None, ge=0, le=255)
+    correlation_id: Optional[str] = None
+    reply_to: Optional[str] = None
+    expiration: Optional[str] = Field(None, description="Per-message TTL in milliseconds")
+    message_id: Optional[str] = None
+    type: Optional[str] = None
+    app_id: Optional[str] = None
+
+
+class PublishMessage(BaseModel):
+    """A single message of a batch publish"""
+
+    body: Union[str, Dict[str, Any], List[Any]] = Field(
+        description="Text, or an object/array published as JSON"
+    )
+    body_encoding: Literal["utf-8", "base64"] = Field(
+        "utf-8", description="base64 to publish a string body as the raw bytes it encodes"
+    )
+    routing_key: Optional[str] = Field(None, description="Overrides the batch routing key")
+    headers: Optional[Dict[str, Any]] = None
+    properties: Optional[MessageProperties] = None
@@ -0,0 +1,127 @@
+"""Encoding, compression and properties of message bodies published by the tools."""
+
+import base64
+import binascii
+import gzip
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+from mcp_server_rabbitmq.models import MessageProperties
+
+if TYPE_CHECKING:
+    from pika import BasicProperties
+
+DEFAULT_COMPRESS_THRESHOLD = 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+Payload = Union[str, bytes, Dict[str, Any], list]
+
+
+# The optional codecs are imported on first use, not when the server starts
+@lru_cache(maxsize=None)
+def _orjson():
+    """The orjson module, or None when it is not installed"""
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional speedup
+        return None
+    return orjson
+
+
+@lru_cache(maxsize=None)
+def _zstandard():
+    """The zstandard module, or None when it is not installed"""
+    try:
+        import zstandard
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return zstandard
+
+
+def dumps_json(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed"""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_body(message: Payload, body_encoding: str = "utf-8") -> Tuple[Any, Optional[str]]:
+    """Turn a tool payload into a message body and the content type it implies.
+
+    Objects and arrays are serialized as JSON, strings are sent as they are unless
+    ``body_encoding`` is ``"base64"``, in which case they are decoded to raw bytes.
+    """
+    if isinstance(message, (dict, list)):
+        return dumps_json(message), "application/json"
+    if body_encoding == "base64":
+        if not isinstance(message, str):
+            raise ValueError("A base64 body must be a string")
+        try:
+            return base64.b64decode(message, validate=True), "application/octet-stream"
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 body: {e}") from e
+    if body_encoding != "utf-8":
+        raise ValueError(f"Unsupported body encoding: {body_encoding}")
+    return message, None
+
+
+def compress_body(
+    body: Any, compression: Optional[str], threshold: int
+) -> Tuple[Any, Optional[str]]:
+    """Compress a body of at least ``threshold`` bytes; returns it with its content encoding.
+
+    Bodies that don't shrink are left as they are, so nothing is published with an encoding
+    that only costs the consumer a decompression.
+    """
+    if compression is None:
+        return body, None
+    if compression == "zstd" and _zstandard() is None:
+        raise ValueError("zstd compression requires the zstandard package")
+    if compression not in ("gzip", "zstd"):
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    raw = body.encode("utf-8") if isinstance(body, str) else body
+    if len(raw) < threshold:
+        return body, None
+    if compression == "gzip":
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+    else:
+        compressed = _zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if len(compressed) >= len(raw):
+        return body, None
+    return compressed, compression
+
+
+def build_message(
+    message: Payload,
+    body_encoding: str = "utf-8",
+    compression: Optional[str] = None,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    headers: Optional[Dict[str, Any]] = None,
+    properties: Optional[MessageProperties] = None,
+) -> Tuple[Any, Optional["BasicProperties"]]:
+    """Body and AMQP properties to publish for a tool payload.
+
+    The content type defaults to what the payload implies and ``content_encoding`` is set when
+    the body was compressed. The properties are None when there is nothing to set, so plain
+    text messages are published exactly as before.
+    """
+    # pika is only loaded once something is published, not when the server starts
+    from pika import BasicProperties
+
+    options = properties.model_dump(exclude_none=True) if properties else {}
+    if compression and "content_encoding" in options:
+        raise ValueError("content_encoding can't be set together with compression")
+
+    body, content_type = encode_body(message, body_encoding)
+    body, content_encoding = compress_body(body, compression, compress_threshold)
+    if content_type:
+        options.setdefault("content_type", content_type)
+    if content_encoding:
+        options["content_encoding"] = content_encoding
+    if headers:
+        options["headers"] = headers
+    return body, BasicProperties(**options) if options else None
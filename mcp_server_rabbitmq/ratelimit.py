@@ -0,0 +1,138 @@
+"""Token-bucket rate limits on publishing, per queue or exchange."""
+
+import fnmatch
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from mcp_server_rabbitmq.metrics import PUBLISH_THROTTLED
+
+KINDS = ("queue", "exchange")
+
+
+class Throttled(Exception):
+    """A publish refused by a rate limit or by broker flow control, rather than attempted"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimit(NamedTuple):
+    kind: str
+    pattern: str
+    rate: float
+    burst: float
+
+
+def parse_rate_limit(spec: str) -> RateLimit:
+    """A limit from "KIND:PATTERN=RATE[:BURST]", e.g. "queue:orders.*=100:500".
+
+    KIND is queue or exchange, PATTERN a glob matched against names (each matching queue or
+    exchange gets its own bucket), RATE messages per second and BURST the bucket size, which
+    defaults to one second's worth of messages.
+    """
+    target, sep, limit = spec.partition("=")
+    kind, colon, pattern = target.partition(":")
+    if not sep or not colon or kind not in KINDS or not pattern:
+        raise ValueError(f"Rate limit must look like queue:NAME=RATE[:BURST], got {spec!r}")
+    rate_text, _, burst_text = limit.partition(":")
+    rate = float(rate_text)
+    burst = float(burst_text) if burst_text else max(rate, 1.0)
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"Rate limit needs a positive rate and a burst of at least 1: {spec!r}")
+    return RateLimit(kind, pattern, rate, burst)
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        # ``now`` may be older than the last refill when read before waiting for the lock
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_for(self, count: float) -> Optional[float]:
+        """Seconds until ``count`` tokens are available; None if the bucket can never hold them"""
+        if count > self.burst:
+            return None
+        return max(0.0, (count - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Token buckets for the queues and exchanges matched by a list of limits.
+
+    The first limit whose kind and pattern match a target applies; targets that match none are
+    not limited. A publish takes a token per message from every target it writes to, or none
+    at all: when any bucket is short it is refused with the time to wait before retrying,
+    instead of queueing behind the limit.
+    """
+
+    def __init__(self, limits: Sequence[RateLimit]):
+        self.limits = list(limits)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, kind: str, name: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get((kind, name))
+        if bucket is None:
+            for limit in self.limits:
+                if limit.kind == kind and fnmatch.fnmatchcase(name, limit.pattern):
+                    bucket = self._buckets[(kind, name)] = TokenBucket(limit.rate, limit.burst)
+                    break
+        return bucket
+
+    def acquire(self, targets: Dict[Tuple[str, str], int]) -> None:
+        """Take tokens for ``{(kind, name): message count}``, or raise Throttled"""
+        if not self.limits:
+            return
+        now = time.monotonic()
+        with self._lock:
+            taken: List[Tuple[TokenBucket, int]] = []
+            for (kind, name), count in targets.items():
+                bucket = self._bucket(kind, name)
+                if bucket is None:
+                    continue
+                bucket.refill(now)
+                wait = bucket.wait_for(count)
+                if wait is None:
+                    PUBLISH_THROTTLED.inc(reason="rate_limit")
+                    raise Throttled(
+                        f"{count} messages exceed the burst of {bucket.burst:g} allowed for "
+                        f"{kind} {name}; publish fewer at a time"
+                    )
+                if wait > 0:
+                    PUBLISH_THROTTLED.inc(reason="rate_limit")
+                    raise Throttled(
+                        f"Rate limit of {bucket.rate:g} messages/s for {kind} {name} reached; "
+                        f"retry in {wait:.2f}s",
+                        retry_after=round(wait, 3),
+                    )
+                taken.append((bucket, count))
+            for bucket, count in taken:
+                bucket.tokens -= count
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            for bucket in self._buckets.values():
+                bucket.refill(now)
+            return [
+                {
+                    "kind": kind,
+                    "name": name,
+                    "rate": bucket.rate,
+                    "burst": bucket.burst,
+                    "tokens": round(bucket.tokens, 3),
+                }
+                for (kind, name), bucket in sorted(self._buckets.items())
+            ]
@@ -0,0 +1,104 @@
+"""Fixed-size random samples of a message stream, with running size and rate statistics."""
+
+import base64
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Distinct routing keys counted before the rest are lumped together, to bound memory
+MAX_TRACKED_ROUTING_KEYS = 1000
+OTHER_ROUTING_KEYS = "(other)"
+
+
+def preview(body: bytes, max_bytes: int) -> Dict[str, Any]:
+    """The start of a body, as text if it is UTF-8 and base64 otherwise"""
+    head = body[:max_bytes]
+    result: Dict[str, Any] = {"size": len(body), "truncated": len(body) > len(head)}
+    # A cut can split a multi-byte character; drop its leading bytes rather than call it binary
+    for cut in range(4 if result["truncated"] else 1):
+        try:
+            result["body"] = head[: len(head) - cut].decode("utf-8")
+            return result
+        except UnicodeDecodeError:
+            continue
+    result["body"] = base64.b64encode(head).decode("ascii")
+    result["body_encoding"] = "base64"
+    return result
+
+
+class MessageReservoir:
+    """A uniform random sample of ``size`` messages from a stream of unknown length.
+
+    Uses reservoir sampling (Algorithm R): the n-th message replaces a random sampled one with
+    probability size/n, so every message seen is equally likely to be kept. Only the first
+    ``max_body_bytes`` of each kept body are stored, and statistics are running totals, so
+    memory stays bounded however many messages go by.
+    """
+
+    def __init__(self, size: int, max_body_bytes: int, seed: Optional[int] = None):
+        if size < 1:
+            raise ValueError("Sample size must be at least 1")
+        if max_body_bytes < 0:
+            raise ValueError("max_body_bytes cannot be negative")
+        self.size = size
+        self.max_body_bytes = max_body_bytes
+        self.sample: List[Dict[str, Any]] = []
+        self.count = 0
+        self.bytes = 0
+        self.min_size: Optional[int] = None
+        self.max_size: Optional[int] = None
+        self.routing_keys: Counter = Counter()
+        self.started = time.monotonic()
+        self._random = random.Random(seed)
+
+    def start(self) -> None:
+        """Restart the clock, so rates cover only the time spent receiving"""
+        self.started = time.monotonic()
+
+    def add(self, routing_key: str, properties: Dict[str, Any], body: bytes) -> None:
+        size = len(body)
+        self.count += 1
+        self.bytes += size
+        self.min_size = size if self.min_size is None else min(self.min_size, size)
+        self.max_size = size if self.max_size is None else max(self.max_size, size)
+        if routing_key in self.routing_keys or len(self.routing_keys) < MAX_TRACKED_ROUTING_KEYS:
+            self.routing_keys[routing_key] += 1
+        else:
+            self.routing_keys[OTHER_ROUTING_KEYS] += 1
+
+        if len(self.sample) < self.size:
+            slot = len(self.sample)
+            self.sample.append({})
+        else:
+            slot = self._random.randrange(self.count)
+            if slot >= self.size:
+                return
+        self.sample[slot] = {
+            "index": self.count - 1,
+            "received_after_ms": round((time.monotonic() - self.started) * 1000, 3),
+            "routing_key": routing_key,
+            "properties": properties,
+            **preview(body, self.max_body_bytes),
+        }
+
+    def stats(self, top_routing_keys: int = 10) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "received": self.count,
+            "bytes": self.bytes,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "messages_per_second": round(self.count / elapsed, 1) if elapsed else None,
+            "bytes_per_second": round(self.bytes / elapsed, 1) if elapsed else None,
+            "size": {
+                "min": self.min_size,
+                "max": self.max_size,
+                "mean": round(self.bytes / self.count, 1) if self.count else None,
+            },
+            "routing_keys": [
+                {"routing_key": key, "count": count}
+                for key, count in self.routing_keys.most_common(top_routing_keys)
+            ],
+            # In arrival order, which is easier to read than the reservoir's slot order
+            "sample": sorted(self.sample, key=lambda message: message["index"]),
+        }
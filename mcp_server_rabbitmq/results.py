@@ -0,0 +1,81 @@
+"""Shaping of tool results: compaction, field projection and tables."""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def _is_empty(value: Any) -> bool:
+    # Booleans are meaningful either way (durable, auto_delete, ...), only drop real zeros
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return value == 0
+    return value is None or value == "" or value == {} or value == []
+
+
+def compact(value: Any) -> Any:
+    """Recursively drop null, zero and empty fields from the objects in a result.
+
+    List elements are kept even when empty, so positions and counts stay meaningful.
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            item = compact(item)
+            if not _is_empty(item):
+                result[key] = item
+        return result
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
+
+
+def project(value: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Keep only the given fields of an object; dotted names select nested fields.
+
+    Fields that don't exist are skipped. With no fields the object is returned unchanged.
+    """
+    if not fields:
+        return value
+    result: Dict[str, Any] = {}
+    for field in fields:
+        source: Any = value
+        path = field.split(".")
+        for key in path:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = source
+    return result
+
+
+def table(items: Iterable[Dict[str, Any]], columns: List[str]) -> Dict[str, Any]:
+    """Objects as rows of values under one list of column names, to avoid repeating keys.
+
+    Dotted columns select nested fields; missing fields are null.
+    """
+    rows = []
+    for item in items:
+        row = []
+        for column in columns:
+            value: Any = item
+            for key in column.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            row.append(value)
+        rows.append(row)
+    return {"columns": columns, "rows": rows}
+
+
+def name_filter(name: Optional[str] = None, use_regex: bool = False) -> Callable[[str], bool]:
+    """Match names like the management API's name filter: a substring, or a regular
+    expression with use_regex. No name matches everything."""
+    if not name:
+        return lambda _: True
+    if use_regex:
+        pattern = re.compile(name)
+        return lambda candidate: pattern.search(candidate) is not None
+    return lambda candidate: name in candidate
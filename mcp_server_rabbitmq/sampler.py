@@ -0,0 +1,245 @@
+"""Background sampling of queue depths, for trends without per-agent polling."""
+
+import heapq
+import math
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from mcp_server_rabbitmq.results import name_filter
+
+if TYPE_CHECKING:
+    from mcp_server_rabbitmq.admin import RabbitMQAdmin
+
+# Everything a trend needs, and nothing else, from the queue listing
+SAMPLE_COLUMNS = [
+    "name",
+    "vhost",
+    "messages",
+    "messages_ready",
+    "messages_unacknowledged",
+    "consumers",
+    "message_stats.publish",
+    "message_stats.deliver_get",
+]
+
+# Values kept per queue and sample: depth, then the publish and deliver counters
+_FIELDS = 3
+_MISSING = math.nan
+
+
+class _QueueHistory:
+    """One queue's samples, in a ring buffer indexed like the sampler's sample times.
+
+    Counters missing from a sample are stored as NaN. Only the latest listing's other fields
+    that a trend reports are kept.
+    """
+
+    __slots__ = ("since", "values", "ready", "unacknowledged", "consumers")
+
+    def __init__(self, since: int, history: int):
+        # Number of the first sample that saw the queue
+        self.since = since
+        self.values = array("d", [_MISSING]) * (history * _FIELDS)
+        self.ready: Optional[int] = None
+        self.unacknowledged: Optional[int] = None
+        self.consumers: Optional[int] = None
+
+
+def _slope(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares change per second, which shrugs off a single noisy sample"""
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    if spread == 0:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / spread
+
+
+def _counter_rate(first: float, last: float, elapsed: float) -> Optional[float]:
+    # Counters missing (stats disabled, NaN) or reset (queue recreated) give no rate
+    if not last >= first or elapsed <= 0:
+        return None
+    return (last - first) / elapsed
+
+
+class QueueSampler:
+    """Samples every queue's depth and message counters every ``interval`` seconds.
+
+    One columns-filtered, streamed ``/api/queues`` listing per interval feeds a ring buffer
+    of the last ``history`` samples per queue, from which trends are computed on request, so
+    any number of agents watching queues cost the broker a single listing per interval. The
+    buffers are flat arrays of floats sharing one array of sample times, which keeps tens of
+    thousands of queues' history in a few bytes per value.
+    """
+
+    def __init__(self, admin: "RabbitMQAdmin", interval: float = 10.0, history: int = 60):
+        if interval <= 0:
+            raise ValueError("Sample interval must be positive")
+        if history < 2:
+            raise ValueError("Sample history must hold at least 2 samples")
+        self.admin = admin
+        self.interval = interval
+        self.history = history
+        self.last_error: Optional[str] = None
+        # Samples taken so far; sample n is stored in slot n % history
+        self._taken = 0
+        self._times = array("d", [0.0]) * history
+        self._queues: Dict[Tuple[str, str], _QueueHistory] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Take a first sample now and keep sampling in the background"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="rabbitmq-queue-sampler", daemon=True
+            )
+        self.sample()
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.interval)
+
+    def sample(self) -> None:
+        """Record one sample of every queue; queues that are gone are forgotten"""
+        now = time.monotonic()
+        points = {}
+        try:
+            for queue in self.admin.iter_queues(columns=SAMPLE_COLUMNS):
+                stats = queue.get("message_stats") or {}
+                points[(queue.get("vhost", "/"), queue["name"])] = (
+                    queue.get("messages") or 0,
+                    stats.get("publish"),
+                    stats.get("deliver_get"),
+                    queue.get("messages_ready"),
+                    queue.get("messages_unacknowledged"),
+                    queue.get("consumers"),
+                )
+        except Exception as e:
+            self.last_error = f"{e}"
+            return
+        self.last_error = None
+        with self._lock:
+            offset = (self._taken % self.history) * _FIELDS
+            self._times[self._taken % self.history] = now
+            for key in self._queues.keys() - points.keys():
+                del self._queues[key]
+            for key, (messages, published, delivered, ready, unacked, consumers) in points.items():
+                queue = self._queues.get(key)
+                if queue is None:
+                    queue = self._queues[key] = _QueueHistory(self._taken, self.history)
+                values = queue.values
+                values[offset] = messages
+                values[offset + 1] = _MISSING if published is None else published
+                values[offset + 2] = _MISSING if delivered is None else delivered
+                queue.ready, queue.unacknowledged, queue.consumers = ready, unacked, consumers
+            self._taken += 1
+
+    def trends(
+        self,
+        vhost: Optional[str] = None,
+        name: Optional[str] = None,
+        use_regex: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[dict]]:
+        """How many sampled queues match the filters, and the trends of the deepest ``limit``.
+
+        ``name`` is a substring or, with ``use_regex``, a regular expression. Trends are only
+        computed for the queues returned, deepest first.
+        """
+        matches = name_filter(name, use_regex)
+        now = time.monotonic()
+        with self._lock:
+            if not self._taken:
+                return 0, []
+            latest = ((self._taken - 1) % self.history) * _FIELDS
+            matching = [
+                (key, queue)
+                for key, queue in self._queues.items()
+                if (vhost is None or key[0] == vhost) and matches(key[1])
+            ]
+
+            def order(item) -> tuple:
+                (queue_vhost, queue_name), queue = item
+                return -queue.values[latest], queue_vhost, queue_name
+
+            if limit is None:
+                chosen = sorted(matching, key=order)
+            else:
+                chosen = heapq.nsmallest(limit, matching, key=order)
+            snapshot = [
+                (key, (queue.ready, queue.unacknowledged, queue.consumers), self._window(queue))
+                for key, queue in chosen
+            ]
+        return len(matching), [self._trend(*item, now) for item in snapshot]
+
+    def _window(self, queue: _QueueHistory) -> List[Tuple[float, float, float, float]]:
+        # The queue's samples, oldest first, as (time, messages, published, delivered)
+        count = min(self._taken - queue.since, self.history)
+        samples = []
+        for n in range(self._taken - count, self._taken):
+            slot = n % self.history
+            offset = slot * _FIELDS
+            samples.append((self._times[slot], *queue.values[offset : offset + _FIELDS]))
+        return samples
+
+    def _trend(
+        self,
+        key: Tuple[str, str],
+        latest: Tuple[Optional[int], Optional[int], Optional[int]],
+        samples: List[Tuple[float, float, float, float]],
+        now: float,
+    ) -> dict:
+        (first_time, _, first_published, first_delivered) = samples[0]
+        (last_time, last_messages, last_published, last_delivered) = samples[-1]
+        messages = int(last_messages)
+        elapsed = last_time - first_time
+        depth_rate = _slope([(t, depth) for t, depth, _, _ in samples])
+        publish_rate = _counter_rate(first_published, last_published, elapsed)
+        deliver_rate = _counter_rate(first_delivered, last_delivered, elapsed)
+
+        if depth_rate is None:
+            trend = None
+        elif abs(depth_rate) * elapsed < 1:
+            # Less than one message of change over the whole window
+            trend = "steady"
+        else:
+            trend = "draining" if depth_rate < 0 else "growing"
+        time_to_drain = None
+        if trend == "draining":
+            time_to_drain = round(messages / -depth_rate, 1)
+        elif messages == 0:
+            time_to_drain = 0.0
+
+        def rounded(rate: Optional[float]) -> Optional[float]:
+            return None if rate is None else round(rate, 3)
+
+        return {
+            "vhost": key[0],
+            "name": key[1],
+            "messages": messages,
+            "messages_ready": latest[0],
+            "messages_unacknowledged": latest[1],
+            "consumers": latest[2],
+            "trend": trend,
+            "depth_rate": rounded(depth_rate),
+            "publish_rate": rounded(publish_rate),
+            "deliver_rate": rounded(deliver_rate),
+            "time_to_drain_seconds": time_to_drain,
+            "samples": len(samples),
+            "window_seconds": round(elapsed, 1),
+            "age_seconds": round(now - last_time, 1),
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
@@ -1,24 +1,57 @@
 import argparse
+import asyncio
+import contextvars
+import functools
+import inspect
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Union
 
 from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
 from loguru import logger
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 
-from mcp_server_rabbitmq.admin import RabbitMQAdmin
-from mcp_server_rabbitmq.connection import RabbitMQConnection, validate_rabbitmq_name
+from mcp_server_rabbitmq.cluster import STRATEGIES
 from mcp_server_rabbitmq.constant import MCP_SERVER_VERSION
 from mcp_server_rabbitmq.handlers import (
+    handle_bulk_delete_exchanges,
+    handle_bulk_delete_queues,
+    handle_bulk_purge_queues,
+    handle_consume,
     handle_delete_exchange,
     handle_delete_queue,
-    handle_enqueue,
-    handle_fanout,
+    handle_enqueue_async,
+    handle_fanout_async,
     handle_get_exchange_info,
+    handle_get_exchanges_info,
     handle_get_queue_info,
+    handle_get_queues_info,
     handle_list_exchanges,
     handle_list_queues,
+    handle_peek,
+    handle_publish_async,
+    handle_publish_batch,
     handle_purge_queue,
+    handle_queue_trends,
+    handle_sample_exchange,
+    handle_topology_snapshot,
 )
+from mcp_server_rabbitmq.metrics import REGISTRY, instrument_tool
+from mcp_server_rabbitmq.models import MessageProperties, PublishMessage
+from mcp_server_rabbitmq.payload import DEFAULT_COMPRESS_THRESHOLD
+from mcp_server_rabbitmq.ratelimit import RateLimiter, Throttled, parse_rate_limit
+from mcp_server_rabbitmq.results import compact
+from mcp_server_rabbitmq.sampler import QueueSampler
+from mcp_server_rabbitmq.validation import validate_rabbitmq_name
+
+if TYPE_CHECKING:
+    from mcp_server_rabbitmq.admin import RabbitMQAdmin
+    from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+    from mcp_server_rabbitmq.connection import RabbitMQConnection, RabbitMQConnectionPool
 
 
 class RabbitMQMCPServer:
@@ -30,6 +63,26 @@ class RabbitMQMCPServer:
         rabbitmq_password=None,
         rabbitmq_use_tls=None,
         rabbitmq_api_port=None,
+        pool_size=4,
+        heartbeat=60,
+        api_pool_size=10,
+        api_connect_timeout=5.0,
+        api_read_timeout=30.0,
+        api_retries=3,
+        declare_cache_ttl=300.0,
+        api_cache_ttl=5.0,
+        api_cache_stale_ttl=10.0,
+        api_cache_size=256,
+        compress_threshold=DEFAULT_COMPRESS_THRESHOLD,
+        compact_results=False,
+        rabbitmq_api_hosts=None,
+        node_strategy="round-robin",
+        health_check_interval=10.0,
+        sample_interval=10.0,
+        sample_history=60,
+        workers=16,
+        rate_limits=None,
+        blocked_timeout=5.0,
     ):
         # Setup logger
         logger.remove()
@@ -50,181 +103,832 @@ class RabbitMQMCPServer:
         self.rabbitmq_password = rabbitmq_password
         self.rabbitmq_use_tls = rabbitmq_use_tls
         self.rabbitmq_api_port = rabbitmq_api_port
+        # Management API nodes, when they differ from the AMQP hosts
+        self.rabbitmq_api_hosts = rabbitmq_api_hosts or rabbitmq_host
+        self.node_strategy = node_strategy
+        self.health_check_interval = health_check_interval
+        self.sample_interval = sample_interval
+        self.sample_history = sample_history
+
+        self.pool_size = pool_size
+        self.heartbeat = heartbeat
+        self.api_pool_size = api_pool_size
+        self.api_connect_timeout = api_connect_timeout
+        self.api_read_timeout = api_read_timeout
+        self.api_retries = api_retries
+        self.declare_cache_ttl = declare_cache_ttl
+        self.api_cache_ttl = api_cache_ttl
+        self.api_cache_stale_ttl = api_cache_stale_ttl
+        self.api_cache_size = api_cache_size
+        self.compress_threshold = compress_threshold
+        self.compact_results = compact_results
+        self.workers = workers
+        # Publish rate limits ("queue:orders=100:500"), and how long a publish waits out a block
+        self.rate_limiter = RateLimiter([parse_rate_limit(spec) for spec in rate_limits or ()])
+        self.blocked_timeout = blocked_timeout
+
+        # Broker clients shared by all tools, created on first use
+        self._rabbitmq_connection = None
+        self._rabbitmq_pool = None
+        self._rabbitmq_async = None
+        self._rabbitmq_admin = None
+        self._queue_sampler = None
+        self._executor = None
+        self._clients_lock = threading.Lock()
 
         # Register tools
         self._register_tools()
+        self._register_routes()
 
-    def _register_tools(self):
-        @self.mcp.tool()
-        def enqueue(queue: str, message: str) -> str:
-            """Enqueue a message to a queue hosted on RabbitMQ."""
-            validate_rabbitmq_name(queue, "Queue name")
-            try:
-                rabbitmq = RabbitMQConnection(
-                    self.rabbitmq_host,
-                    self.rabbitmq_port,
+    def _get_rabbitmq_connection(self) -> "RabbitMQConnection":
+        # Callers hold self._clients_lock
+        if self._rabbitmq_connection is None:
+            # The clients import pika and requests, so startup doesn't pay for them
+            from mcp_server_rabbitmq.connection import RabbitMQConnection
+
+            self._rabbitmq_connection = RabbitMQConnection(
+                self.rabbitmq_host,
+                self.rabbitmq_port,
+                self.rabbitmq_username,
+                self.rabbitmq_password,
+                self.rabbitmq_use_tls,
+                heartbeat=self.heartbeat,
+                strategy=self.node_strategy,
+                health_check_interval=self.health_check_interval,
+                blocked_timeout=self.blocked_timeout,
+            )
+        return self._rabbitmq_connection
+
+    @property
+    def rabbitmq_pool(self) -> "RabbitMQConnectionPool":
+        """Connection pool shared by the blocking publishing tools"""
+        with self._clients_lock:
+            if self._rabbitmq_pool is None:
+                from mcp_server_rabbitmq.connection import RabbitMQConnectionPool
+
+                self._rabbitmq_pool = RabbitMQConnectionPool(
+                    self._get_rabbitmq_connection(),
+                    max_size=self.pool_size,
+                    # Service idle connections well within the negotiated heartbeat timeout
+                    heartbeat_interval=self.heartbeat / 2 if self.heartbeat else 0,
+                    declare_ttl=self.declare_cache_ttl,
+                    blocked_timeout=self.blocked_timeout,
+                )
+            return self._rabbitmq_pool
+
+    @property
+    def rabbitmq_async(self) -> "AsyncRabbitMQConnection":
+        """Asyncio connection multiplexing the enqueue, fanout and publish tools"""
+        with self._clients_lock:
+            if self._rabbitmq_async is None:
+                from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+
+                self._rabbitmq_async = AsyncRabbitMQConnection(
+                    self._get_rabbitmq_connection(),
+                    declare_ttl=self.declare_cache_ttl,
+                    blocked_timeout=self.blocked_timeout,
+                )
+            return self._rabbitmq_async
+
+    @property
+    def rabbitmq_admin(self) -> "RabbitMQAdmin":
+        """Management API client shared by all admin tools"""
+        with self._clients_lock:
+            if self._rabbitmq_admin is None:
+                from mcp_server_rabbitmq.admin import RabbitMQAdmin
+
+                self._rabbitmq_admin = RabbitMQAdmin(
+                    self.rabbitmq_api_hosts,
+                    self.rabbitmq_api_port,
                     self.rabbitmq_username,
                     self.rabbitmq_password,
                     self.rabbitmq_use_tls,
+                    pool_size=self.api_pool_size,
+                    connect_timeout=self.api_connect_timeout,
+                    read_timeout=self.api_read_timeout,
+                    max_retries=self.api_retries,
+                    cache_ttl=self.api_cache_ttl,
+                    cache_stale_ttl=self.api_cache_stale_ttl,
+                    cache_max_size=self.api_cache_size,
+                    strategy=self.node_strategy,
+                    health_check_interval=self.health_check_interval,
+                )
+            return self._rabbitmq_admin
+
+    @property
+    def queue_sampler(self) -> QueueSampler:
+        """Background sampler of queue depths, started on first use"""
+        if self.sample_interval <= 0:
+            raise RuntimeError("Queue sampling is disabled (--sample-interval 0)")
+        admin = self.rabbitmq_admin
+        with self._clients_lock:
+            if self._queue_sampler is None:
+                self._queue_sampler = QueueSampler(
+                    admin, interval=self.sample_interval, history=self.sample_history
+                )
+            sampler = self._queue_sampler
+        sampler.start()
+        return sampler
+
+    def close(self):
+        """Release broker connections held by the server."""
+        with self._clients_lock:
+            if self._queue_sampler is not None:
+                self._queue_sampler.close()
+                self._queue_sampler = None
+            if self._rabbitmq_pool is not None:
+                self._rabbitmq_pool.close()
+                self._rabbitmq_pool = None
+            if self._rabbitmq_admin is not None:
+                self._rabbitmq_admin.close()
+                self._rabbitmq_admin = None
+            if self._rabbitmq_connection is not None:
+                self._rabbitmq_connection.close()
+                self._rabbitmq_connection = None
+            self._rabbitmq_async = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def aclose(self):
+        """Release broker connections, closing the asyncio connection on the running loop."""
+        if self._rabbitmq_async is not None:
+            await self._rabbitmq_async.close()
+        self.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Bounded pool of worker threads running the blocking broker calls of all tools"""
+        with self._clients_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="rabbitmq-mcp-worker"
+                )
+            return self._executor
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking call on the worker pool, keeping the event loop free."""
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread, carry the caller's context (the MCP request) into the worker
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await loop.run_in_executor(self.executor, call)
+
+    def _tool(self, fn):
+        """Register fn as an MCP tool, recording its latency and failures.
+
+        Blocking (sync) tools run on the worker pool rather than inline on the event loop, so
+        a slow broker call holds one worker instead of stalling every connected client.
+        """
+        if not inspect.iscoroutinefunction(fn):
+            blocking = fn
+
+            @functools.wraps(blocking)
+            async def fn(*args, **kwargs):
+                return await self.run_blocking(blocking, *args, **kwargs)
+
+        return self.mcp.tool()(instrument_tool(fn))
+
+    def _forget_declared(self, kind: str, names: Iterable[str]) -> None:
+        """Make the publishing connections declare deleted queues or exchanges again"""
+        for name in names:
+            if self._rabbitmq_pool is not None:
+                self._rabbitmq_pool.forget_declared(kind, name)
+            if self._rabbitmq_async is not None:
+                self._rabbitmq_async.forget_declared(kind, name)
+
+    def _messages_changed(self) -> None:
+        """Stop serving cached queue counts once this server has published or consumed"""
+        if self._rabbitmq_admin is not None:
+            self._rabbitmq_admin.invalidate_queues()
+
+    def _deleted(self, kind: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Forget the declarations of what a bulk delete removed, passing its result through"""
+        self._forget_declared(
+            kind, [r["name"] for r in result["results"] if r["status"] == "deleted"]
+        )
+        return result
+
+    def _result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """A tool's structured result, without null and zero fields in compact mode."""
+        return compact(result) if self.compact_results else result
+
+    def stats(self) -> dict:
+        """Metrics recorded so far, with the state of the shared broker clients."""
+        stats = REGISTRY.snapshot()
+        if self._rabbitmq_pool is not None:
+            stats["amqp_pool_size"] = self._rabbitmq_pool.size
+        if self._rabbitmq_admin is not None:
+            stats["api_cache"] = self._rabbitmq_admin.cache_stats()
+            stats["api_nodes"] = self._rabbitmq_admin.nodes.stats()
+        if self._rabbitmq_connection is not None:
+            stats["amqp_nodes"] = self._rabbitmq_connection.nodes.stats()
+        if self.rate_limiter.limits:
+            stats["rate_limits"] = self.rate_limiter.stats()
+        return stats
+
+    def _register_routes(self):
+        @self.mcp.custom_route("/metrics", methods=["GET"])
+        async def metrics(request: Request) -> Response:
+            """Prometheus scrape endpoint, served by the HTTP transports."""
+            return PlainTextResponse(
+                REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+    def _register_tools(self):
+        @self._tool
+        async def enqueue(
+            queue: str,
+            message: Union[str, Dict[str, Any], List[Any]],
+            passive: bool = False,
+            durable: bool = False,
+            arguments: Optional[Dict[str, Any]] = None,
+            body_encoding: Literal["utf-8", "base64"] = "utf-8",
+            compression: Optional[Literal["gzip", "zstd"]] = None,
+            headers: Optional[Dict[str, Any]] = None,
+            properties: Optional[MessageProperties] = None,
+        ) -> str:
+            """Enqueue a message to a queue hosted on RabbitMQ.
+
+            The queue is declared first: set passive to only check that it exists, or durable and
+            arguments to match how an existing queue was declared.
+
+            An object or array message is published as JSON (content type application/json);
+            with body_encoding base64 a string message is published as the bytes it encodes.
+            compression gzips (or zstd-compresses) bodies above the server's size threshold and
+            sets content_encoding. Set properties.delivery_mode to 2 for a persistent message.
+
+            When the queue's publish rate limit is reached, or the broker is blocking publishers
+            (a memory or disk alarm), nothing is published and a "Throttled" message says why
+            and, for rate limits, when to retry.
+            """
+            validate_rabbitmq_name(queue, "Queue name")
+            try:
+                await handle_enqueue_async(
+                    self.rabbitmq_async,
+                    queue,
+                    message,
+                    passive,
+                    durable,
+                    arguments,
+                    body_encoding=body_encoding,
+                    compression=compression,
+                    compress_threshold=self.compress_threshold,
+                    headers=headers,
+                    properties=properties,
+                    rate_limiter=self.rate_limiter,
                 )
-                handle_enqueue(rabbitmq, queue, message)
+                self._messages_changed()
                 return "Message successfully enqueued"
+            except Throttled as e:
+                self.logger.warning(f"{e}")
+                return f"Throttled, message not enqueued: {e}"
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to enqueue message: {e}"
+                raise ToolError(f"Failed to enqueue message: {e}") from e
+
+        @self._tool
+        async def fanout(
+            exchange: str,
+            message: Union[str, Dict[str, Any], List[Any]],
+            passive: bool = False,
+            durable: bool = False,
+            body_encoding: Literal["utf-8", "base64"] = "utf-8",
+            compression: Optional[Literal["gzip", "zstd"]] = None,
+            headers: Optional[Dict[str, Any]] = None,
+            properties: Optional[MessageProperties] = None,
+        ) -> str:
+            """Publish a message to an exchange with fanout type.
 
-        @self.mcp.tool()
-        def fanout(exchange: str, message: str) -> str:
-            """Publish a message to an exchange with fanout type."""
+            Set passive to only check that the exchange exists, or durable to match a durable one.
+            message, body_encoding, compression, headers and properties work as for enqueue, and
+            so does throttling, by the exchange's rate limit.
+            """
             validate_rabbitmq_name(exchange, "Exchange name")
             try:
-                rabbitmq = RabbitMQConnection(
-                    self.rabbitmq_host,
-                    self.rabbitmq_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
+                await handle_fanout_async(
+                    self.rabbitmq_async,
+                    exchange,
+                    message,
+                    passive,
+                    durable,
+                    body_encoding=body_encoding,
+                    compression=compression,
+                    compress_threshold=self.compress_threshold,
+                    headers=headers,
+                    properties=properties,
+                    rate_limiter=self.rate_limiter,
                 )
-                handle_fanout(rabbitmq, exchange, message)
+                self._messages_changed()
                 return "Message successfully published to exchange"
+            except Throttled as e:
+                self.logger.warning(f"{e}")
+                return f"Throttled, message not published: {e}"
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to publish message: {e}"
+                raise ToolError(f"Failed to publish message: {e}") from e
 
-        @self.mcp.tool()
-        def list_queues() -> str:
-            """List all the queues in the broker."""
+        @self._tool
+        async def publish(
+            exchange: str,
+            message: Union[str, Dict[str, Any], List[Any]],
+            routing_key: str = "",
+            routing_keys: Optional[List[str]] = None,
+            exchange_type: Literal["direct", "topic", "headers", "fanout"] = "direct",
+            passive: bool = False,
+            durable: bool = False,
+            body_encoding: Literal["utf-8", "base64"] = "utf-8",
+            compression: Optional[Literal["gzip", "zstd"]] = None,
+            headers: Optional[Dict[str, Any]] = None,
+            properties: Optional[MessageProperties] = None,
+        ) -> Dict[str, Any]:
+            """Publish a message to a direct, topic, headers or fanout exchange.
+
+            The exchange is declared with exchange_type (passive/durable as for fanout) and the
+            broker routes the message by routing_key, or for a headers exchange by matching
+            headers against its bindings. Pass routing_keys instead to publish the same message
+            once per key in a single call, e.g. to several topics. With the default exchange ("")
+            each key names a queue, as for enqueue. message, body_encoding, compression and
+            properties work as for enqueue. Returns the ack/nack status per routing key
+            (returned when no queue received the copy), or throttled with the reason and
+            retry_after_seconds as for publish_batch.
+            """
+            if exchange:
+                validate_rabbitmq_name(exchange, "Exchange name")
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
+                result = await handle_publish_async(
+                    self.rabbitmq_async,
+                    exchange,
+                    message,
+                    routing_keys if routing_keys is not None else [routing_key],
+                    exchange_type=exchange_type,
+                    passive=passive,
+                    durable=durable,
+                    body_encoding=body_encoding,
+                    compression=compression,
+                    compress_threshold=self.compress_threshold,
+                    headers=headers,
+                    properties=properties,
+                    rate_limiter=self.rate_limiter,
+                )
+                self._messages_changed()
+                return self._result(result)
+            except Throttled as e:
+                self.logger.warning(f"{e}")
+                return self._result(
+                    {
+                        "published": 0,
+                        "throttled": True,
+                        "reason": f"{e}",
+                        "retry_after_seconds": e.retry_after,
+                    }
                 )
-                result = handle_list_queues(admin)
-                return str(result)
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to list queues: {e}"
+                raise ToolError(f"Failed to publish message: {e}") from e
+
+        @self._tool
+        def publish_batch(
+            messages: List[PublishMessage],
+            exchange: str = "",
+            routing_key: str = "",
+            passive: bool = False,
+            durable: bool = False,
+            compression: Optional[Literal["gzip", "zstd"]] = None,
+        ) -> Dict[str, Any]:
+            """Publish a batch of messages on one channel with publisher confirms.
 
-        @self.mcp.tool()
-        def list_exchanges() -> str:
-            """List all the exchanges in the broker."""
+            With the default exchange ("") each message is delivered to the queue named by its
+            routing key, declaring those queues first (passive/durable as for enqueue). Bodies
+            and compression work as for enqueue. Returns the per-message ack/nack status
+            (returned when no queue received the message) and throughput, or, if a rate limit or
+            broker alarm refuses the batch, throttled with the reason and retry_after_seconds;
+            a throttled batch publishes nothing.
+            """
+            if exchange:
+                validate_rabbitmq_name(exchange, "Exchange name")
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
+                result = handle_publish_batch(
+                    self.rabbitmq_pool,
+                    messages,
+                    exchange=exchange,
+                    routing_key=routing_key,
+                    passive=passive,
+                    durable=durable,
+                    compression=compression,
+                    compress_threshold=self.compress_threshold,
+                    rate_limiter=self.rate_limiter,
+                )
+                self._messages_changed()
+                return self._result(result)
+            except Throttled as e:
+                self.logger.warning(f"{e}")
+                return self._result(
+                    {
+                        "published": 0,
+                        "throttled": True,
+                        "reason": f"{e}",
+                        "retry_after_seconds": e.retry_after,
+                    }
                 )
-                result = handle_list_exchanges(admin)
-                return str(result)
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to list exchanges: {e}"
+                raise ToolError(f"Failed to publish batch: {e}") from e
+
+        @self._tool
+        def consume(
+            queue: str,
+            max_messages: int = 10,
+            prefetch: Optional[int] = None,
+            max_bytes: Optional[int] = 1048576,
+            timeout: float = 5.0,
+        ) -> Dict[str, Any]:
+            """Consume and acknowledge up to max_messages messages from a queue.
 
-        @self.mcp.tool()
-        def get_queue_info(queue: str, vhost: str = "/") -> str:
-            """Get detailed information about a specific queue."""
+            Only messages already in the queue are taken, up to prefetch unacked at a time,
+            stopping after max_bytes of bodies or timeout seconds. Returns each message's body
+            (base64 if not UTF-8), routing key and properties. The messages are removed from the
+            queue; use peek to leave them there.
+            """
+            validate_rabbitmq_name(queue, "Queue name")
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
+                result = handle_consume(
+                    self.rabbitmq_pool, queue, max_messages, True, prefetch, max_bytes, timeout
+                )
+                self._messages_changed()
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to consume messages: {e}") from e
+
+        @self._tool
+        def peek(
+            queue: str,
+            max_messages: int = 10,
+            max_bytes: Optional[int] = 1048576,
+            timeout: float = 5.0,
+        ) -> Dict[str, Any]:
+            """Look at up to max_messages messages in a queue without removing them.
+
+            Messages are requeued afterwards, so they are marked redelivered and may be delivered
+            to other consumers in the meantime. At most 65535 messages can be peeked at once.
+            Options and result are as for consume.
+            """
+            validate_rabbitmq_name(queue, "Queue name")
+            try:
+                result = handle_peek(self.rabbitmq_pool, queue, max_messages, max_bytes, timeout)
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to peek messages: {e}") from e
+
+        @self._tool
+        def sample_exchange(
+            exchange: str,
+            routing_keys: Optional[List[str]] = None,
+            duration: float = 10.0,
+            max_messages: int = 10000,
+            sample_size: int = 10,
+            max_body_bytes: int = 256,
+            prefetch: int = 100,
+        ) -> Dict[str, Any]:
+            """Watch the messages an exchange routes and report their rate and sizes.
+
+            A temporary queue is bound to the exchange and consumed for duration seconds (at
+            most 300) or until max_messages have arrived, then removed; messages delivered to
+            the exchange's own queues are not affected. Fanout, topic and headers exchanges are
+            watched in full, others on the routing keys of their existing bindings unless
+            routing_keys are given. Returns message and byte counts and rates, body sizes, the
+            busiest routing keys and a random sample of sample_size messages with bodies cut to
+            max_body_bytes; unread counts messages still queued when sampling stopped.
+            """
+            try:
+                result = handle_sample_exchange(
+                    self.rabbitmq_pool,
+                    self.rabbitmq_admin,
+                    exchange,
+                    routing_keys,
+                    duration,
+                    max_messages,
+                    sample_size,
+                    max_body_bytes,
+                    prefetch,
                 )
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to sample exchange: {e}") from e
+
+        @self._tool
+        def list_queues(
+            vhost: Optional[str] = None,
+            page: Optional[int] = 1,
+            page_size: int = 100,
+            name: Optional[str] = None,
+            use_regex: bool = False,
+        ) -> Dict[str, Any]:
+            """List the queues in the broker, one page at a time.
+
+            Returns queue names with the page number, page count and matching/total counts.
+            Filter by vhost, and by name using a substring or, with use_regex, a regular
+            expression. page_size can be at most 500. Pass page=None to stream every matching
+            name in one response instead.
+            """
+            try:
+                result = handle_list_queues(
+                    self.rabbitmq_admin, vhost, page, page_size, name, use_regex
+                )
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to list queues: {e}") from e
+
+        @self._tool
+        def list_exchanges(
+            vhost: Optional[str] = None,
+            page: Optional[int] = 1,
+            page_size: int = 100,
+            name: Optional[str] = None,
+            use_regex: bool = False,
+        ) -> Dict[str, Any]:
+            """List the exchanges in the broker, one page at a time.
+
+            Returns exchange names with the page number, page count and matching/total counts.
+            Filter by vhost, and by name using a substring or, with use_regex, a regular
+            expression. page_size can be at most 500. Pass page=None to stream every matching
+            name in one response instead.
+            """
+            try:
+                result = handle_list_exchanges(
+                    self.rabbitmq_admin, vhost, page, page_size, name, use_regex
+                )
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to list exchanges: {e}") from e
+
+        @self._tool
+        def get_queue_info(
+            queue: str, vhost: str = "/", fields: Optional[List[str]] = None
+        ) -> Dict[str, Any]:
+            """Get detailed information about a specific queue.
+
+            The full object is large; pass fields to return only those, using dotted names for
+            nested ones (e.g. ["messages", "consumers", "message_stats.publish_details.rate"]).
+            Results are cached for a few seconds, so counts changed by other clients can lag;
+            this server's own publishes and consumes refresh them.
+            """
+            try:
                 validate_rabbitmq_name(queue, "Queue name")
-                result = handle_get_queue_info(admin, queue, vhost)
-                return str(result)
+                result = handle_get_queue_info(self.rabbitmq_admin, queue, vhost, fields)
+                return self._result(result)
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to get queue info: {e}"
+                raise ToolError(f"Failed to get queue info: {e}") from e
 
-        @self.mcp.tool()
+        @self._tool
+        def get_queues_info(
+            names: Optional[List[str]] = None,
+            pattern: Optional[str] = None,
+            vhost: str = "/",
+            fields: Optional[List[str]] = None,
+            concurrency: int = 8,
+            max_pages: int = 10,
+        ) -> Dict[str, Any]:
+            """Get information about many queues at once, as a table.
+
+            Pass either names or pattern, a regular expression the broker matches against the
+            queue names in vhost, 500 queues per request. A pattern listing stops after
+            max_pages requests, with truncated set if more matches remain. Names are looked up
+            in parallel, up to concurrency at a time, and those that don't exist are listed as
+            missing. Returns columns and one row of values per queue; fields chooses the columns
+            (dotted names for nested ones), which default to the type, state, message and
+            consumer counts and publish/deliver rates.
+            """
+            try:
+                result = handle_get_queues_info(
+                    self.rabbitmq_admin, names, pattern, vhost, fields, concurrency, max_pages
+                )
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to get queues info: {e}") from e
+
+        @self._tool
         def delete_queue(queue: str, vhost: str = "/") -> str:
             """Delete a specific queue."""
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
-                )
                 validate_rabbitmq_name(queue, "Queue name")
-                handle_delete_queue(admin, queue, vhost)
+                handle_delete_queue(self.rabbitmq_admin, queue, vhost)
+                self._forget_declared("queue", [queue])
                 return f"Queue {queue} successfully deleted"
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to delete queue: {e}"
+                raise ToolError(f"Failed to delete queue: {e}") from e
 
-        @self.mcp.tool()
+        @self._tool
         def purge_queue(queue: str, vhost: str = "/") -> str:
             """Remove all messages from a specific queue."""
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
-                )
                 validate_rabbitmq_name(queue, "Queue name")
-                handle_purge_queue(admin, queue, vhost)
+                handle_purge_queue(self.rabbitmq_admin, queue, vhost)
                 return f"Queue {queue} successfully purged"
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to purge queue: {e}"
+                raise ToolError(f"Failed to purge queue: {e}") from e
 
-        @self.mcp.tool()
+        @self._tool
         def delete_exchange(exchange: str, vhost: str = "/") -> str:
             """Delete a specific exchange."""
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
-                )
                 validate_rabbitmq_name(exchange, "Exchange name")
-                handle_delete_exchange(admin, exchange, vhost)
+                handle_delete_exchange(self.rabbitmq_admin, exchange, vhost)
+                self._forget_declared("exchange", [exchange])
                 return f"Exchange {exchange} successfully deleted"
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to delete exchange: {e}"
+                raise ToolError(f"Failed to delete exchange: {e}") from e
+
+        @self._tool
+        def bulk_delete_queues(
+            names: Optional[List[str]] = None,
+            pattern: Optional[str] = None,
+            vhost: str = "/",
+            dry_run: bool = False,
+            concurrency: int = 8,
+        ) -> Dict[str, Any]:
+            """Delete many queues at once, given their names or a regular expression.
+
+            Pass either names or pattern (matched against every queue in vhost). Deletes run in
+            parallel, up to concurrency at a time. With dry_run, only lists what would be
+            deleted. Returns the outcome for each queue.
+            """
+            try:
+                result = handle_bulk_delete_queues(
+                    self.rabbitmq_admin, names, pattern, vhost, dry_run, concurrency
+                )
+                return self._result(self._deleted("queue", result))
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to delete queues: {e}") from e
+
+        @self._tool
+        def bulk_purge_queues(
+            names: Optional[List[str]] = None,
+            pattern: Optional[str] = None,
+            vhost: str = "/",
+            dry_run: bool = False,
+            concurrency: int = 8,
+        ) -> Dict[str, Any]:
+            """Purge many queues at once, given their names or a regular expression.
 
-        @self.mcp.tool()
-        def get_exchange_info(exchange: str, vhost: str = "/") -> str:
-            """Get detailed information about a specific exchange."""
+            Options and result are as for bulk_delete_queues.
+            """
             try:
-                admin = RabbitMQAdmin(
-                    self.rabbitmq_host,
-                    self.rabbitmq_api_port,
-                    self.rabbitmq_username,
-                    self.rabbitmq_password,
-                    self.rabbitmq_use_tls,
+                result = handle_bulk_purge_queues(
+                    self.rabbitmq_admin, names, pattern, vhost, dry_run, concurrency
+                )
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to purge queues: {e}") from e
+
+        @self._tool
+        def bulk_delete_exchanges(
+            names: Optional[List[str]] = None,
+            pattern: Optional[str] = None,
+            vhost: str = "/",
+            dry_run: bool = False,
+            concurrency: int = 8,
+        ) -> Dict[str, Any]:
+            """Delete many exchanges at once, given their names or a regular expression.
+
+            A pattern never matches the default or amq.* exchanges. Options and result are as
+            for bulk_delete_queues.
+            """
+            try:
+                result = handle_bulk_delete_exchanges(
+                    self.rabbitmq_admin, names, pattern, vhost, dry_run, concurrency
                 )
+                return self._result(self._deleted("exchange", result))
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to delete exchanges: {e}") from e
+
+        @self._tool
+        def get_exchange_info(
+            exchange: str, vhost: str = "/", fields: Optional[List[str]] = None
+        ) -> Dict[str, Any]:
+            """Get detailed information about a specific exchange.
+
+            Pass fields to return only those, using dotted names for nested ones (e.g.
+            ["type", "durable", "message_stats.publish_in_details.rate"]).
+            """
+            try:
                 validate_rabbitmq_name(exchange, "Exchange name")
-                result = handle_get_exchange_info(admin, exchange, vhost)
-                return str(result)
+                result = handle_get_exchange_info(self.rabbitmq_admin, exchange, vhost, fields)
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to get exchange info: {e}") from e
+
+        @self._tool
+        def get_exchanges_info(
+            names: Optional[List[str]] = None,
+            pattern: Optional[str] = None,
+            vhost: str = "/",
+            fields: Optional[List[str]] = None,
+            concurrency: int = 8,
+            max_pages: int = 10,
+        ) -> Dict[str, Any]:
+            """Get information about many exchanges at once, as a table.
+
+            names, pattern, concurrency and max_pages work as for get_queues_info. The columns
+            default to the type, durability flags and publish in/out rates.
+            """
+            try:
+                result = handle_get_exchanges_info(
+                    self.rabbitmq_admin, names, pattern, vhost, fields, concurrency, max_pages
+                )
+                return self._result(result)
             except Exception as e:
                 self.logger.error(f"{e}")
-                return f"Failed to get exchange info: {e}"
+                raise ToolError(f"Failed to get exchanges info: {e}") from e
+
+        @self._tool
+        def topology_snapshot(vhost: Optional[str] = None) -> Dict[str, Any]:
+            """Get the broker's whole topology in one call, optionally for a single vhost.
+
+            Returns the server overview and, per vhost, every exchange (type, durability and
+            its bindings with routing keys) and every queue (durability, message and consumer
+            counts, and the exchanges bound to it).
+            """
+            try:
+                result = handle_topology_snapshot(self.rabbitmq_admin, vhost)
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to get topology snapshot: {e}") from e
+
+        @self._tool
+        def queue_trends(
+            vhost: Optional[str] = None,
+            name: Optional[str] = None,
+            use_regex: bool = False,
+            limit: int = 20,
+        ) -> Dict[str, Any]:
+            """Get how queue depths are changing, from samples the server takes in the background.
+
+            Use this instead of polling get_queue_info. For the deepest `limit` queues matching
+            vhost and name (a substring or, with use_regex, a regular expression) returns the
+            current depth, whether it is growing, draining or steady, the depth change and
+            publish/deliver rates per second over the sampled window, and the estimated seconds
+            until the queue is empty. Sampling starts on the first call, so rates need a second
+            sample, one interval later.
+            """
+            try:
+                result = handle_queue_trends(self.queue_sampler, vhost, name, use_regex, limit)
+                return self._result(result)
+            except Exception as e:
+                self.logger.error(f"{e}")
+                raise ToolError(f"Failed to get queue trends: {e}") from e
+
+        @self._tool
+        def server_stats() -> Dict[str, Any]:
+            """Get this MCP server's own metrics.
+
+            Returns latency percentiles (seconds, estimated from histogram buckets) and error
+            counts per tool, AMQP connect time, management API round-trip time and response
+            sizes per endpoint, plus connection pool and API cache state. Use it to tell broker
+            slowness from server overhead.
+            """
+            return self._result(self.stats())
 
     def run(self, args):
         """Run the MCP server with the provided arguments."""
+        asyncio.run(self.run_async(args))
+
+    async def run_async(self, args):
+        """Run the MCP server on the current event loop, closing broker connections on exit."""
         self.logger.info(f"Starting RabbitMQ MCP Server v{MCP_SERVER_VERSION}")
         self.logger.info(f"Connecting to RabbitMQ at {self.rabbitmq_host}:{self.rabbitmq_port}")
 
-        if args.sse:
-            self.mcp.settings.port = args.server_port
-            self.mcp.run(transport="sse")
-        else:
-            self.mcp.run()
+        transport = "sse" if args.sse else args.transport
+        try:
+            if transport == "stdio":
+                await self.mcp.run_async()
+            elif transport == "streamable-http":
+                await self.mcp.run_async(
+                    transport=transport,
+                    host=args.server_host,
+                    port=args.server_port,
+                    stateless_http=args.stateless_http or None,
+                )
+            else:
+                await self.mcp.run_async(
+                    transport=transport, host=args.server_host, port=args.server_port
+                )
+        finally:
+            await self.aclose()
 
 
 def main():
@@ -232,7 +936,12 @@ def main():
     parser = argparse.ArgumentParser(
         description="A Model Context Protocol (MCP) server for RabbitMQ"
     )
-    parser.add_argument("--rabbitmq-host", type=str, required=True, help="RabbitMQ host")
+    parser.add_argument(
+        "--rabbitmq-host",
+        type=str,
+        required=True,
+        help="RabbitMQ host, or comma-separated cluster nodes as host or host:port",
+    )
     parser.add_argument("--port", type=int, required=True, help="Port of the RabbitMQ host")
     parser.add_argument("--username", type=str, required=True, help="Username for the connection")
     parser.add_argument("--password", type=str, required=True, help="Password for the connection")
@@ -242,10 +951,153 @@ def main():
     parser.add_argument(
         "--api-port", type=int, default=15671, help="Port for the RabbitMQ management API"
     )
-    parser.add_argument("--sse", action="store_true", help="Use SSE transport")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "sse", "streamable-http"),
+        default="stdio",
+        help="MCP transport; the HTTP transports serve many clients from one server",
+    )
+    parser.add_argument("--sse", action="store_true", help="Use SSE transport (--transport sse)")
+    parser.add_argument(
+        "--server-host",
+        type=str,
+        default="127.0.0.1",
+        help="Address the HTTP transports listen on (0.0.0.0 for all interfaces)",
+    )
     parser.add_argument(
         "--server-port", type=int, default=8888, help="Port to run the MCP server on"
     )
+    parser.add_argument(
+        "--stateless-http",
+        action="store_true",
+        help="Serve streamable HTTP without sessions, so replicas can share a load balancer",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Worker threads running blocking broker calls, shared by all clients",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=4,
+        help="Maximum number of pooled AMQP connections used for publishing",
+    )
+    parser.add_argument(
+        "--heartbeat",
+        type=int,
+        default=60,
+        help="AMQP heartbeat timeout in seconds (0 disables heartbeats)",
+    )
+    parser.add_argument(
+        "--api-pool-size",
+        type=int,
+        default=10,
+        help="Maximum number of keep-alive connections to the management API",
+    )
+    parser.add_argument(
+        "--api-connect-timeout",
+        type=float,
+        default=5.0,
+        help="Connect timeout in seconds for management API requests",
+    )
+    parser.add_argument(
+        "--api-read-timeout",
+        type=float,
+        default=30.0,
+        help="Read timeout in seconds for management API requests",
+    )
+    parser.add_argument(
+        "--api-retries",
+        type=int,
+        default=3,
+        help="Retries with backoff for management API connection errors and 5xx responses",
+    )
+    parser.add_argument(
+        "--declare-cache-ttl",
+        type=float,
+        default=300.0,
+        help="Seconds a queue/exchange declare is remembered per connection (0 disables)",
+    )
+    parser.add_argument(
+        "--api-cache-ttl",
+        type=float,
+        default=5.0,
+        help=(
+            "Seconds management API read results are served from cache (0 disables); queue "
+            "counts changed by other clients lag by up to this plus --api-cache-stale-ttl"
+        ),
+    )
+    parser.add_argument(
+        "--api-cache-stale-ttl",
+        type=float,
+        default=10.0,
+        help="Further seconds an expired result is served while it refreshes in the background",
+    )
+    parser.add_argument(
+        "--api-cache-size",
+        type=int,
+        default=256,
+        help="Maximum number of management API responses kept in cache",
+    )
+    parser.add_argument(
+        "--compress-threshold",
+        type=int,
+        default=DEFAULT_COMPRESS_THRESHOLD,
+        help="Smallest message body, in bytes, that the publishing tools compress when asked to",
+    )
+    parser.add_argument(
+        "--compact-results",
+        action="store_true",
+        help="Leave null, zero and empty fields out of tool results",
+    )
+    parser.add_argument(
+        "--api-hosts",
+        type=str,
+        default=None,
+        help="Comma-separated management API nodes (host or host:port), if not the AMQP hosts",
+    )
+    parser.add_argument(
+        "--node-strategy",
+        choices=STRATEGIES,
+        default="round-robin",
+        help="How to spread connections and API requests across healthy cluster nodes",
+    )
+    parser.add_argument(
+        "--health-check-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between background health checks of cluster nodes (0 to disable)",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between queue depth samples for queue_trends (0 to disable)",
+    )
+    parser.add_argument(
+        "--sample-history",
+        type=int,
+        default=60,
+        help="Samples kept per queue for queue_trends",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        metavar="KIND:PATTERN=RATE[:BURST]",
+        help=(
+            "Publish rate limit in messages per second for each queue or exchange matching a "
+            "glob, e.g. queue:orders.*=100:500 (repeatable; the first match applies)"
+        ),
+    )
+    parser.add_argument(
+        "--blocked-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds a publish waits for the broker to lift a resource alarm before it is "
+        "refused as throttled",
+    )
 
     args = parser.parse_args()
 
@@ -257,6 +1109,26 @@ def main():
         rabbitmq_password=args.password,
         rabbitmq_use_tls=args.use_tls,
         rabbitmq_api_port=args.api_port,
+        pool_size=args.pool_size,
+        heartbeat=args.heartbeat,
+        api_pool_size=args.api_pool_size,
+        api_connect_timeout=args.api_connect_timeout,
+        api_read_timeout=args.api_read_timeout,
+        api_retries=args.api_retries,
+        declare_cache_ttl=args.declare_cache_ttl,
+        api_cache_ttl=args.api_cache_ttl,
+        api_cache_stale_ttl=args.api_cache_stale_ttl,
+        api_cache_size=args.api_cache_size,
+        compress_threshold=args.compress_threshold,
+        compact_results=args.compact_results,
+        rabbitmq_api_hosts=args.api_hosts,
+        node_strategy=args.node_strategy,
+        health_check_interval=args.health_check_interval,
+        sample_interval=args.sample_interval,
+        sample_history=args.sample_history,
+        workers=args.workers,
+        rate_limits=args.rate_limit,
+        blocked_timeout=args.blocked_timeout,
     )
 
     # Run the server with remaining args
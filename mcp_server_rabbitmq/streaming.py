@@ -0,0 +1,77 @@
+"""Incremental parsing of large JSON responses from the management API."""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,]"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the elements of a UTF-8 encoded JSON array as its bytes arrive.
+
+    Only the element being decoded and the unread remainder of the current chunk are held in
+    memory, so listings of any size can be processed one item at a time.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    exhausted = False
+
+    def read_more() -> None:
+        nonlocal buffer, pos, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            text = utf8.decode(b"", final=True)
+        else:
+            text = utf8.decode(chunk)
+        buffer = buffer[pos:] + text
+        pos = 0
+
+    state = "open"
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if exhausted:
+                raise ValueError("Truncated JSON array")
+            read_more()
+            continue
+        char = buffer[pos]
+        if state == "open":
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            pos += 1
+            state = "first"
+        elif state == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Unexpected {char!r} in JSON array")
+            pos += 1
+            state = "item"
+        elif state == "first" and char == "]":
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                read_more()
+                continue
+            # A number (or literal) only ends at a delimiter; the rest may be in the next chunk
+            if (
+                buffer[end - 1] not in '}]"'
+                and not exhausted
+                and (end == len(buffer) or buffer[end] not in _DELIMITERS)
+            ):
+                read_more()
+                continue
+            pos = end
+            state = "separator"
+            yield item
@@ -0,0 +1,81 @@
+"""TLS context shared by all connections to the broker, resuming sessions between them."""
+
+import socket
+import ssl
+import threading
+from typing import Dict, Optional, Tuple
+
+from mcp_server_rabbitmq.metrics import TLS_HANDSHAKES
+
+# Ciphers offered to the broker: forward secrecy with AES-GCM, RSA certificates
+AMQP_CIPHERS = "ECDHE+AESGCM:!ECDSA"
+
+
+def _peer(sock: socket.socket) -> Optional[Tuple[str, int]]:
+    try:
+        return sock.getpeername()[:2]
+    except OSError:
+        return None
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    def do_handshake(self, block=False):
+        super().do_handshake(block)
+        self.context.handshake_done(self)
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """An SSLContext that offers each server the session of the last handshake with it.
+
+    Python only resumes a TLS session that is passed to ``wrap_socket``, which pika never does,
+    so every connection would pay for a full handshake. This context remembers the session per
+    server address and offers it to the next connection there, which the server may accept to
+    skip the key exchange. Configure it once and share it between connections.
+    """
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def __init__(self, protocol=None, client: str = "amqp"):
+        self.client = client
+        self._sessions: Dict[Tuple[str, int], ssl.SSLSession] = {}
+        self._lock = threading.Lock()
+
+    def wrap_socket(
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ):
+        if session is None and not server_side:
+            peer = _peer(sock)
+            with self._lock:
+                session = self._sessions.get(peer) if peer else None
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def handshake_done(self, sock: ssl.SSLSocket) -> None:
+        """Count the handshake and keep its session for the next connection to the server"""
+        if sock.server_side:
+            return
+        TLS_HANDSHAKES.inc(client=self.client, resumed=str(sock.session_reused).lower())
+        peer = _peer(sock)
+        session = sock.session
+        if peer is not None and session is not None:
+            with self._lock:
+                self._sessions[peer] = session
+
+
+def amqp_ssl_context() -> ResumingSSLContext:
+    """TLS 1.2 client context for AMQPS connections"""
+    context = ResumingSSLContext(ssl.PROTOCOL_TLSv1_2)
+    context.set_ciphers(AMQP_CIPHERS)
+    return context
@@ -0,0 +1,13 @@
+"""Validation of names sent to the broker, shared by the AMQP and management clients."""
+
+
+def validate_rabbitmq_name(name: str, field_name: str) -> None:
+    """Validate RabbitMQ queue/exchange names"""
+    if not name or not name.strip():
+        raise ValueError(f"{field_name} cannot be empty")
+    if not all(c.isalnum() or c in "-_.:" for c in name):
+        raise ValueError(
+            f"{field_name} can only contain letters, digits, hyphen, underscore, period, or colon"
+        )
+    if len(name) > 255:
+        raise ValueError(f"{field_name} must be less than 255 characters")
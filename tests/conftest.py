@@ -0,0 +1,77 @@
+"""Fixtures running the broker clients against the in-process stand-ins."""
+
+import asyncio
+
+import pytest
+
+from mcp_server_rabbitmq.admin import RabbitMQAdmin
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.connection import RabbitMQConnection, RabbitMQConnectionPool
+from mcp_server_rabbitmq.handlers import handle_enqueue_async, handle_fanout_async
+from tests.standin import StandInBroker, StandInManagementAPI
+
+
+@pytest.fixture
+def broker():
+    with StandInBroker() as broker:
+        yield broker
+
+
+@pytest.fixture
+def management_api(broker):
+    with StandInManagementAPI(broker) as api:
+        yield api
+
+
+@pytest.fixture
+def rabbitmq(broker):
+    return RabbitMQConnection(
+        broker.host, broker.port, "guest", "guest", False, health_check_interval=0
+    )
+
+
+@pytest.fixture
+def pool(rabbitmq):
+    pool = RabbitMQConnectionPool(rabbitmq, max_size=2, heartbeat_interval=0)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def admin(management_api):
+    admin = RabbitMQAdmin(
+        management_api.host,
+        management_api.port,
+        management_api.username,
+        management_api.password,
+        False,
+        cache_ttl=0,
+        health_check_interval=0,
+    )
+    yield admin
+    admin.close()
+
+
+def _publisher(rabbitmq, handler):
+    # Run a publishing handler the way its tool does, over a connection of its own
+    def publish(*args, **kwargs) -> None:
+        async def run():
+            connection = AsyncRabbitMQConnection(rabbitmq, timeout=5)
+            try:
+                await handler(connection, *args, **kwargs)
+            finally:
+                await connection.close()
+
+        asyncio.run(run())
+
+    return publish
+
+
+@pytest.fixture
+def enqueue(rabbitmq):
+    return _publisher(rabbitmq, handle_enqueue_async)
+
+
+@pytest.fixture
+def fanout(rabbitmq):
+    return _publisher(rabbitmq, handle_fanout_async)
@@ -0,0 +1,6 @@
+"""In-process stand-ins for a RabbitMQ broker and its management API, for tests and benchmarks."""
+
+from tests.standin.amqp import StandInBroker
+from tests.standin.management import StandInManagementAPI
+
+__all__ = ["StandInBroker", "StandInManagementAPI"]
@@ -0,0 +1,741 @@
+"""In-process AMQP 0-9-1 stand-in broker.
+
+Implements enough of the protocol for pika clients to connect, open channels, declare and bind
+queues and exchanges, publish (optionally with publisher confirms) and retrieve messages with
+``basic.get`` or ``basic.consume``. Everything lives in memory in a single virtual host; it is
+meant for tests and benchmarks, not as a faithful broker.
+"""
+
+import itertools
+import socket
+import ssl
+import struct
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from pika import frame, spec
+
+SERVER_PROPERTIES = {
+    "product": "mcp-server-rabbitmq stand-in",
+    "version": "0.0.0",
+    "capabilities": {
+        "publisher_confirms": True,
+        "exchange_exchange_bindings": False,
+        "basic.nack": True,
+        "consumer_cancel_notify": True,
+        "connection.blocked": True,
+        "authentication_failure_close": True,
+        "per_consumer_qos": True,
+    },
+}
+
+FRAME_MAX = 131072
+
+
+class Message:
+    __slots__ = ("exchange", "routing_key", "properties", "body", "redelivered")
+
+    def __init__(self, exchange: str, routing_key: str, properties, body: bytes):
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.properties = properties
+        self.body = body
+        self.redelivered = False
+
+
+class Queue:
+    def __init__(
+        self, name: str, durable=False, exclusive=False, auto_delete=False, arguments=None
+    ):
+        self.name = name
+        self.durable = durable
+        self.exclusive = exclusive
+        self.auto_delete = auto_delete
+        self.arguments = arguments or {}
+        self.owner: Optional["_Connection"] = None
+        self.messages: deque = deque()
+        self.consumers: List["_Consumer"] = []
+        self.unacked = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+
+class Exchange:
+    def __init__(self, name: str, type: str, durable=False, auto_delete=False, arguments=None):
+        self.name = name
+        self.type = type
+        self.durable = durable
+        self.auto_delete = auto_delete
+        self.arguments = arguments or {}
+        # (queue name, routing key, arguments)
+        self.bindings: List[tuple] = []
+
+
+def _topic_matches(pattern: str, key: str) -> bool:
+    words = pattern.split(".")
+    parts = key.split(".") if key else []
+
+    def match(i: int, j: int) -> bool:
+        if i == len(words):
+            return j == len(parts)
+        if words[i] == "#":
+            return any(match(i + 1, k) for k in range(j, len(parts) + 1))
+        if j == len(parts):
+            return False
+        return words[i] in ("*", parts[j]) and match(i + 1, j + 1)
+
+    return match(0, 0)
+
+
+def _headers_match(arguments: Dict, headers: Optional[Dict]) -> bool:
+    headers = headers or {}
+    wanted = {k: v for k, v in arguments.items() if not k.startswith("x-")}
+    if not wanted:
+        return True
+    matches = [k in headers and (v is None or headers[k] == v) for k, v in wanted.items()]
+    if arguments.get("x-match", "all") == "any":
+        return any(matches)
+    return all(matches)
+
+
+class _Consumer:
+    def __init__(self, channel: "_Channel", tag: str, queue: Queue, no_ack: bool):
+        self.channel = channel
+        self.tag = tag
+        self.queue = queue
+        self.no_ack = no_ack
+
+
+class _Channel:
+    def __init__(self, connection: "_Connection", number: int):
+        self.connection = connection
+        self.number = number
+        self.confirm = False
+        self.publish_seq = 0
+        self.prefetch_count = 0
+        self.delivery_tags = itertools.count(1)
+        # delivery tag -> (queue, message)
+        self.unacked: Dict[int, tuple] = {}
+        self.consumers: Dict[str, _Consumer] = {}
+        self.pending: Optional[list] = None
+        self.closing = False
+
+    def has_capacity(self) -> bool:
+        return not self.prefetch_count or len(self.unacked) < self.prefetch_count
+
+
+class StandInBroker:
+    """Threaded TCP server speaking enough AMQP 0-9-1 for pika"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        heartbeat: int = 60,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.host = host
+        # Server-side context to accept AMQPS connections instead of plain AMQP
+        self.ssl_context = ssl_context
+        self.heartbeat = heartbeat
+        self.queues: Dict[str, Queue] = {}
+        self.exchanges: Dict[str, Exchange] = {
+            "": Exchange("", "direct", durable=True),
+            "amq.direct": Exchange("amq.direct", "direct", durable=True),
+            "amq.fanout": Exchange("amq.fanout", "fanout", durable=True),
+            "amq.topic": Exchange("amq.topic", "topic", durable=True),
+            "amq.headers": Exchange("amq.headers", "headers", durable=True),
+        }
+        self.lock = threading.RLock()
+        self.connections: List[_Connection] = []
+        self.connections_opened = 0
+        self.messages_published = 0
+        self.declares = 0
+        self.blocked: Optional[str] = None
+        self._names = itertools.count(1)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self.port = self._sock.getsockname()[1]
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> "StandInBroker":
+        self._sock.listen(128)
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="standin-amqp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        try:
+            # Wakes the accept() in progress, which close() alone would leave listening
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        for connection in list(self.connections):
+            connection.abort()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def __enter__(self) -> "StandInBroker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def block(self, reason: str = "low on memory") -> None:
+        """Simulate a resource alarm: notify clients and stop accepting publishes"""
+        with self.lock:
+            self.blocked = reason
+            for connection in self.connections:
+                connection.send_method(0, spec.Connection.Blocked(reason=reason))
+
+    def unblock(self) -> None:
+        with self.lock:
+            self.blocked = None
+            for connection in self.connections:
+                connection.send_method(0, spec.Connection.Unblocked())
+
+    def queue_depth(self, name: str) -> int:
+        with self.lock:
+            return len(self.queues[name].messages)
+
+    def wait_for_depth(self, name: str, depth: int, timeout: float = 2.0) -> int:
+        """Depth of a queue once it reaches ``depth``, or after ``timeout`` seconds.
+
+        Publishes without confirms return before the broker has routed them.
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue_depth(name) < depth and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return self.queue_depth(name)
+
+    def _serve(self) -> None:
+        while self._running:
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(self, sock)
+            with self.lock:
+                self.connections.append(connection)
+                self.connections_opened += 1
+            threading.Thread(target=connection.run, name="standin-amqp-conn", daemon=True).start()
+
+    # Routing and delivery, all under self.lock
+
+    def route(self, exchange: Exchange, routing_key: str, properties) -> List[Queue]:
+        if exchange.name == "":
+            queue = self.queues.get(routing_key)
+            return [queue] if queue else []
+        matched = []
+        for queue_name, key, arguments in exchange.bindings:
+            if exchange.type == "fanout":
+                ok = True
+            elif exchange.type == "topic":
+                ok = _topic_matches(key, routing_key)
+            elif exchange.type == "headers":
+                ok = _headers_match(arguments, properties.headers)
+            else:
+                ok = key == routing_key
+            queue = self.queues.get(queue_name)
+            if ok and queue is not None and queue not in matched:
+                matched.append(queue)
+        return matched
+
+    def dispatch(self, queue: Queue) -> None:
+        while queue.messages and queue.consumers:
+            for consumer in list(queue.consumers):
+                if not queue.messages:
+                    return
+                if consumer.no_ack or consumer.channel.has_capacity():
+                    break
+            else:
+                return
+            queue.consumers.remove(consumer)
+            queue.consumers.append(consumer)
+            message = queue.messages.popleft()
+            channel = consumer.channel
+            tag = next(channel.delivery_tags)
+            if not consumer.no_ack:
+                channel.unacked[tag] = (queue, message)
+                queue.unacked += 1
+            queue.delivered += 1
+            channel.connection.send_content(
+                channel.number,
+                spec.Basic.Deliver(
+                    consumer_tag=consumer.tag,
+                    delivery_tag=tag,
+                    redelivered=message.redelivered,
+                    exchange=message.exchange,
+                    routing_key=message.routing_key,
+                ),
+                message,
+            )
+
+    def requeue(self, queue: Queue, message: Message) -> None:
+        message.redelivered = True
+        queue.unacked -= 1
+        queue.messages.appendleft(message)
+
+    def delete_queue(self, queue: Queue) -> None:
+        self.queues.pop(queue.name, None)
+        for exchange in self.exchanges.values():
+            exchange.bindings = [b for b in exchange.bindings if b[0] != queue.name]
+        for consumer in list(queue.consumers):
+            consumer.channel.consumers.pop(consumer.tag, None)
+            consumer.channel.connection.send_method(
+                consumer.channel.number, spec.Basic.Cancel(consumer_tag=consumer.tag, nowait=True)
+            )
+        queue.consumers.clear()
+
+    def next_name(self, prefix: str) -> str:
+        return f"{prefix}{next(self._names)}"
+
+
+def _frame_size(buffer: bytearray, offset: int) -> Optional[int]:
+    if len(buffer) - offset < 7:
+        return None
+    if buffer[offset : offset + 4] == b"AMQP":
+        return 8
+    (payload_size,) = struct.unpack_from(">L", buffer, offset + 3)
+    return 7 + payload_size + 1
+
+
+class _ChannelError(Exception):
+    def __init__(self, code: int, text: str, method):
+        super().__init__(text)
+        self.code = code
+        self.text = text
+        self.method = method
+
+
+class _Connection:
+    def __init__(self, broker: StandInBroker, sock: socket.socket):
+        self.broker = broker
+        self.sock = sock
+        self.channels: Dict[int, _Channel] = {}
+        self.frame_max = FRAME_MAX
+        self.heartbeat = 0
+        self.open = True
+        self._write_lock = threading.Lock()
+
+    # Output
+
+    def _write(self, data: bytes) -> None:
+        with self._write_lock:
+            if not self.open:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.open = False
+
+    def send_method(self, channel: int, method) -> None:
+        self._write(frame.Method(channel, method).marshal())
+
+    def send_content(self, channel: int, method, message: Message) -> None:
+        parts = [
+            frame.Method(channel, method).marshal(),
+            frame.Header(channel, len(message.body), message.properties).marshal(),
+        ]
+        chunk = self.frame_max - 8
+        for start in range(0, len(message.body), chunk):
+            parts.append(frame.Body(channel, message.body[start : start + chunk]).marshal())
+        self._write(b"".join(parts))
+
+    def abort(self) -> None:
+        self.open = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    # Input
+
+    def run(self) -> None:
+        buffer = bytearray()
+        try:
+            if self.broker.ssl_context is not None:
+                self.sock = self.broker.ssl_context.wrap_socket(self.sock, server_side=True)
+            while self.open:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                buffer += data
+                offset = 0
+                while True:
+                    # Hand pika exactly one frame so large reads aren't copied per frame
+                    size = _frame_size(buffer, offset)
+                    if size is None or offset + size > len(buffer):
+                        break
+                    _, received = frame.decode_frame(bytes(buffer[offset : offset + size]))
+                    offset += size
+                    self._handle(received)
+                del buffer[:offset]
+        except OSError:
+            pass
+        finally:
+            self._cleanup()
+
+    def _heartbeat_loop(self) -> None:
+        stop = threading.Event()
+        while self.open and not stop.wait(self.heartbeat / 2):
+            self._write(frame.Heartbeat().marshal())
+
+    def _handle(self, received) -> None:
+        if isinstance(received, frame.ProtocolHeader):
+            self.send_method(
+                0,
+                spec.Connection.Start(
+                    server_properties=SERVER_PROPERTIES, mechanisms="PLAIN", locales="en_US"
+                ),
+            )
+            return
+        if isinstance(received, frame.Heartbeat):
+            return
+        channel = self.channels.get(received.channel_number)
+        if isinstance(received, frame.Method):
+            if received.channel_number == 0:
+                self._connection_method(received.method)
+                return
+            if isinstance(received.method, spec.Channel.Open):
+                self.channels[received.channel_number] = _Channel(self, received.channel_number)
+                self.send_method(received.channel_number, spec.Channel.OpenOk())
+                return
+            if channel is None:
+                return
+            try:
+                self._channel_method(channel, received.method)
+            except _ChannelError as e:
+                self._close_channel(channel)
+                channel.closing = True
+                self.send_method(
+                    channel.number,
+                    spec.Channel.Close(
+                        reply_code=e.code,
+                        reply_text=e.text,
+                        class_id=e.method.INDEX >> 16,
+                        method_id=e.method.INDEX & 0xFFFF,
+                    ),
+                )
+        elif isinstance(received, frame.Header) and channel is not None and channel.pending:
+            channel.pending.append(received.properties)
+            channel.pending.append(received.body_size)
+            channel.pending.append([])
+            if received.body_size == 0:
+                self._finish_publish(channel)
+        elif isinstance(received, frame.Body) and channel is not None and channel.pending:
+            channel.pending[3].append(received.fragment)
+            if sum(len(f) for f in channel.pending[3]) >= channel.pending[2]:
+                self._finish_publish(channel)
+
+    def _connection_method(self, method) -> None:
+        if isinstance(method, spec.Connection.StartOk):
+            self.send_method(
+                0,
+                spec.Connection.Tune(
+                    channel_max=2047, frame_max=FRAME_MAX, heartbeat=self.broker.heartbeat
+                ),
+            )
+        elif isinstance(method, spec.Connection.TuneOk):
+            self.frame_max = method.frame_max or FRAME_MAX
+            self.heartbeat = method.heartbeat
+            if self.heartbeat:
+                threading.Thread(target=self._heartbeat_loop, daemon=True).start()
+        elif isinstance(method, spec.Connection.Open):
+            self.send_method(0, spec.Connection.OpenOk())
+            if self.broker.blocked:
+                self.send_method(0, spec.Connection.Blocked(reason=self.broker.blocked))
+        elif isinstance(method, spec.Connection.Close):
+            self.send_method(0, spec.Connection.CloseOk())
+            self.open = False
+        elif isinstance(method, spec.Connection.CloseOk):
+            self.open = False
+
+    def _channel_method(self, channel: _Channel, method) -> None:
+        broker = self.broker
+        if channel.closing and not isinstance(method, spec.Channel.CloseOk):
+            return
+        if isinstance(method, spec.Basic.Publish):
+            channel.pending = [method]
+            return
+        with broker.lock:
+            reply = self._dispatch(channel, method)
+        if reply is not None and not getattr(method, "nowait", False):
+            self.send_method(channel.number, reply)
+
+    def _dispatch(self, channel: _Channel, method):
+        broker = self.broker
+        if isinstance(method, spec.Channel.Close):
+            self._close_channel(channel)
+            self.channels.pop(channel.number, None)
+            return spec.Channel.CloseOk()
+        if isinstance(method, spec.Channel.CloseOk):
+            self.channels.pop(channel.number, None)
+            return None
+        if isinstance(method, spec.Channel.Flow):
+            return spec.Channel.FlowOk(active=method.active)
+        if isinstance(method, spec.Confirm.Select):
+            channel.confirm = True
+            return spec.Confirm.SelectOk()
+        if isinstance(method, spec.Basic.Qos):
+            channel.prefetch_count = method.prefetch_count
+            return spec.Basic.QosOk()
+
+        if isinstance(method, spec.Exchange.Declare):
+            broker.declares += 1
+            existing = broker.exchanges.get(method.exchange)
+            if method.passive:
+                if existing is None:
+                    raise _ChannelError(
+                        404, f"NOT_FOUND - no exchange '{method.exchange}' in vhost '/'", method
+                    )
+            elif existing is None:
+                broker.exchanges[method.exchange] = Exchange(
+                    method.exchange,
+                    str(method.type),
+                    durable=method.durable,
+                    auto_delete=method.auto_delete,
+                    arguments=method.arguments,
+                )
+            elif existing.type != str(method.type) or existing.durable != method.durable:
+                raise _ChannelError(
+                    406,
+                    f"PRECONDITION_FAILED - inequivalent arg 'type' for exchange "
+                    f"'{method.exchange}' in vhost '/'",
+                    method,
+                )
+            return spec.Exchange.DeclareOk()
+        if isinstance(method, spec.Exchange.Delete):
+            broker.exchanges.pop(method.exchange, None)
+            return spec.Exchange.DeleteOk()
+
+        if isinstance(method, spec.Queue.Declare):
+            broker.declares += 1
+            name = method.queue or broker.next_name("amq.gen-standin-")
+            queue = broker.queues.get(name)
+            if method.passive:
+                if queue is None:
+                    raise _ChannelError(404, f"NOT_FOUND - no queue '{name}' in vhost '/'", method)
+            elif queue is None:
+                queue = Queue(
+                    name,
+                    durable=method.durable,
+                    exclusive=method.exclusive,
+                    auto_delete=method.auto_delete,
+                    arguments=method.arguments,
+                )
+                if method.exclusive:
+                    queue.owner = self
+                broker.queues[name] = queue
+            elif queue.durable != method.durable:
+                raise _ChannelError(
+                    406,
+                    f"PRECONDITION_FAILED - inequivalent arg 'durable' for queue '{name}' "
+                    f"in vhost '/'",
+                    method,
+                )
+            return spec.Queue.DeclareOk(
+                queue=name, message_count=len(queue.messages), consumer_count=len(queue.consumers)
+            )
+        if isinstance(method, (spec.Queue.Bind, spec.Queue.Unbind)):
+            queue = self._queue(method.queue, method)
+            exchange = self._exchange(method.exchange, method)
+            binding = (queue.name, method.routing_key, method.arguments or {})
+            if isinstance(method, spec.Queue.Bind):
+                if binding not in exchange.bindings:
+                    exchange.bindings.append(binding)
+                return spec.Queue.BindOk()
+            if binding in exchange.bindings:
+                exchange.bindings.remove(binding)
+            return spec.Queue.UnbindOk()
+        if isinstance(method, spec.Queue.Purge):
+            queue = self._queue(method.queue, method)
+            count = len(queue.messages)
+            queue.messages.clear()
+            return spec.Queue.PurgeOk(message_count=count)
+        if isinstance(method, spec.Queue.Delete):
+            queue = broker.queues.get(method.queue)
+            count = 0
+            if queue is not None:
+                count = len(queue.messages)
+                broker.delete_queue(queue)
+            return spec.Queue.DeleteOk(message_count=count)
+
+        if isinstance(method, spec.Basic.Consume):
+            queue = self._queue(method.queue, method)
+            tag = method.consumer_tag or broker.next_name("ctag-standin-")
+            consumer = _Consumer(channel, tag, queue, method.no_ack)
+            channel.consumers[tag] = consumer
+            queue.consumers.append(consumer)
+            if not method.nowait:
+                self.send_method(channel.number, spec.Basic.ConsumeOk(consumer_tag=tag))
+            broker.dispatch(queue)
+            return None
+        if isinstance(method, spec.Basic.Cancel):
+            self._cancel(channel, method.consumer_tag)
+            return spec.Basic.CancelOk(consumer_tag=method.consumer_tag)
+        if isinstance(method, spec.Basic.Get):
+            queue = self._queue(method.queue, method)
+            if not queue.messages:
+                return spec.Basic.GetEmpty()
+            message = queue.messages.popleft()
+            tag = next(channel.delivery_tags)
+            if not method.no_ack:
+                channel.unacked[tag] = (queue, message)
+                queue.unacked += 1
+            queue.delivered += 1
+            self.send_content(
+                channel.number,
+                spec.Basic.GetOk(
+                    delivery_tag=tag,
+                    redelivered=message.redelivered,
+                    exchange=message.exchange,
+                    routing_key=message.routing_key,
+                    message_count=len(queue.messages),
+                ),
+                message,
+            )
+            return None
+        if isinstance(method, (spec.Basic.Ack, spec.Basic.Nack, spec.Basic.Reject)):
+            multiple = getattr(method, "multiple", False)
+            requeue = getattr(method, "requeue", False)
+            if multiple:
+                tags = [
+                    t
+                    for t in channel.unacked
+                    if method.delivery_tag == 0 or t <= method.delivery_tag
+                ]
+            else:
+                tags = [method.delivery_tag] if method.delivery_tag in channel.unacked else []
+            touched = set()
+            for tag in tags:
+                queue, message = channel.unacked.pop(tag)
+                if requeue:
+                    broker.requeue(queue, message)
+                else:
+                    queue.unacked -= 1
+                touched.add(queue)
+            for queue in touched:
+                broker.dispatch(queue)
+            return None
+        if isinstance(method, (spec.Basic.Recover, spec.Basic.RecoverAsync)):
+            self._requeue_unacked(channel)
+            return spec.Basic.RecoverOk() if isinstance(method, spec.Basic.Recover) else None
+        return None
+
+    def _queue(self, name: str, method) -> Queue:
+        queue = self.broker.queues.get(name)
+        if queue is None:
+            raise _ChannelError(404, f"NOT_FOUND - no queue '{name}' in vhost '/'", method)
+        return queue
+
+    def _exchange(self, name: str, method) -> Exchange:
+        exchange = self.broker.exchanges.get(name)
+        if exchange is None:
+            raise _ChannelError(404, f"NOT_FOUND - no exchange '{name}' in vhost '/'", method)
+        return exchange
+
+    def _finish_publish(self, channel: _Channel) -> None:
+        method, properties, _, fragments = channel.pending
+        channel.pending = None
+        # Honour resource alarms the way RabbitMQ does: stop reading from the publisher
+        while self.broker.blocked and self.open:
+            time.sleep(0.01)
+        broker = self.broker
+        with broker.lock:
+            channel.publish_seq += 1
+            exchange = broker.exchanges.get(method.exchange)
+            if exchange is None:
+                error = _ChannelError(
+                    404, f"NOT_FOUND - no exchange '{method.exchange}' in vhost '/'", method
+                )
+                self._close_channel(channel)
+                channel.closing = True
+                self.send_method(
+                    channel.number,
+                    spec.Channel.Close(
+                        reply_code=error.code, reply_text=error.text, class_id=60, method_id=40
+                    ),
+                )
+                return
+            message = Message(method.exchange, method.routing_key, properties, b"".join(fragments))
+            broker.messages_published += 1
+            queues = broker.route(exchange, method.routing_key, properties)
+            for queue in queues:
+                copy = Message(message.exchange, message.routing_key, properties, message.body)
+                queue.messages.append(copy)
+                queue.published += 1
+                max_length = queue.arguments.get("x-max-length")
+                # The default overflow behaviour: drop the oldest ready messages
+                while max_length is not None and len(queue.messages) > max_length:
+                    queue.messages.popleft()
+                    queue.dropped += 1
+                broker.dispatch(queue)
+            if not queues and method.mandatory:
+                self.send_content(
+                    channel.number,
+                    spec.Basic.Return(
+                        reply_code=312,
+                        reply_text="NO_ROUTE",
+                        exchange=method.exchange,
+                        routing_key=method.routing_key,
+                    ),
+                    message,
+                )
+            if channel.confirm:
+                self.send_method(channel.number, spec.Basic.Ack(delivery_tag=channel.publish_seq))
+
+    def _cancel(self, channel: _Channel, tag: str) -> None:
+        consumer = channel.consumers.pop(tag, None)
+        if consumer is None:
+            return
+        queue = consumer.queue
+        if consumer in queue.consumers:
+            queue.consumers.remove(consumer)
+        if queue.auto_delete and not queue.consumers:
+            self.broker.delete_queue(queue)
+
+    def _requeue_unacked(self, channel: _Channel) -> None:
+        touched = set()
+        for tag in sorted(channel.unacked, reverse=True):
+            queue, message = channel.unacked.pop(tag)
+            self.broker.requeue(queue, message)
+            touched.add(queue)
+        for queue in touched:
+            self.broker.dispatch(queue)
+
+    def _close_channel(self, channel: _Channel) -> None:
+        with self.broker.lock:
+            for tag in list(channel.consumers):
+                self._cancel(channel, tag)
+            self._requeue_unacked(channel)
+
+    def _cleanup(self) -> None:
+        broker = self.broker
+        with broker.lock:
+            for channel in list(self.channels.values()):
+                self._close_channel(channel)
+            self.channels.clear()
+            for queue in list(broker.queues.values()):
+                if queue.owner is self:
+                    broker.delete_queue(queue)
+            if self in broker.connections:
+                broker.connections.remove(self)
+        self.open = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
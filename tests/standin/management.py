@@ -0,0 +1,331 @@
+"""Fake RabbitMQ management HTTP API backed by a StandInBroker.
+
+Serves the endpoints used by ``RabbitMQAdmin`` with the same JSON shapes (including the
+``page``/``page_size``/``name``/``use_regex``/``columns`` query parameters) so admin code can be
+exercised without the management plugin.
+"""
+
+import json
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from tests.standin.amqp import Exchange, Queue, StandInBroker
+
+VHOST = "/"
+
+
+def _queue_json(queue: Queue) -> Dict:
+    return {
+        "name": queue.name,
+        "vhost": VHOST,
+        "durable": queue.durable,
+        "auto_delete": queue.auto_delete,
+        "exclusive": queue.exclusive,
+        "arguments": queue.arguments,
+        "node": "rabbit@standin",
+        "state": "running",
+        "type": "classic",
+        "consumers": len(queue.consumers),
+        "messages": len(queue.messages) + queue.unacked,
+        "messages_ready": len(queue.messages),
+        "messages_unacknowledged": queue.unacked,
+        "message_bytes": sum(len(m.body) for m in queue.messages),
+        "memory": 10_000 + 100 * len(queue.messages),
+        "message_stats": {
+            "publish": queue.published,
+            "publish_details": {"rate": 0.0},
+            "deliver_get": queue.delivered,
+            "deliver_get_details": {"rate": 0.0},
+        },
+    }
+
+
+def _exchange_json(exchange: Exchange) -> Dict:
+    return {
+        "name": exchange.name,
+        "vhost": VHOST,
+        "type": exchange.type,
+        "durable": exchange.durable,
+        "auto_delete": exchange.auto_delete,
+        "internal": False,
+        "arguments": exchange.arguments,
+    }
+
+
+def _binding_json(exchange: Exchange, binding: tuple) -> Dict:
+    queue, routing_key, arguments = binding
+    return {
+        "source": exchange.name,
+        "vhost": VHOST,
+        "destination": queue,
+        "destination_type": "queue",
+        "routing_key": routing_key,
+        "arguments": arguments,
+        "properties_key": routing_key or "~",
+    }
+
+
+def _project(item: Dict, columns: Optional[List[str]]) -> Dict:
+    if not columns:
+        return item
+    projected: Dict = {}
+    for column in columns:
+        source, target = item, projected
+        parts = column.split(".")
+        for part in parts[:-1]:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    return projected
+
+
+class StandInManagementAPI:
+    """Threaded HTTP server exposing the management API for a StandInBroker"""
+
+    def __init__(self, broker: StandInBroker, host: str = "127.0.0.1", port: int = 0):
+        self.broker = broker
+        self.username = "guest"
+        self.password = "guest"
+        self.requests = 0
+        self.connections = 0
+        # Status codes returned (once each) before normal service, to exercise retries
+        self.failures: List[int] = []
+        self.latency = 0.0
+        self._lock = threading.Lock()
+        self._open: Set[socket.socket] = set()
+        api = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.api = api
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host = host
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StandInManagementAPI":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="standin-management", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        # Drop keep-alive connections too, as a node going down would
+        with self._lock:
+            open_sockets = list(self._open)
+        for sock in open_sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "StandInManagementAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def fail_next(self, *status_codes: int) -> None:
+        with self._lock:
+            self.failures.extend(status_codes)
+
+    def _next_failure(self) -> Optional[int]:
+        with self._lock:
+            self.requests += 1
+            return self.failures.pop(0) if self.failures else None
+
+    # Routing
+
+    def get(self, parts: List[str], query: Dict[str, str]):
+        broker = self.broker
+        if (
+            parts[0] in ("queues", "exchanges", "bindings")
+            and len(parts) > 1
+            and parts[1] != VHOST
+        ):
+            # Everything lives in the default vhost; others exist but are empty
+            if len(parts) == 2:
+                return self._listing([], query) if parts[0] != "bindings" else []
+            return 404, {"error": "Object Not Found", "reason": "Not Found"}
+        with broker.lock:
+            if parts == ["overview"]:
+                return {
+                    "management_version": "3.13.0-standin",
+                    "rabbitmq_version": "3.13.0-standin",
+                    "cluster_name": "rabbit@standin",
+                    "node": "rabbit@standin",
+                    "object_totals": {
+                        "queues": len(broker.queues),
+                        "exchanges": len(broker.exchanges),
+                        "connections": len(broker.connections),
+                        "consumers": sum(len(q.consumers) for q in broker.queues.values()),
+                    },
+                    "queue_totals": {
+                        "messages": sum(len(q.messages) for q in broker.queues.values()),
+                    },
+                    "message_stats": {"publish": broker.messages_published},
+                }
+            if parts == ["health", "checks", "alarms"]:
+                if broker.blocked:
+                    return 503, {"status": "failed", "reason": broker.blocked}
+                return {"status": "ok"}
+            if parts[0] == "queues":
+                if len(parts) <= 2:
+                    items = [_queue_json(q) for q in broker.queues.values()]
+                    return self._listing(items, query)
+                queue = broker.queues.get(parts[2])
+                if queue is None:
+                    return 404, {"error": "Object Not Found", "reason": "Not Found"}
+                if parts[3:] == ["bindings"]:
+                    bindings = [
+                        {
+                            "source": "",
+                            "vhost": VHOST,
+                            "destination": queue.name,
+                            "destination_type": "queue",
+                            "routing_key": queue.name,
+                            "arguments": {},
+                        }
+                    ]
+                    for exchange in broker.exchanges.values():
+                        bindings += [
+                            _binding_json(exchange, b)
+                            for b in exchange.bindings
+                            if b[0] == queue.name
+                        ]
+                    return bindings
+                return _queue_json(queue)
+            if parts[0] == "exchanges":
+                if len(parts) <= 2:
+                    items = [_exchange_json(e) for e in broker.exchanges.values()]
+                    return self._listing(items, query)
+                exchange = broker.exchanges.get(parts[2])
+                if exchange is None:
+                    return 404, {"error": "Object Not Found", "reason": "Not Found"}
+                if parts[3:] == ["bindings", "source"]:
+                    return [_binding_json(exchange, b) for b in exchange.bindings]
+                return _exchange_json(exchange)
+            if parts[0] == "bindings":
+                return [
+                    _binding_json(exchange, b)
+                    for exchange in broker.exchanges.values()
+                    for b in exchange.bindings
+                ]
+        return 404, {"error": "Object Not Found", "reason": "Not Found"}
+
+    def delete(self, parts: List[str]):
+        broker = self.broker
+        if len(parts) > 1 and parts[1] != VHOST:
+            return 404, {"error": "Object Not Found", "reason": "Not Found"}
+        with broker.lock:
+            if parts[0] == "queues" and len(parts) >= 3:
+                queue = broker.queues.get(parts[2])
+                if queue is None:
+                    return 404, {"error": "Object Not Found", "reason": "Not Found"}
+                if parts[3:] == ["contents"]:
+                    queue.messages.clear()
+                else:
+                    broker.delete_queue(queue)
+                return 204, None
+            if parts[0] == "exchanges" and len(parts) == 3:
+                if broker.exchanges.pop(parts[2], None) is None:
+                    return 404, {"error": "Object Not Found", "reason": "Not Found"}
+                return 204, None
+        return 404, {"error": "Object Not Found", "reason": "Not Found"}
+
+    def _listing(self, items: List[Dict], query: Dict[str, str]):
+        total = len(items)
+        name = query.get("name")
+        if name:
+            if query.get("use_regex") == "true":
+                pattern = re.compile(name)
+                items = [i for i in items if pattern.search(i["name"])]
+            else:
+                items = [i for i in items if name in i["name"]]
+        items.sort(key=lambda i: i["name"])
+        columns = query["columns"].split(",") if query.get("columns") else None
+        if "page" not in query:
+            return [_project(i, columns) for i in items]
+        page = int(query["page"])
+        page_size = int(query.get("page_size", 100))
+        page_count = max(1, -(-len(items) // page_size))
+        window = items[(page - 1) * page_size : page * page_size]
+        return {
+            "filtered_count": len(items),
+            "item_count": len(window),
+            "items": [_project(i, columns) for i in window],
+            "page": page,
+            "page_count": page_count,
+            "page_size": page_size,
+            "total_count": total,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    api: StandInManagementAPI
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body are written separately; don't let Nagle delay keep-alive replies
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.api._lock:
+            self.api.connections += 1
+            self.api._open.add(self.connection)
+
+    def finish(self) -> None:
+        with self.api._lock:
+            self.api._open.discard(self.connection)
+        super().finish()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self, status: int, payload) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.api.latency:
+            threading.Event().wait(self.api.latency)
+        failure = self.api._next_failure()
+        if failure is not None:
+            self._reply(failure, {"error": "standin failure"})
+            return
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        if not parts or parts[0] != "api" or len(parts) < 2:
+            self._reply(404, {"error": "Object Not Found"})
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        result = self.api.get(parts[1:], query) if method == "GET" else self.api.delete(parts[1:])
+        if isinstance(result, tuple):
+            self._reply(*result)
+        else:
+            self._reply(200, result)
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
@@ -0,0 +1,25 @@
+"""Helpers for running servers and many concurrent clients against the stand-ins."""
+
+import asyncio
+import socket
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StartGate:
+    """Releases its waiters together once ``parties`` of them arrived, like Python 3.11's
+    ``asyncio.Barrier`` for a single round."""
+
+    def __init__(self, parties: int):
+        self._waiting = parties
+        self._open = asyncio.Event()
+
+    async def wait(self) -> None:
+        self._waiting -= 1
+        if self._waiting <= 0:
+            self._open.set()
+        await self._open.wait()
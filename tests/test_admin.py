@@ -0,0 +1,125 @@
+"""Tests for the RabbitMQ admin module."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from mcp_server_rabbitmq.admin import MAX_PAGE_SIZE, RETRY_STATUS_CODES, RabbitMQAdmin
+
+
+class TestRabbitMQAdmin:
+    """Test the RabbitMQAdmin class."""
+
+    def test_requests_share_one_session(self):
+        """Test that every request goes through the same keep-alive session."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False, read_timeout=10.0)
+        response = MagicMock()
+        response.json.return_value = [{"name": "queue1"}]
+
+        with patch.object(admin.session, "request", return_value=response) as mock_request:
+            admin.list_queues()
+            admin.list_exchanges()
+
+        assert mock_request.call_count == 2
+        mock_request.assert_called_with(
+            "GET",
+            "http://localhost:15672/api/exchanges",
+            json=None,
+            timeout=(5.0, 10.0),
+            verify=True,
+            stream=False,
+        )
+        assert admin.session.headers["Authorization"] == f"Basic {admin.auth}"
+
+    def test_connection_pool_and_retries(self):
+        """Test that the session adapter is sized and retries transient failures."""
+        admin = RabbitMQAdmin(
+            "localhost", 15671, "guest", "guest", True, pool_size=3, max_retries=2
+        )
+
+        adapter = admin.session.get_adapter("https://localhost:15671/api/queues")
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 2
+        assert set(adapter.max_retries.status_forcelist) == set(RETRY_STATUS_CODES)
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+    def test_reads_are_cached_until_mutation(self):
+        """Test that repeated reads hit the cache and a successful delete invalidates it."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+        response = MagicMock()
+        response.json.return_value = {"name": "queue1", "messages": 3}
+
+        with patch.object(admin.session, "request", return_value=response) as mock_request:
+            admin.get_queue_info("queue1")
+            admin.get_queue_info("queue1")
+            admin.get_queue_info("queue1", vhost="other")
+            assert mock_request.call_count == 2
+
+            admin.purge_queue("queue1")
+            admin.get_queue_info("queue1")
+
+        assert mock_request.call_count == 4
+        assert admin.cache_stats()["hits"] == 1
+        assert admin.cache_stats()["misses"] == 3
+
+    def test_failed_mutation_keeps_cache(self):
+        """Test that a failed delete leaves cached reads in place."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+        response = MagicMock()
+        response.json.return_value = [{"name": "queue1"}]
+
+        with patch.object(admin.session, "request", return_value=response):
+            admin.list_queues()
+        response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+        with patch.object(admin.session, "request", return_value=response):
+            with pytest.raises(requests.HTTPError):
+                admin.delete_queue("queue1")
+
+        assert admin.cache_stats()["size"] == 1
+
+    def test_list_queues_query_parameters(self):
+        """Test that paging, filters and columns are sent to the management API."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+        response = MagicMock()
+        response.json.return_value = {"items": []}
+
+        with patch.object(admin.session, "request", return_value=response) as mock_request:
+            admin.list_queues(
+                vhost="/",
+                page=3,
+                page_size=50,
+                name="^orders-",
+                use_regex=True,
+                columns=["name", "messages"],
+                disable_stats=True,
+            )
+
+        assert mock_request.call_args.args[1] == (
+            "http://localhost:15672/api/queues/%2F?page=3&page_size=50&name=%5Eorders-"
+            "&use_regex=true&columns=name%2Cmessages&disable_stats=true"
+        )
+
+    def test_list_exchanges_rejects_oversized_page(self):
+        """Test that page sizes the management API would refuse are rejected up front."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+
+        with pytest.raises(ValueError):
+            admin.list_exchanges(page=1, page_size=MAX_PAGE_SIZE + 1)
+
+    def test_iter_bindings_streams_response(self):
+        """Test that streamed listings are parsed incrementally from the response body."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = iter([b'[{"source": "ex"', b', "destination": "q"}]'])
+
+        with patch.object(admin.session, "request", return_value=response) as mock_request:
+            bindings = admin.iter_bindings("/")
+            mock_request.assert_not_called()
+            assert list(bindings) == [{"source": "ex", "destination": "q"}]
+
+        assert mock_request.call_args.args[1] == "http://localhost:15672/api/bindings/%2F"
+        assert mock_request.call_args.kwargs["stream"] is True
+        response.json.assert_not_called()
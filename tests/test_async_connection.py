@@ -0,0 +1,97 @@
+"""Tests for the asyncio AMQP connection module."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from pika import spec
+from pika.exceptions import ChannelClosedByBroker
+
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+
+
+def _connection_with_channel():
+    """Build an AsyncRabbitMQConnection whose channel is a mock, bypassing the network."""
+    connection = AsyncRabbitMQConnection(MagicMock(), timeout=1)
+    channel = MagicMock()
+
+    async def get_channel():
+        connection._loop = asyncio.get_running_loop()
+        return channel
+
+    connection._get_channel = get_channel
+    return connection, channel
+
+
+def _confirm(method):
+    return MagicMock(method=method)
+
+
+class TestAsyncRabbitMQConnection:
+    """Test the AsyncRabbitMQConnection class."""
+
+    def test_concurrent_publishes_resolve_from_confirms(self):
+        """Test that concurrent publishes are all in flight and resolved by their confirms."""
+        connection, channel = _connection_with_channel()
+
+        async def scenario():
+            publishes = [
+                asyncio.ensure_future(connection.publish("", "q", f"m{i}")) for i in range(3)
+            ]
+            await asyncio.sleep(0)
+            assert channel.basic_publish.call_count == 3
+            connection._on_confirm(_confirm(spec.Basic.Ack(delivery_tag=2, multiple=True)))
+            connection._on_confirm(_confirm(spec.Basic.Nack(delivery_tag=3)))
+            return await asyncio.gather(*publishes)
+
+        assert asyncio.run(scenario()) == ["ack", "ack", "nack"]
+
+    def test_returned_publish_is_not_delivered(self):
+        """Test that a mandatory publish returned as unroutable resolves as returned."""
+        connection, channel = _connection_with_channel()
+
+        async def scenario():
+            publishes = [
+                asyncio.ensure_future(connection.publish("", key, "m", mandatory=True))
+                for key in ("q", "gone")
+            ]
+            await asyncio.sleep(0)
+            connection._on_return(channel, MagicMock(exchange="", routing_key="gone"), None, b"m")
+            connection._on_confirm(_confirm(spec.Basic.Ack(delivery_tag=2, multiple=True)))
+            return await asyncio.gather(*publishes)
+
+        assert asyncio.run(scenario()) == ["ack", "returned"]
+        assert not connection._returned and not connection._mandatory
+
+    def test_concurrent_declares_are_coalesced(self):
+        """Test that identical in-flight declares share a single RPC."""
+        connection, channel = _connection_with_channel()
+
+        async def scenario():
+            declares = [asyncio.ensure_future(connection.queue_declare("q")) for _ in range(3)]
+            await asyncio.sleep(0)
+            callback = channel.queue_declare.call_args.kwargs["callback"]
+            callback(MagicMock(method=spec.Queue.DeclareOk(queue="q")))
+            await asyncio.gather(*declares)
+            # Later declares are answered from the declaration cache
+            await connection.queue_declare("q")
+
+        asyncio.run(scenario())
+
+        channel.queue_declare.assert_called_once()
+
+    def test_channel_close_fails_pending_publishes(self):
+        """Test that publishes awaiting confirms fail when the channel closes."""
+        connection, channel = _connection_with_channel()
+        reason = ChannelClosedByBroker(404, "NOT_FOUND - no exchange 'x' in vhost '/'")
+
+        async def scenario():
+            publish = asyncio.ensure_future(connection.publish("x", "", "m"))
+            await asyncio.sleep(0)
+            connection._fail_pending(reason)
+            await publish
+
+        connection.declared.add(connection.declared.key("queue", "q"))
+        with pytest.raises(ChannelClosedByBroker):
+            asyncio.run(scenario())
+        assert connection.declared.key("queue", "q") not in connection.declared
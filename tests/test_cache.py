@@ -0,0 +1,100 @@
+"""Tests for the management API cache."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from mcp_server_rabbitmq.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test the TTLCache class."""
+
+    def test_fresh_entries_are_hits(self):
+        """Test that a value is loaded once and served from cache until it expires."""
+        cache = TTLCache(ttl=5)
+        load = MagicMock(return_value=["queue1"])
+
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=100.0):
+            assert cache.get("queues", load) == ["queue1"]
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=104.0):
+            assert cache.get("queues", load) == ["queue1"]
+
+        load.assert_called_once()
+        assert cache.stats() == {
+            "hits": 1,
+            "stale_hits": 0,
+            "misses": 1,
+            "evictions": 0,
+            "size": 1,
+        }
+
+    def test_stale_entries_refresh_in_background(self):
+        """Test that a stale value is returned while a background reload replaces it."""
+        cache = TTLCache(ttl=5, stale_ttl=10)
+        reloaded = threading.Event()
+
+        def reload():
+            reloaded.set()
+            return ["queue2"]
+
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=100.0):
+            cache.get("queues", lambda: ["queue1"])
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=107.0):
+            assert cache.get("queues", reload) == ["queue1"]
+            assert reloaded.wait(1)
+            cache._executor.shutdown(wait=True)
+            assert cache.get("queues", reload) == ["queue2"]
+
+        assert cache.stale_hits == 1
+        assert cache.hits == 1
+        cache.close()
+
+    def test_expired_entries_reload_synchronously(self):
+        """Test that values past the stale window are reloaded before returning."""
+        cache = TTLCache(ttl=5, stale_ttl=10)
+
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=100.0):
+            cache.get("queues", lambda: ["queue1"])
+        with patch("mcp_server_rabbitmq.cache.time.monotonic", return_value=116.0):
+            assert cache.get("queues", lambda: ["queue2"]) == ["queue2"]
+
+        assert cache.misses == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted past max_size."""
+        cache = TTLCache(ttl=60, max_size=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+
+        load = MagicMock(return_value=2)
+        cache.get("b", load)
+
+        load.assert_called_once()
+        assert cache.evictions == 2
+
+    def test_invalidate_by_prefix(self):
+        """Test that invalidation drops matching keys and ignores loads already in flight."""
+        cache = TTLCache(ttl=60)
+        cache.get("queues", lambda: [])
+        cache.get("overview", lambda: {})
+
+        def load():
+            # A mutation lands while this read is on the wire
+            cache.invalidate("queues")
+            return ["outdated"]
+
+        cache.get("exchanges", load)
+        cache.invalidate("queues")
+
+        assert cache.stats()["size"] == 1
+        assert cache.get("exchanges", lambda: ["fresh"]) == ["fresh"]
+
+    def test_zero_ttl_disables_cache(self):
+        """Test that a TTL of zero always loads."""
+        cache = TTLCache(ttl=0)
+        load = MagicMock(return_value=[])
+        cache.get("queues", load)
+        cache.get("queues", load)
+        assert load.call_count == 2
@@ -0,0 +1,197 @@
+"""Tests for cluster node selection and failover."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from mcp_server_rabbitmq.admin import RabbitMQAdmin
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.cluster import ClusterNodes, Node, parse_nodes
+from mcp_server_rabbitmq.connection import RabbitMQConnection
+from tests.standin import StandInBroker, StandInManagementAPI
+
+
+def _nodes(count: int):
+    return [Node(f"node{i}", 5672) for i in range(count)]
+
+
+class TestParseNodes:
+    """Test the parse_nodes function."""
+
+    def test_hosts_and_ports(self):
+        """Test that hosts take the default port unless they give their own."""
+        nodes = parse_nodes("node1, node2:5673,[::1]:5674,[::2]", 5672)
+
+        assert [(n.host, n.port) for n in nodes] == [
+            ("node1", 5672),
+            ("node2", 5673),
+            ("::1", 5674),
+            ("::2", 5672),
+        ]
+        assert str(nodes[2]) == "[::1]:5674"
+
+    def test_no_hosts(self):
+        """Test that an empty host list is rejected."""
+        with pytest.raises(ValueError):
+            parse_nodes(" , ", 5672)
+
+
+class TestClusterNodes:
+    """Test the ClusterNodes class."""
+
+    def test_round_robin(self):
+        """Test that healthy nodes take turns being tried first."""
+        cluster = ClusterNodes(_nodes(3))
+
+        firsts = [str(cluster.candidates()[0]) for _ in range(4)]
+
+        assert firsts == ["node0:5672", "node1:5672", "node2:5672", "node0:5672"]
+
+    def test_least_latency(self):
+        """Test that the fastest node is preferred once every node has been measured."""
+        nodes = _nodes(3)
+        cluster = ClusterNodes(nodes, strategy="least-latency")
+        cluster.mark_success(nodes[0], 0.050)
+        cluster.mark_success(nodes[2], 0.010)
+
+        # Unmeasured nodes are tried first
+        assert cluster.candidates()[0] is nodes[1]
+
+        cluster.mark_success(nodes[1], 0.030)
+        assert cluster.candidates() == [nodes[2], nodes[1], nodes[0]]
+
+    def test_failed_nodes_go_last(self):
+        """Test that a failed node is only tried after the healthy ones."""
+        nodes = _nodes(3)
+        cluster = ClusterNodes(nodes)
+
+        cluster.mark_failure(nodes[0])
+
+        for _ in range(3):
+            assert cluster.candidates()[-1] is nodes[0]
+        assert [s["healthy"] for s in cluster.stats()] == [False, True, True]
+
+        # A successful request or health check restores it
+        cluster.mark_success(nodes[0], 0.001)
+        assert cluster.stats()[0]["healthy"]
+
+    def test_call_fails_over(self):
+        """Test that call moves on to the next node on a failover error only."""
+        nodes = _nodes(2)
+        cluster = ClusterNodes(nodes)
+        fn = MagicMock(side_effect=[ConnectionError("down"), "result"])
+
+        assert cluster.call(fn, failover=(ConnectionError,)) == "result"
+        assert fn.call_count == 2
+        assert cluster.stats()[0]["failures"] == 1
+
+        with pytest.raises(KeyError):
+            cluster.call(MagicMock(side_effect=KeyError("not a node problem")), (ConnectionError,))
+
+    def test_call_raises_last_error(self):
+        """Test that call raises the last error when every node fails."""
+        cluster = ClusterNodes(_nodes(2))
+
+        with pytest.raises(ConnectionError, match="second"):
+            cluster.call(
+                MagicMock(side_effect=[ConnectionError("first"), ConnectionError("second")]),
+                failover=(ConnectionError,),
+            )
+
+    def test_health_check(self):
+        """Test that a health check marks unreachable nodes down and reachable ones up."""
+        nodes = _nodes(2)
+        probe = MagicMock(side_effect=[None, OSError("refused")])
+        cluster = ClusterNodes(nodes, probe=probe, check_interval=0)
+        cluster.mark_failure(nodes[0])
+
+        cluster.check()
+
+        assert [s["healthy"] for s in cluster.stats()] == [True, False]
+
+
+class TestClusterFailover:
+    """Test failover between stand-in brokers and management APIs."""
+
+    def test_connections_spread_and_fail_over(self):
+        """Test that connections are spread across nodes and avoid a node that is down."""
+        with StandInBroker() as first, StandInBroker() as second:
+            rabbitmq = RabbitMQConnection(
+                [f"{first.host}:{first.port}", f"{second.host}:{second.port}"],
+                5672,
+                "guest",
+                "guest",
+                False,
+                health_check_interval=0,
+            )
+            for _ in range(4):
+                connection, _ = rabbitmq.get_channel()
+                connection.close()
+            assert (first.connections_opened, second.connections_opened) == (2, 2)
+
+            first.stop()
+            for _ in range(3):
+                connection, _ = rabbitmq.get_channel()
+                connection.close()
+
+            assert second.connections_opened == 5
+            assert [s["healthy"] for s in rabbitmq.nodes.stats()] == [False, True]
+
+    def test_async_connection_fails_over(self):
+        """Test that the asyncio connection opens on the next node when one is down."""
+        with StandInBroker() as first, StandInBroker() as second:
+            first.stop()
+            rabbitmq = RabbitMQConnection(
+                [f"{first.host}:{first.port}", f"{second.host}:{second.port}"],
+                5672,
+                "guest",
+                "guest",
+                False,
+                health_check_interval=0,
+            )
+            connection = AsyncRabbitMQConnection(rabbitmq, timeout=5)
+
+            async def publish():
+                await connection.queue_declare("cluster-queue")
+                acked = await connection.publish("", "cluster-queue", "m")
+                await connection.close()
+                return acked
+
+            assert asyncio.run(publish())
+            assert second.queue_depth("cluster-queue") == 1
+
+    def test_admin_fails_over(self):
+        """Test that management requests move to another node when one is down or failing."""
+        with (
+            StandInBroker() as broker,
+            StandInManagementAPI(broker) as first,
+            StandInManagementAPI(broker) as second,
+        ):
+            admin = RabbitMQAdmin(
+                [f"{first.host}:{first.port}", f"{second.host}:{second.port}"],
+                15672,
+                "guest",
+                "guest",
+                False,
+                cache_ttl=0,
+                max_retries=0,
+                health_check_interval=0,
+            )
+
+            # A 5xx answer sends the request to the other node
+            first.fail_next(503)
+            assert admin.get_overview()["rabbitmq_version"]
+            assert second.requests == 1
+
+            first.stop()
+            for _ in range(3):
+                admin.get_overview()
+            assert second.requests == 4
+            assert admin.nodes.stats()[0]["healthy"] is False
+
+            second.stop()
+            with pytest.raises(requests.ConnectionError):
+                admin.get_overview()
+            admin.close()
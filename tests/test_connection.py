@@ -3,8 +3,17 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pika import spec
+from pika.exceptions import ConnectionBlockedTimeout
 
-from mcp_server_rabbitmq.connection import RabbitMQConnection, validate_rabbitmq_name
+from mcp_server_rabbitmq.connection import (
+    DeclarationCache,
+    PooledConnection,
+    RabbitMQConnection,
+    RabbitMQConnectionPool,
+    validate_rabbitmq_name,
+)
+from mcp_server_rabbitmq.ratelimit import Throttled
 
 
 class TestRabbitMQConnection:
@@ -44,3 +53,347 @@ class TestValidation:
 
         with pytest.raises(ValueError):
             validate_rabbitmq_name("invalid*name", "Test")
+
+
+def _mock_rabbitmq():
+    """Build a RabbitMQConnection mock that hands out a fresh open connection per call."""
+    rabbitmq = MagicMock()
+
+    def get_channel():
+        connection = MagicMock()
+        connection.is_open = True
+        channel = MagicMock()
+        channel.is_open = True
+        return connection, channel
+
+    rabbitmq.get_channel.side_effect = get_channel
+    return rabbitmq
+
+
+class TestRabbitMQConnectionPool:
+    """Test the RabbitMQConnectionPool class."""
+
+    def test_connection_is_reused(self):
+        """Test that sequential leases reuse the same connection."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=2, heartbeat_interval=0)
+
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+
+        assert first is second
+        assert rabbitmq.get_channel.call_count == 1
+        assert pool.size == 1
+
+    def test_broken_connection_is_replaced(self):
+        """Test that a connection closed while idle is replaced on the next acquire."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=1, heartbeat_interval=0)
+
+        with pool.acquire() as first:
+            pass
+        first.connection.is_open = False
+
+        with pool.acquire() as second:
+            pass
+
+        assert second is not first
+        assert rabbitmq.get_channel.call_count == 2
+        assert pool.size == 1
+
+    def test_closed_channel_is_reopened(self):
+        """Test that a channel closed by a broker error is reopened on release."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=1, heartbeat_interval=0)
+
+        with pool.acquire() as pooled:
+            pooled.channel.is_open = False
+
+        pooled.connection.channel.assert_called_once()
+        assert pooled.channel is pooled.connection.channel.return_value
+
+    def test_declares_are_cached_per_connection(self):
+        """Test that repeated declares skip the RPC until the channel closes."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=1, heartbeat_interval=0)
+
+        with pool.acquire() as pooled:
+            channel = pooled.channel
+            pooled.queue_declare("q")
+            pooled.queue_declare("q")
+            # Different settings are a different declaration
+            pooled.queue_declare("q", durable=True)
+            pooled.exchange_declare("x", exchange_type="fanout")
+            pooled.exchange_declare("x", exchange_type="fanout")
+        assert channel.queue_declare.call_count == 2
+        channel.exchange_declare.assert_called_once_with(exchange="x", exchange_type="fanout")
+
+        # A broker error (e.g. NOT_FOUND) closes the channel and invalidates the cache
+        with pool.acquire() as pooled:
+            pooled.channel.is_open = False
+        with pool.acquire() as pooled:
+            pooled.queue_declare("q")
+        pooled.channel.queue_declare.assert_called_once_with("q")
+
+    def test_forget_declared(self):
+        """Test that forgotten queues are declared again by idle and leased connections."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=1, heartbeat_interval=0)
+
+        with pool.acquire() as pooled:
+            pooled.queue_declare("q")
+            pooled.exchange_declare("q")
+            pool.forget_declared("queue", "q")
+            pooled.queue_declare("q")
+            pooled.exchange_declare("q")
+        pool.forget_declared("queue", "q")
+        with pool.acquire() as pooled:
+            pooled.queue_declare("q")
+
+        assert pooled.channel.queue_declare.call_count == 3
+        pooled.channel.exchange_declare.assert_called_once()
+
+    def test_dedicated_connection_is_outside_the_pool(self):
+        """Test that a dedicated connection doesn't take a pooled one and is closed after use."""
+        rabbitmq = _mock_rabbitmq()
+        pool = RabbitMQConnectionPool(rabbitmq, max_size=1, heartbeat_interval=0)
+
+        with pool.dedicated() as dedicated:
+            with pool.acquire() as pooled:
+                assert pooled is not dedicated
+        assert pool.size == 1
+
+        dedicated.connection.close.assert_called_once()
+        pooled.connection.close.assert_not_called()
+        pool.close()
+        with pytest.raises(RuntimeError):
+            with pool.dedicated():
+                pass
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test that acquire gives up when every connection is leased."""
+        pool = RabbitMQConnectionPool(
+            _mock_rabbitmq(), max_size=1, heartbeat_interval=0, acquire_timeout=0.01
+        )
+
+        with pool.acquire():
+            with pytest.raises(TimeoutError):
+                with pool.acquire():
+                    pass
+
+    def test_close(self):
+        """Test that closing the pool closes its connections and rejects new leases."""
+        pool = RabbitMQConnectionPool(_mock_rabbitmq(), max_size=1, heartbeat_interval=0)
+        with pool.acquire() as pooled:
+            pass
+
+        pool.close()
+
+        pooled.connection.close.assert_called_once()
+        assert pool.size == 0
+        with pytest.raises(RuntimeError):
+            with pool.acquire():
+                pass
+
+    def test_blocked_timeout_is_throttled(self):
+        """Test that a connection torn down for staying blocked surfaces as Throttled."""
+        pool = RabbitMQConnectionPool(_mock_rabbitmq(), max_size=1, heartbeat_interval=0)
+
+        with pytest.raises(Throttled):
+            with pool.acquire():
+                raise ConnectionBlockedTimeout("Blocked connection timeout expired.")
+
+
+class TestDeclarationCache:
+    """Test the DeclarationCache class."""
+
+    def test_entries_expire(self):
+        """Test that cached declarations expire after the TTL."""
+        cache = DeclarationCache(ttl=60)
+        key = DeclarationCache.key("queue", "q", durable=True)
+
+        with patch("mcp_server_rabbitmq.connection.time.monotonic", return_value=1000.0):
+            cache.add(key)
+            assert key in cache
+            assert DeclarationCache.key("queue", "q") not in cache
+        with patch("mcp_server_rabbitmq.connection.time.monotonic", return_value=1061.0):
+            assert key not in cache
+
+    def test_zero_ttl_disables_cache(self):
+        """Test that a TTL of zero never caches."""
+        cache = DeclarationCache(ttl=0)
+        key = DeclarationCache.key("exchange", "x")
+        cache.add(key)
+        assert key not in cache
+
+    def test_forget(self):
+        """Test that forgetting a name drops its declarations of that kind only."""
+        cache = DeclarationCache(ttl=60)
+        keys = [
+            DeclarationCache.key("queue", "q"),
+            DeclarationCache.key("queue", "q", durable=True),
+            DeclarationCache.key("queue", "other"),
+            DeclarationCache.key("exchange", "q"),
+        ]
+        for key in keys:
+            cache.add(key)
+
+        cache.forget("queue", "q")
+        assert [key in cache for key in keys] == [False, False, True, True]
+        cache.forget("queue")
+        assert [key in cache for key in keys] == [False, False, False, True]
+
+
+class TestPublishConfirmed:
+    """Test pipelined publishing with publisher confirms."""
+
+    def test_confirms_are_matched_to_messages(self):
+        """Test that single and multiple acks/nacks map back to each message."""
+        connection = MagicMock()
+        channel = connection.channel.return_value
+        channel.is_open = True
+        callbacks = {}
+
+        def confirm_delivery(ack_nack_callback, callback):
+            callbacks["confirm"] = ack_nack_callback
+            callback(MagicMock())
+
+        channel._impl.confirm_delivery.side_effect = confirm_delivery
+
+        def process_data_events(time_limit):
+            # The broker acks 1-2 together, nacks 3 and acks 4
+            confirm = callbacks["confirm"]
+            confirm(MagicMock(method=spec.Basic.Ack(delivery_tag=2, multiple=True)))
+            confirm(MagicMock(method=spec.Basic.Nack(delivery_tag=3)))
+            confirm(MagicMock(method=spec.Basic.Ack(delivery_tag=4)))
+
+        connection.process_data_events.side_effect = process_data_events
+        pooled = PooledConnection(connection, MagicMock())
+        publishes = [("", "q", f"m{i}", None) for i in range(4)]
+
+        results = pooled.publish_confirmed(publishes)
+
+        assert results == ["ack", "ack", "nack", "ack"]
+        assert channel.basic_publish.call_count == 4
+        channel.close.assert_called_once()
+
+    def test_returned_messages_are_not_delivered(self):
+        """Test that mandatory messages the broker returns as unroutable are reported returned."""
+        connection = MagicMock()
+        channel = connection.channel.return_value
+        channel.is_open = True
+        callbacks = {}
+
+        def confirm_delivery(ack_nack_callback, callback):
+            callbacks["confirm"] = ack_nack_callback
+            callback(MagicMock())
+
+        channel._impl.confirm_delivery.side_effect = confirm_delivery
+        channel._impl.add_on_return_callback.side_effect = lambda cb: callbacks.update(back=cb)
+
+        def process_data_events(time_limit):
+            # The second message to "gone" is returned just before the broker acks everything
+            returned = MagicMock(exchange="", routing_key="gone")
+            callbacks["back"](channel, returned, None, b"m")
+            confirm = callbacks["confirm"]
+            confirm(MagicMock(method=spec.Basic.Ack(delivery_tag=3, multiple=True)))
+
+        connection.process_data_events.side_effect = process_data_events
+        pooled = PooledConnection(connection, MagicMock())
+        publishes = [("", "q", "m", None), ("", "gone", "m", None), ("", "gone", "m", None)]
+
+        results = pooled.publish_confirmed(publishes, mandatory=True)
+
+        assert results == ["ack", "returned", "ack"]
+        assert channel.basic_publish.call_args.args[-1] is True
+
+    def test_unconfirmed_after_timeout(self):
+        """Test that messages without a confirm are reported as unconfirmed."""
+        connection = MagicMock()
+        channel = connection.channel.return_value
+        channel.is_open = True
+        channel._impl.confirm_delivery.side_effect = lambda ack_nack_callback, callback: callback(
+            MagicMock()
+        )
+        pooled = PooledConnection(connection, MagicMock())
+
+        results = pooled.publish_confirmed([("", "q", "m", None)], timeout=0.01)
+
+        assert results == ["unconfirmed"]
+
+
+class TestFlowControl:
+    """Test how pooled connections follow the broker's Connection.Blocked notifications."""
+
+    def test_wait_unblocked(self):
+        """Test that a publish waits for Connection.Unblocked, up to the blocked timeout."""
+        connection = MagicMock()
+        pooled = PooledConnection(connection, MagicMock(), blocked_timeout=0.05)
+        on_blocked = connection.add_on_connection_blocked_callback.call_args.args[0]
+        on_unblocked = connection.add_on_connection_unblocked_callback.call_args.args[0]
+
+        on_blocked(connection, MagicMock(method=spec.Connection.Blocked(reason="low on disk")))
+        with pytest.raises(Throttled, match="low on disk"):
+            pooled.wait_unblocked()
+
+        # The broker lifts the alarm while the publish waits
+        connection.process_data_events.side_effect = lambda time_limit: on_unblocked(
+            connection, MagicMock(method=spec.Connection.Unblocked())
+        )
+        pooled.wait_unblocked()
+        assert pooled.blocked is None
+
+
+class TestConsume:
+    """Test consuming through a prefetching consumer."""
+
+    def _consume(self, ready, bodies, **kwargs):
+        connection = MagicMock()
+        channel = connection.channel.return_value
+        channel.is_open = True
+        channel.queue_declare.return_value.method.message_count = ready
+        consumer = {}
+        channel.basic_consume.side_effect = lambda queue, callback: consumer.setdefault(
+            "callback", callback
+        )
+
+        def process_data_events(time_limit):
+            # The broker pushes every prefetched delivery at once
+            for tag, body in enumerate(bodies, start=1):
+                consumer["callback"](channel, spec.Basic.Deliver(delivery_tag=tag), None, body)
+
+        connection.process_data_events.side_effect = process_data_events
+        pooled = PooledConnection(connection, MagicMock())
+        return pooled.consume("q", **kwargs), channel
+
+    def test_consume_acks_in_batches(self):
+        """Test that consumed messages are acked with multiple-acks as they arrive."""
+        received, channel = self._consume(
+            5, [b"a", b"b", b"c", b"d", b"e"], max_messages=5, prefetch=4
+        )
+
+        assert [body for _, _, body in received] == [b"a", b"b", b"c", b"d", b"e"]
+        channel.basic_qos.assert_called_once_with(prefetch_count=4)
+        assert [c.args for c in channel.basic_ack.call_args_list] == [(2,), (4,), (5,)]
+        channel.basic_nack.assert_not_called()
+        channel.close.assert_called_once()
+
+    def test_peek_requeues_and_respects_limits(self):
+        """Test that peeked messages are requeued in one frame and max_bytes stops early."""
+        received, channel = self._consume(
+            10, [b"aaaa", b"bbbb", b"cccc"], max_messages=3, ack=False, max_bytes=9
+        )
+
+        assert [body for _, _, body in received] == [b"aaaa", b"bbbb"]
+        channel.basic_qos.assert_called_once_with(prefetch_count=3)
+        channel.basic_nack.assert_called_once_with(2, multiple=True, requeue=True)
+        channel.basic_ack.assert_not_called()
+
+    def test_empty_queue_returns_immediately(self):
+        """Test that nothing is consumed when no messages are ready."""
+        received, channel = self._consume(0, [], max_messages=10)
+
+        assert received == []
+        channel.basic_consume.assert_not_called()
@@ -1,94 +1,363 @@
 """Tests for the RabbitMQ handlers module."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pika
+import pytest
+from pika import BasicProperties
 
 from mcp_server_rabbitmq.handlers import (
+    handle_bulk_delete_exchanges,
+    handle_bulk_delete_queues,
+    handle_bulk_purge_queues,
+    handle_consume,
     handle_delete_exchange,
     handle_delete_queue,
-    handle_enqueue,
-    handle_fanout,
+    handle_enqueue_async,
+    handle_fanout_async,
     handle_get_exchange_info,
+    handle_get_exchanges_info,
     handle_get_queue_info,
+    handle_get_queues_info,
     handle_list_exchanges,
     handle_list_queues,
+    handle_peek,
+    handle_publish_async,
+    handle_publish_batch,
     handle_purge_queue,
+    handle_queue_trends,
+    handle_sample_exchange,
+    handle_topology_snapshot,
 )
+from mcp_server_rabbitmq.models import MessageProperties, PublishMessage
+from mcp_server_rabbitmq.server import RabbitMQMCPServer
 
 
 class TestQueueHandlers:
     """Test the queue-related handler functions."""
 
-    @patch("mcp_server_rabbitmq.handlers.RabbitMQConnection")
-    def test_handle_enqueue(self, mock_connection_class):
-        """Test that handle_enqueue correctly publishes a message to a queue."""
+    def test_handle_enqueue_declare_options(self):
+        """Test that passive, durable and arguments are passed through to the declare."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+
+        async def run():
+            await handle_enqueue_async(
+                mock_connection,
+                "test-queue",
+                "m",
+                durable=True,
+                arguments={"x-queue-type": "quorum"},
+            )
+            await handle_enqueue_async(
+                mock_connection, "test-queue", "m", passive=True, durable=True
+            )
+
+        asyncio.run(run())
+
+        assert mock_connection.queue_declare.await_args_list[0].kwargs == {
+            "durable": True,
+            "arguments": {"x-queue-type": "quorum"},
+        }
+        assert mock_connection.queue_declare.await_args_list[1].kwargs == {"passive": True}
+
+    def test_handle_enqueue_async(self):
+        """Test that handle_enqueue_async declares the queue and waits for the confirm."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+
+        asyncio.run(handle_enqueue_async(mock_connection, "test-queue", "test-message"))
+
+        mock_connection.queue_declare.assert_awaited_once_with("test-queue")
+        mock_connection.publish.assert_awaited_once_with(
+            "", "test-queue", "test-message", None, mandatory=True
+        )
+
+    def test_handle_enqueue_async_redeclares_returned(self):
+        """Test that a message returned as unroutable is retried after declaring the queue."""
+        mock_connection = AsyncMock()
+        mock_connection.forget_declared = MagicMock()
+        mock_connection.publish.side_effect = ["returned", "ack"]
+
+        asyncio.run(handle_enqueue_async(mock_connection, "test-queue", "test-message"))
+
+        mock_connection.forget_declared.assert_called_once_with("queue", "test-queue")
+        assert mock_connection.queue_declare.await_count == 2
+        assert mock_connection.publish.await_count == 2
+
+        mock_connection.publish.side_effect = ["returned", "returned"]
+        with pytest.raises(RuntimeError, match="unroutable"):
+            asyncio.run(handle_enqueue_async(mock_connection, "test-queue", "test-message"))
+        # A nack is not retried
+        mock_connection.publish.side_effect = ["nack"]
+        with pytest.raises(RuntimeError, match="rejected"):
+            asyncio.run(handle_enqueue_async(mock_connection, "test-queue", "test-message"))
+
+    def test_handle_enqueue_async_structured(self):
+        """Test that a structured message is published as JSON with its properties."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+
+        asyncio.run(
+            handle_enqueue_async(
+                mock_connection,
+                "test-queue",
+                {"id": 1},
+                headers={"k": "v"},
+                properties=MessageProperties(delivery_mode=2),
+            )
+        )
+
+        _, _, body, properties = mock_connection.publish.await_args.args
+        assert body == b'{"id":1}'
+        assert properties.content_type == "application/json"
+        assert properties.headers == {"k": "v"}
+        assert properties.delivery_mode == 2
+
+    def test_handle_fanout_async(self):
+        """Test that handle_fanout_async declares the exchange and waits for the confirm."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+
+        asyncio.run(handle_fanout_async(mock_connection, "test-exchange", "test-message"))
+
+        mock_connection.exchange_declare.assert_awaited_once_with(
+            "test-exchange", exchange_type="fanout"
+        )
+        mock_connection.publish.assert_awaited_once_with("test-exchange", "", "test-message", None)
+
+    def test_handle_fanout_async_rejected(self):
+        """Test that handle_fanout_async fails when the broker nacks the message."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "nack"
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(handle_fanout_async(mock_connection, "test-exchange", "test-message"))
+
+        mock_connection.exchange_declare.assert_awaited_once_with(
+            "test-exchange", exchange_type="fanout"
+        )
+
+    def test_handle_publish_async_routing_keys(self):
+        """Test that handle_publish_async publishes the message once per routing key."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.side_effect = ["ack", "returned", asyncio.TimeoutError()]
+
+        result = asyncio.run(
+            handle_publish_async(
+                mock_connection,
+                "events",
+                "m",
+                ["a.created", "a.deleted", "b.created"],
+                exchange_type="topic",
+                durable=True,
+            )
+        )
+
+        mock_connection.exchange_declare.assert_awaited_once_with(
+            "events", exchange_type="topic", durable=True
+        )
+        keys = [call.args[1] for call in mock_connection.publish.await_args_list]
+        assert keys == ["a.created", "a.deleted", "b.created"]
+        assert (result["acked"], result["returned"], result["unconfirmed"]) == (1, 1, 1)
+        assert result["nacked"] == 0
+        # Only copies to queues through the default exchange are retried
+        assert mock_connection.publish.await_count == 3
+        assert result["results"][1] == {"routing_key": "a.deleted", "status": "returned"}
+
+    def test_handle_publish_async_declares(self):
+        """Test that predefined exchanges are only checked and queues declared for ''."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+
+        asyncio.run(handle_publish_async(mock_connection, "amq.topic", "m", ["k"]))
+        asyncio.run(handle_publish_async(mock_connection, "", "m", ["q1", "q2", "q1"]))
+
+        mock_connection.exchange_declare.assert_awaited_once_with("amq.topic", passive=True)
+        assert [c.args for c in mock_connection.queue_declare.await_args_list] == [
+            ("q1",),
+            ("q2",),
+        ]
+        with pytest.raises(ValueError):
+            asyncio.run(handle_publish_async(mock_connection, "events", "m", []))
+
+    def test_handle_publish_batch(self):
+        """Test that handle_publish_batch publishes every message and reports confirms."""
         # Setup mocks
-        mock_connection = MagicMock()
-        mock_channel = MagicMock()
-        mock_connection.get_channel.return_value = (mock_connection, mock_channel)
+        mock_pool = MagicMock()
+        mock_pooled = mock_pool.acquire.return_value.__enter__.return_value
+        # The returned message is retried once, after declaring its queue again
+        mock_pooled.publish_confirmed.side_effect = [
+            ["ack", "returned", "nack"],
+            ["returned"],
+        ]
+        messages = [
+            PublishMessage(body="first"),
+            PublishMessage(body="second", routing_key="other-queue", headers={"k": "v"}),
+            PublishMessage(body="third", properties={"delivery_mode": 2}),
+        ]
 
         # Call the function
-        handle_enqueue(mock_connection, "test-queue", "test-message")
+        result = handle_publish_batch(mock_pool, messages, routing_key="test-queue")
 
-        # Verify the expected calls were made
-        mock_connection.get_channel.assert_called_once()
-        mock_channel.queue_declare.assert_called_once_with("test-queue")
-        mock_channel.basic_publish.assert_called_once_with(
-            exchange="", routing_key="test-queue", body="test-message"
-        )
-        mock_connection.close.assert_called_once()
+        # Verify queues were declared once each and the batch went out in one call
+        assert [c.args for c in mock_pooled.queue_declare.call_args_list] == [
+            ("other-queue",),
+            ("test-queue",),
+            ("other-queue",),
+        ]
+        mock_pooled.declared.forget.assert_called_once_with("queue", "other-queue")
+        first, retry = mock_pooled.publish_confirmed.call_args_list
+        assert first.kwargs["mandatory"] is True
+        assert [p[2] for p in retry.args[0]] == ["second"]
+        publishes = first.args[0]
+        assert [(p[0], p[1], p[2]) for p in publishes] == [
+            ("", "test-queue", "first"),
+            ("", "other-queue", "second"),
+            ("", "test-queue", "third"),
+        ]
+        assert publishes[1][3].headers == {"k": "v"}
+        assert publishes[2][3].delivery_mode == 2
+
+        # Verify the per-message results
+        assert result["published"] == 3
+        assert (result["acked"], result["nacked"], result["returned"]) == (1, 1, 1)
+        assert result["unconfirmed"] == 0
+        assert [r["status"] for r in result["results"]] == ["ack", "returned", "nack"]
+
+    def test_handle_publish_batch_to_exchange(self):
+        """Test that publishing a batch to a named exchange declares no queues."""
+        mock_pool = MagicMock()
+        mock_pooled = mock_pool.acquire.return_value.__enter__.return_value
+        mock_pooled.publish_confirmed.return_value = ["ack"]
 
-    @patch("mcp_server_rabbitmq.handlers.RabbitMQConnection")
-    def test_handle_fanout(self, mock_connection_class):
-        """Test that handle_fanout correctly publishes a message to an exchange."""
+        handle_publish_batch(mock_pool, [PublishMessage(body="m")], exchange="test-exchange")
+
+        mock_pooled.queue_declare.assert_not_called()
+        publishes = mock_pooled.publish_confirmed.call_args.args[0]
+        assert publishes[0][:3] == ("test-exchange", "", "m")
+
+    def test_handle_consume(self):
+        """Test that handle_consume returns bodies, delivery info and set properties."""
         # Setup mocks
-        mock_connection = MagicMock()
-        mock_channel = MagicMock()
-        mock_connection.get_channel.return_value = (mock_connection, mock_channel)
+        mock_pool = MagicMock()
+        mock_pooled = mock_pool.acquire.return_value.__enter__.return_value
+        method = MagicMock(exchange="ex", routing_key="rk", redelivered=False)
+        mock_pooled.consume.return_value = [
+            (method, BasicProperties(content_type="text/plain"), b"hello"),
+            (method, BasicProperties(), b"\xff\x00"),
+        ]
 
         # Call the function
-        handle_fanout(mock_connection, "test-exchange", "test-message")
+        result = handle_consume(mock_pool, "test-queue", max_messages=2, timeout=1.0)
 
-        # Verify the expected calls were made
-        mock_connection.get_channel.assert_called_once()
-        mock_channel.exchange_declare.assert_called_once_with(
-            exchange="test-exchange", exchange_type="fanout"
-        )
-        mock_channel.basic_publish.assert_called_once_with(
-            exchange="test-exchange", routing_key="", body="test-message"
+        # Verify the result
+        mock_pooled.consume.assert_called_once_with(
+            "test-queue", 2, ack=True, prefetch=None, max_bytes=None, timeout=1.0
         )
-        mock_connection.close.assert_called_once()
+        assert result["count"] == 2
+        assert result["bytes"] == 7
+        assert result["messages"][0] == {
+            "exchange": "ex",
+            "routing_key": "rk",
+            "redelivered": False,
+            "properties": {"content_type": "text/plain"},
+            "body": "hello",
+        }
+        assert result["messages"][1]["body"] == "/wA="
+        assert result["messages"][1]["body_encoding"] == "base64"
+
+    def test_handle_peek(self):
+        """Test that handle_peek consumes without acknowledging."""
+        # Setup mocks
+        mock_pool = MagicMock()
+        mock_pooled = mock_pool.acquire.return_value.__enter__.return_value
+        mock_pooled.consume.return_value = []
+
+        # Call the function
+        result = handle_peek(mock_pool, "test-queue", max_bytes=100)
+
+        # Verify the result
+        assert result["acked"] is False
+        assert mock_pooled.consume.call_args.kwargs["ack"] is False
+        assert mock_pooled.consume.call_args.kwargs["max_bytes"] == 100
 
     def test_handle_list_queues(self):
-        """Test that handle_list_queues correctly returns queue names."""
+        """Test that handle_list_queues returns one page of queue names."""
         # Setup mock
         mock_admin = MagicMock()
-        mock_admin.list_queues.return_value = [
-            {"name": "queue1", "other_field": "value1"},
-            {"name": "queue2", "other_field": "value2"},
-        ]
+        mock_admin.list_queues.return_value = {
+            "items": [{"name": "queue1"}, {"name": "queue2"}],
+            "page": 2,
+            "page_count": 3,
+            "page_size": 2,
+            "item_count": 2,
+            "filtered_count": 6,
+            "total_count": 40000,
+        }
 
         # Call the function
-        result = handle_list_queues(mock_admin)
+        result = handle_list_queues(mock_admin, "/", 2, 2, "^orders-", True)
 
         # Verify the result
-        assert result == ["queue1", "queue2"]
-        mock_admin.list_queues.assert_called_once()
+        assert result == {
+            "names": ["queue1", "queue2"],
+            "page": 2,
+            "page_count": 3,
+            "filtered_count": 6,
+            "total_count": 40000,
+        }
+        mock_admin.list_queues.assert_called_once_with(
+            vhost="/",
+            page=2,
+            page_size=2,
+            name="^orders-",
+            use_regex=True,
+            columns=["name"],
+            disable_stats=True,
+        )
+
+    def test_handle_list_queues_streams_without_page(self):
+        """Test that handle_list_queues streams and filters every name when page is None."""
+        # Setup mock
+        mock_admin = MagicMock()
+        mock_admin.iter_queues.return_value = iter(
+            [{"name": "orders-1"}, {"name": "billing-1"}, {"name": "orders-2"}]
+        )
+
+        # Call the function
+        result = handle_list_queues(mock_admin, page=None, name="^orders-", use_regex=True)
+
+        # Verify the result
+        assert result == {"names": ["orders-1", "orders-2"], "filtered_count": 2}
+        mock_admin.iter_queues.assert_called_once_with(
+            vhost=None, columns=["name"], disable_stats=True
+        )
+        mock_admin.list_queues.assert_not_called()
 
     def test_handle_list_exchanges(self):
-        """Test that handle_list_exchanges correctly returns exchange names."""
+        """Test that handle_list_exchanges returns the first page of exchange names."""
         # Setup mock
         mock_admin = MagicMock()
-        mock_admin.list_exchanges.return_value = [
-            {"name": "exchange1", "other_field": "value1"},
-            {"name": "exchange2", "other_field": "value2"},
-        ]
+        mock_admin.list_exchanges.return_value = {
+            "items": [{"name": "exchange1"}, {"name": "exchange2"}],
+            "page": 1,
+            "page_count": 1,
+            "page_size": 100,
+            "item_count": 2,
+            "filtered_count": 2,
+            "total_count": 2,
+        }
 
         # Call the function
         result = handle_list_exchanges(mock_admin)
 
         # Verify the result
-        assert result == ["exchange1", "exchange2"]
-        mock_admin.list_exchanges.assert_called_once()
+        assert result["names"] == ["exchange1", "exchange2"]
+        assert mock_admin.list_exchanges.call_args.kwargs["page"] == 1
+        assert mock_admin.list_exchanges.call_args.kwargs["columns"] == ["name"]
 
     def test_handle_get_queue_info(self):
         """Test that handle_get_queue_info correctly returns queue information."""
@@ -112,6 +381,24 @@ class TestQueueHandlers:
         assert result == expected_result
         mock_admin.get_queue_info.assert_called_once_with("test-queue", "custom-vhost")
 
+    def test_handle_get_queue_info_fields(self):
+        """Test that handle_get_queue_info returns only the requested fields."""
+        mock_admin = MagicMock()
+        mock_admin.get_queue_info.return_value = {
+            "name": "test-queue",
+            "messages": 10,
+            "backing_queue_status": {"mode": "default", "q1": 0},
+            "message_stats": {"publish": 5, "publish_details": {"rate": 1.5}},
+        }
+
+        result = handle_get_queue_info(
+            mock_admin,
+            "test-queue",
+            fields=["messages", "message_stats.publish_details.rate", "missing"],
+        )
+
+        assert result == {"messages": 10, "message_stats": {"publish_details": {"rate": 1.5}}}
+
     def test_handle_delete_queue(self):
         """Test that handle_delete_queue correctly calls the admin method."""
         # Setup mock
@@ -191,3 +478,336 @@ class TestExchangeHandlers:
         # Verify the result
         assert result == expected_result
         mock_admin.get_exchange_info.assert_called_once_with("test-exchange", "custom-vhost")
+
+    def test_handle_sample_exchange_bindings(self):
+        """Test that the sample queue is bound to see everything the exchange routes."""
+        mock_pool = MagicMock()
+        pooled = mock_pool.dedicated.return_value.__enter__.return_value
+        pooled.sample.return_value = 0
+        mock_admin = MagicMock()
+
+        def bindings_for(exchange_type, **kwargs):
+            mock_admin.get_exchange_info.return_value = {"type": exchange_type}
+            handle_sample_exchange(mock_pool, mock_admin, "test-exchange", **kwargs)
+            return pooled.sample.call_args.args[1]
+
+        assert bindings_for("fanout") == [("", None)]
+        assert bindings_for("topic") == [("#", None)]
+        assert bindings_for("headers") == [("", {})]
+        assert bindings_for("topic", routing_keys=["a.*", "a.*"]) == [("a.*", None)]
+        mock_admin.get_bindings.return_value = [
+            {"routing_key": "eu", "arguments": {}},
+            {"routing_key": "eu", "arguments": {}},
+            {"routing_key": "us", "arguments": {}},
+        ]
+        assert bindings_for("direct") == [("eu", None), ("us", None)]
+        mock_admin.get_bindings.assert_called_with(exchange="test-exchange")
+
+        mock_admin.get_bindings.return_value = []
+        with pytest.raises(ValueError, match="no bindings"):
+            bindings_for("direct")
+        with pytest.raises(ValueError, match="Sample size"):
+            handle_sample_exchange(mock_pool, mock_admin, "test-exchange", sample_size=0)
+
+    def test_handle_sample_exchange_rates_exclude_setup(self):
+        """Test that the reported rates only cover the time spent consuming."""
+        mock_pool = MagicMock()
+        pooled = mock_pool.dedicated.return_value.__enter__.return_value
+        mock_admin = MagicMock()
+        mock_admin.get_exchange_info.return_value = {"type": "fanout"}
+
+        def sample(exchange, bindings, on_message, max_messages, duration, **kwargs):
+            # Connecting, declaring and binding the sample queue
+            time.sleep(0.3)
+            kwargs["on_consume"]()
+            on_message(MagicMock(routing_key=""), BasicProperties(), b"message")
+            return 0
+
+        pooled.sample.side_effect = sample
+        result = handle_sample_exchange(mock_pool, mock_admin, "test-exchange")
+
+        assert result["received"] == 1
+        assert result["elapsed_ms"] < 300
+        assert result["sample"][0]["received_after_ms"] < 300
+
+
+class TestTopologyHandlers:
+    """Test the topology handler functions."""
+
+    def test_handle_topology_snapshot(self):
+        """Test that listings are joined into an exchange -> binding -> queue graph."""
+        # Setup mock
+        mock_admin = MagicMock()
+        mock_admin.get_overview.return_value = {
+            "rabbitmq_version": "3.13.0",
+            "cluster_name": "rabbit@node",
+            "object_totals": {"queues": 2},
+            "queue_totals": {"messages": 5},
+            "listeners": [],
+        }
+        mock_admin.iter_exchanges.return_value = iter(
+            [{"name": "orders", "vhost": "/", "type": "topic", "durable": True}]
+        )
+        mock_admin.iter_queues.return_value = iter(
+            [
+                {"name": "eu", "vhost": "/", "durable": True, "messages": 5, "consumers": 1},
+                {"name": "other", "vhost": "/", "durable": False},
+            ]
+        )
+        mock_admin.iter_bindings.return_value = iter(
+            [
+                {
+                    "source": "",
+                    "vhost": "/",
+                    "destination": "eu",
+                    "destination_type": "queue",
+                    "routing_key": "eu",
+                    "arguments": {},
+                },
+                {
+                    "source": "orders",
+                    "vhost": "/",
+                    "destination": "eu",
+                    "destination_type": "queue",
+                    "routing_key": "eu.#",
+                    "arguments": {},
+                },
+            ]
+        )
+
+        # Call the function
+        result = handle_topology_snapshot(mock_admin, "/")
+
+        # Verify the result
+        assert result["overview"]["queue_totals"] == {"messages": 5}
+        assert "listeners" not in result["overview"]
+        assert result["vhosts"]["/"] == {
+            "exchanges": {
+                "orders": {
+                    "type": "topic",
+                    "durable": True,
+                    "bindings": [
+                        {"destination": "eu", "destination_type": "queue", "routing_key": "eu.#"}
+                    ],
+                }
+            },
+            "queues": {
+                "eu": {"durable": True, "messages": 5, "consumers": 1, "bound_from": ["orders"]},
+                "other": {"durable": False, "messages": 0, "consumers": 0},
+            },
+        }
+        mock_admin.iter_bindings.assert_called_once_with("/")
+
+
+class TestQueueTrendsHandlers:
+    """Test the queue trends handler."""
+
+    def test_handle_queue_trends(self):
+        """Test that the filters and limit are passed to the sampler."""
+        # Setup mock
+        mock_sampler = MagicMock()
+        mock_sampler.interval = 10.0
+        mock_sampler.last_error = None
+        mock_sampler.trends.return_value = (
+            2,
+            [{"vhost": "/", "name": "orders.us", "messages": 50}],
+        )
+
+        # Call the function
+        result = handle_queue_trends(
+            mock_sampler, vhost="/", name="^orders", use_regex=True, limit=1
+        )
+
+        # Verify the result
+        mock_sampler.trends.assert_called_once_with("/", "^orders", True, 1)
+        assert [q["name"] for q in result["queues"]] == ["orders.us"]
+        assert result["filtered_count"] == 2
+        assert result["interval_seconds"] == 10.0
+        with pytest.raises(ValueError, match="at least 1"):
+            handle_queue_trends(mock_sampler, limit=0)
+
+
+class TestBulkHandlers:
+    """Test the bulk admin handler functions."""
+
+    def test_handle_bulk_delete_queues_by_name(self):
+        """Test that every named queue is deleted and failures are reported per queue."""
+        # Setup mock
+        mock_admin = MagicMock()
+        mock_admin.pool_size = 4
+
+        def delete_queue(name, vhost):
+            if name == "gone":
+                raise RuntimeError("404 Not Found")
+
+        mock_admin.delete_queue.side_effect = delete_queue
+
+        # Call the function
+        result = handle_bulk_delete_queues(mock_admin, names=["a", "gone", "b", "a"], vhost="v")
+
+        # Verify the result
+        assert sorted(c.args for c in mock_admin.delete_queue.call_args_list) == [
+            ("a", "v"),
+            ("b", "v"),
+            ("gone", "v"),
+        ]
+        assert result["results"] == [
+            {"name": "a", "status": "deleted"},
+            {"name": "gone", "status": "failed", "error": "404 Not Found"},
+            {"name": "b", "status": "deleted"},
+        ]
+        assert (result["matched"], result["succeeded"], result["failed"]) == (3, 2, 1)
+
+    def test_handle_bulk_purge_queues_dry_run(self):
+        """Test that a dry run lists the matching queues without touching them."""
+        mock_admin = MagicMock()
+        mock_admin.pool_size = 4
+        mock_admin.iter_queues.return_value = iter(
+            [{"name": "tmp-1"}, {"name": "orders"}, {"name": "tmp-2"}]
+        )
+
+        result = handle_bulk_purge_queues(mock_admin, pattern="^tmp-", dry_run=True)
+
+        mock_admin.iter_queues.assert_called_once_with(
+            vhost="/", columns=["name"], disable_stats=True
+        )
+        mock_admin.purge_queue.assert_not_called()
+        assert [r["name"] for r in result["results"]] == ["tmp-1", "tmp-2"]
+        assert {r["status"] for r in result["results"]} == {"would be purged"}
+        assert (result["dry_run"], result["succeeded"]) == (True, 0)
+
+    def test_handle_bulk_delete_exchanges_skips_builtins(self):
+        """Test that a pattern never selects the default or amq.* exchanges."""
+        mock_admin = MagicMock()
+        mock_admin.pool_size = 4
+        mock_admin.iter_exchanges.return_value = iter(
+            [{"name": ""}, {"name": "amq.topic"}, {"name": "test.events"}]
+        )
+
+        result = handle_bulk_delete_exchanges(mock_admin, pattern=".*")
+
+        mock_admin.delete_exchange.assert_called_once_with("test.events", "/")
+        assert result["matched"] == 1
+
+    def test_handle_get_queues_info_names(self):
+        """Test that named queues are fetched one by one and missing ones reported."""
+        mock_admin = MagicMock()
+        mock_admin.pool_size = 4
+        not_found = Exception("404 Not Found")
+        not_found.response = MagicMock(status_code=404)
+
+        def get_queue_info(name, vhost):
+            if name == "gone":
+                raise not_found
+            if name == "broken":
+                raise RuntimeError("500 Internal Server Error")
+            return {"name": name, "messages": len(name), "message_stats": {}}
+
+        mock_admin.get_queue_info.side_effect = get_queue_info
+
+        result = handle_get_queues_info(
+            mock_admin, names=["a", "gone", "bb", "broken", "a"], fields=["name", "messages"]
+        )
+
+        assert result["columns"] == ["name", "messages"]
+        assert result["rows"] == [["a", 1], ["bb", 2]]
+        assert result["missing"] == ["gone"]
+        assert result["errors"] == [{"name": "broken", "error": "500 Internal Server Error"}]
+        assert result["requests"] == 4
+        assert result["truncated"] is False
+
+    def test_handle_get_exchanges_info_pattern(self):
+        """Test that a pattern is matched by the broker, one page of the listing at a time."""
+        mock_admin = MagicMock()
+        mock_admin.list_exchanges.side_effect = [
+            {"items": [{"name": "events", "type": "topic"}], "page_count": 2},
+            {"items": [{"name": "events.dlx", "type": "fanout"}], "page_count": 2},
+        ]
+
+        result = handle_get_exchanges_info(mock_admin, pattern="^events", fields=["name", "type"])
+
+        assert mock_admin.list_exchanges.call_args.kwargs == {
+            "page": 2,
+            "page_size": 500,
+            "name": "^events",
+            "use_regex": True,
+            "columns": ["name", "type"],
+        }
+        assert result["rows"] == [["events", "topic"], ["events.dlx", "fanout"]]
+        assert result["requests"] == 2
+        assert result["page_count"] == 2
+        assert result["truncated"] is False
+        mock_admin.get_exchange_info.assert_not_called()
+
+    def test_handle_get_queues_info_max_pages(self):
+        """Test that a pattern listing stops after max_pages and reports it was cut short."""
+        mock_admin = MagicMock()
+        mock_admin.list_queues.side_effect = lambda vhost, page, **kwargs: {
+            "items": [{"name": f"q{page}"}],
+            "page_count": 100,
+        }
+
+        result = handle_get_queues_info(mock_admin, pattern="^q", fields=["name"], max_pages=3)
+
+        assert mock_admin.list_queues.call_count == 3
+        assert result["rows"] == [["q1"], ["q2"], ["q3"]]
+        assert result["page_count"] == 100
+        assert result["truncated"] is True
+        with pytest.raises(ValueError, match="at least 1"):
+            handle_get_queues_info(mock_admin, pattern="^q", max_pages=0)
+
+    def test_handle_bulk_requires_names_or_pattern(self):
+        """Test that exactly one of names and pattern must be given."""
+        with pytest.raises(ValueError):
+            handle_bulk_delete_queues(MagicMock())
+        with pytest.raises(ValueError):
+            handle_bulk_delete_queues(MagicMock(), names=["a"], pattern="a")
+
+
+class TestPublishRouting:
+    """Test the publish tool against a stand-in broker that routes messages."""
+
+    def test_topic_and_headers_routing(self, broker):
+        """Test that one call reaches the queues bound by each routing key or header match."""
+        connection = pika.BlockingConnection(pika.ConnectionParameters(broker.host, broker.port))
+        channel = connection.channel()
+        channel.exchange_declare("events", exchange_type="topic")
+        channel.exchange_declare("by-region", exchange_type="headers")
+        for queue, exchange, key, arguments in [
+            ("created", "events", "*.created", None),
+            ("orders", "events", "orders.#", None),
+            ("eu", "by-region", "", {"x-match": "all", "region": "eu"}),
+        ]:
+            channel.queue_declare(queue)
+            channel.queue_bind(queue, exchange, key, arguments)
+        connection.close()
+        server = RabbitMQMCPServer(broker.host, broker.port, "guest", "guest", False, 15672)
+
+        async def run():
+            tools = await server.mcp.get_tools()
+            topic = await tools["publish"].run(
+                {
+                    "exchange": "events",
+                    "exchange_type": "topic",
+                    "message": "m",
+                    "routing_keys": ["orders.created", "users.created", "orders.paid"],
+                }
+            )
+            for region in ("eu", "us"):
+                await tools["publish"].run(
+                    {
+                        "exchange": "by-region",
+                        "exchange_type": "headers",
+                        "message": "m",
+                        "headers": {"region": region},
+                    }
+                )
+            await server.aclose()
+            return topic.structured_content
+
+        result = asyncio.run(run())
+
+        assert result["acked"] == 3
+        assert broker.queue_depth("created") == 2
+        assert broker.queue_depth("orders") == 2
+        assert broker.queue_depth("eu") == 1
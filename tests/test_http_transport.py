@@ -0,0 +1,132 @@
+"""Tests for serving many clients over the streamable HTTP transport."""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+from fastmcp import Client
+
+from mcp_server_rabbitmq.server import RabbitMQMCPServer
+from tests.standin import StandInBroker, StandInManagementAPI
+from tests.standin.net import StartGate, free_port
+
+# Seconds every management API request takes in these tests
+API_LATENCY = 0.3
+
+
+async def _serve(server: RabbitMQMCPServer, port: int) -> asyncio.Task:
+    task = asyncio.create_task(
+        server.mcp.run_http_async(
+            show_banner=False,
+            transport="streamable-http",
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    # Wait for uvicorn to accept connections
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return task
+    raise TimeoutError("HTTP transport didn't start")
+
+
+class TestStreamableHTTP:
+    """Test concurrent MCP clients of one server over streamable HTTP."""
+
+    def test_concurrent_clients(self):
+        """Test that slow broker calls of several clients run in parallel on the worker pool,
+        and that a publish from another client isn't held up behind them."""
+        with StandInBroker() as broker, StandInManagementAPI(broker) as api:
+            api.latency = API_LATENCY
+            server = RabbitMQMCPServer(
+                broker.host,
+                broker.port,
+                api.username,
+                api.password,
+                False,
+                api.port,
+                api_cache_ttl=0,
+                workers=8,
+            )
+            port = free_port()
+
+            async def slow_client(ready: StartGate) -> dict:
+                async with Client(f"http://127.0.0.1:{port}/mcp/") as client:
+                    await ready.wait()
+                    result = await client.call_tool("list_queues", {})
+                    return result.structured_content
+
+            async def publishing_client(ready: StartGate) -> float:
+                async with Client(f"http://127.0.0.1:{port}/mcp/") as client:
+                    await client.call_tool("enqueue", {"queue": "http-queue", "message": "warm"})
+                    await ready.wait()
+                    # Let the slow clients' calls start before timing the publish
+                    await asyncio.sleep(API_LATENCY / 3)
+                    start = time.perf_counter()
+                    await client.call_tool("enqueue", {"queue": "http-queue", "message": "m"})
+                    return time.perf_counter() - start
+
+            async def run():
+                task = await _serve(server, port)
+                try:
+                    ready = StartGate(10)
+                    calls = asyncio.gather(
+                        *(slow_client(ready) for _ in range(8)), publishing_client(ready)
+                    )
+                    # Time the calls, not the clients connecting
+                    await ready.wait()
+                    start = time.perf_counter()
+                    *listings, publish_time = await calls
+                    return listings, publish_time, time.perf_counter() - start
+                finally:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    await server.aclose()
+
+            listings, publish_time, elapsed = asyncio.run(run())
+
+            assert all(listing["total_count"] == 1 for listing in listings)
+            assert broker.queue_depth("http-queue") == 2
+            # One after another, the eight listings would take 8 * API_LATENCY
+            assert elapsed < 4 * API_LATENCY
+            assert publish_time < API_LATENCY
+
+
+class TestRunAsync:
+    """Test the transport options handed to FastMCP."""
+
+    def _run(self, **overrides) -> AsyncMock:
+        server = RabbitMQMCPServer("localhost", 5672, "guest", "guest", False, 15672)
+        server.mcp.run_async = AsyncMock()
+        args = argparse.Namespace(
+            transport="stdio",
+            sse=False,
+            server_host="127.0.0.1",
+            server_port=8888,
+            stateless_http=False,
+        )
+        for name, value in overrides.items():
+            setattr(args, name, value)
+        asyncio.run(server.run_async(args))
+        return server.mcp.run_async
+
+    def test_stateless_http_only_for_streamable_http(self):
+        """Test that stateless_http is passed to streamable HTTP but not to SSE."""
+        run = self._run(transport="streamable-http", stateless_http=True)
+        run.assert_awaited_once_with(
+            transport="streamable-http", host="127.0.0.1", port=8888, stateless_http=True
+        )
+
+        run = self._run(sse=True, stateless_http=True)
+        run.assert_awaited_once_with(transport="sse", host="127.0.0.1", port=8888)
+
+    def test_stdio(self):
+        """Test that stdio takes no HTTP options."""
+        self._run().assert_awaited_once_with()
@@ -0,0 +1,370 @@
+"""Tests of the handlers through pika and the management API client, against the stand-ins."""
+
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.handlers import (
+    handle_bulk_delete_queues,
+    handle_consume,
+    handle_delete_queue,
+    handle_enqueue_async,
+    handle_get_exchange_info,
+    handle_get_queue_info,
+    handle_get_queues_info,
+    handle_list_queues,
+    handle_peek,
+    handle_publish_batch,
+    handle_purge_queue,
+    handle_sample_exchange,
+    handle_topology_snapshot,
+)
+from mcp_server_rabbitmq.models import MessageProperties, PublishMessage
+from mcp_server_rabbitmq.server import RabbitMQMCPServer
+
+
+def _setup(pool, queues=(), bindings=()):
+    """Declare queues, and bind them with ``(queue, exchange, exchange type, routing key)``"""
+    with pool.acquire() as pooled:
+        for queue in queues:
+            pooled.channel.queue_declare(queue)
+        for queue, exchange, exchange_type, routing_key in bindings:
+            pooled.channel.exchange_declare(exchange, exchange_type=exchange_type)
+            pooled.channel.queue_bind(queue, exchange, routing_key)
+
+
+class TestPublishingIntegration:
+    """Test publishing and reading messages over real AMQP connections."""
+
+    def test_enqueue_peek_and_consume(self, broker, pool, enqueue):
+        """Test that a structured message round-trips with its properties, and that peek
+        leaves it in the queue while consume removes it."""
+        enqueue(
+            "orders",
+            {"id": 1},
+            headers={"source": "test"},
+            properties=MessageProperties(delivery_mode=2, message_id="m-1"),
+        )
+
+        peeked = handle_peek(pool, "orders", timeout=1)
+        assert broker.queue_depth("orders") == 1
+        consumed = handle_consume(pool, "orders", timeout=1)
+
+        for result in (peeked, consumed):
+            (message,) = result["messages"]
+            assert json.loads(message["body"]) == {"id": 1}
+            assert message["routing_key"] == "orders"
+            assert message["properties"]["content_type"] == "application/json"
+            assert message["properties"]["headers"] == {"source": "test"}
+            assert message["properties"]["message_id"] == "m-1"
+        assert peeked["acked"] is False and consumed["acked"] is True
+        assert broker.queue_depth("orders") == 0
+
+    def test_compressed_body(self, broker, pool, enqueue):
+        """Test that a compressed message is read back as base64 with its content encoding."""
+        enqueue("logs", "x" * 1000, compression="gzip", compress_threshold=0)
+
+        (message,) = handle_consume(pool, "logs", timeout=1)["messages"]
+
+        assert message["body_encoding"] == "base64"
+        assert message["properties"]["content_encoding"] == "gzip"
+        assert gzip.decompress(base64.b64decode(message["body"])) == b"x" * 1000
+
+    def test_fanout_reaches_bound_queues(self, broker, pool, fanout):
+        """Test that a fanout publish is copied to every queue bound to the exchange."""
+        _setup(
+            pool,
+            queues=["audit", "mirror", "unbound"],
+            bindings=[("audit", "broadcast", "fanout", ""), ("mirror", "broadcast", "fanout", "")],
+        )
+
+        fanout("broadcast", "m")
+
+        assert broker.wait_for_depth("audit", 1) == broker.wait_for_depth("mirror", 1) == 1
+        assert broker.queue_depth("unbound") == 0
+
+    def test_publish_batch_confirms(self, broker, pool):
+        """Test that every message of a batch is confirmed and lands in its routing key's queue."""
+        messages = [PublishMessage(body=f"m{i}", routing_key=f"q{i % 2}") for i in range(50)]
+
+        result = handle_publish_batch(pool, messages)
+
+        assert (result["acked"], result["nacked"], result["unconfirmed"]) == (50, 0, 0)
+        assert broker.queue_depth("q0") == broker.queue_depth("q1") == 25
+        consumed = handle_consume(pool, "q0", max_messages=100, timeout=1)
+        assert [m["body"] for m in consumed["messages"]] == [f"m{i}" for i in range(0, 50, 2)]
+
+
+class TestDeletedQueuesIntegration:
+    """Test publishing to queues deleted after they were cached as declared."""
+
+    def test_enqueue_after_queue_deleted(self, broker, rabbitmq, admin):
+        """Test that enqueue declares a queue again when its message comes back unroutable."""
+        connection = AsyncRabbitMQConnection(rabbitmq, timeout=5)
+
+        async def run():
+            await handle_enqueue_async(connection, "gone", "first")
+            # Deleted behind the declaration cache, as by another client
+            admin.delete_queue("gone")
+            await handle_enqueue_async(connection, "gone", "second")
+            await connection.close()
+
+        asyncio.run(run())
+
+        assert broker.queue_depth("gone") == 1
+
+    def test_publish_batch_after_queue_deleted(self, broker, pool, admin):
+        """Test that batch messages returned as unroutable are retried after a declare."""
+        handle_publish_batch(pool, [PublishMessage(body="first")], routing_key="gone")
+        admin.delete_queue("gone")
+
+        result = handle_publish_batch(pool, [PublishMessage(body="second")], routing_key="gone")
+
+        assert result["acked"] == 1
+        assert broker.queue_depth("gone") == 1
+
+    def test_unroutable_batch_is_returned(self, broker, pool):
+        """Test that messages no queue receives are reported as returned, not acked."""
+        with pool.acquire() as pooled:
+            pooled.channel.exchange_declare("nowhere", exchange_type="direct")
+
+        result = handle_publish_batch(
+            pool, [PublishMessage(body="m")] * 3, exchange="nowhere", routing_key="none"
+        )
+
+        assert (result["acked"], result["nacked"], result["returned"]) == (0, 0, 3)
+        assert {r["status"] for r in result["results"]} == {"returned"}
+
+    def test_delete_tools_forget_declarations(self, broker, management_api):
+        """Test that deleting a queue through the server makes the next enqueue declare it."""
+        server = RabbitMQMCPServer(
+            broker.host, broker.port, "guest", "guest", False, management_api.port
+        )
+
+        async def run():
+            tools = await server.mcp.get_tools()
+            await tools["enqueue"].run({"queue": "tool-queue", "message": "first"})
+            await tools["delete_queue"].run({"queue": "tool-queue"})
+            declared = server.rabbitmq_async.declared
+            forgotten = declared.key("queue", "tool-queue") not in declared
+            await tools["enqueue"].run({"queue": "tool-queue", "message": "second"})
+            await server.aclose()
+            return forgotten
+
+        assert asyncio.run(run())
+        assert broker.queue_depth("tool-queue") == 1
+
+    def test_failed_tools_raise(self, broker, management_api):
+        """Test that write tools report a failure as a tool error, not as their result."""
+        server = RabbitMQMCPServer(
+            broker.host, broker.port, "guest", "guest", False, management_api.port
+        )
+        calls = [
+            ("enqueue", {"queue": "missing", "message": "m", "passive": True}),
+            ("fanout", {"exchange": "missing", "message": "m", "passive": True}),
+            ("delete_queue", {"queue": "missing"}),
+            ("purge_queue", {"queue": "missing"}),
+            ("delete_exchange", {"exchange": "missing"}),
+        ]
+
+        async def run():
+            tools = await server.mcp.get_tools()
+            errors = []
+            for tool, arguments in calls:
+                with pytest.raises(ToolError) as error:
+                    await tools[tool].run(arguments)
+                errors.append(str(error.value))
+            await server.aclose()
+            return errors
+
+        errors = asyncio.run(run())
+
+        assert all(error.startswith("Failed to") for error in errors)
+
+    def test_publishes_refresh_cached_queue_counts(self, broker, management_api):
+        """Test that queue info reflects this server's publishes despite the API cache."""
+        server = RabbitMQMCPServer(
+            broker.host, broker.port, "guest", "guest", False, management_api.port
+        )
+
+        async def run():
+            tools = await server.mcp.get_tools()
+            counts = []
+            for _ in range(2):
+                await tools["enqueue"].run({"queue": "counted", "message": "m"})
+                info = await tools["get_queue_info"].run({"queue": "counted"})
+                counts.append(info.structured_content["messages"])
+            await server.aclose()
+            return counts
+
+        assert asyncio.run(run()) == [1, 2]
+
+
+class TestAdminIntegration:
+    """Test the management handlers over HTTP."""
+
+    def test_list_queues_pages(self, pool, admin):
+        """Test paging and filtering of queue names."""
+        _setup(pool, queues=[f"jobs.{i}" for i in range(5)] + ["other"])
+
+        first = handle_list_queues(admin, page=1, page_size=2, name="jobs")
+        last = handle_list_queues(admin, page=3, page_size=2, name="jobs")
+        everything = handle_list_queues(admin, page=None)
+
+        assert first["names"] == ["jobs.0", "jobs.1"]
+        assert (first["page_count"], first["filtered_count"], first["total_count"]) == (3, 5, 6)
+        assert last["names"] == ["jobs.4"]
+        assert len(everything["names"]) == 6
+
+    def test_queue_and_exchange_info(self, broker, admin, enqueue, fanout):
+        """Test that queue and exchange details reflect what was published and declared."""
+        for i in range(3):
+            enqueue("info", f"m{i}")
+        fanout("info-exchange", "m")
+        broker.wait_for_depth("info", 3)
+
+        queue = handle_get_queue_info(admin, "info", fields=["name", "messages"])
+        exchange = handle_get_exchange_info(admin, "info-exchange")
+
+        assert queue == {"name": "info", "messages": 3}
+        assert exchange["type"] == "fanout"
+
+    def test_queues_info_table(self, broker, admin, management_api, enqueue):
+        """Test that a pattern takes one request and names report the missing ones."""
+        for i in range(3):
+            enqueue(f"table.{i}", "m")
+            broker.wait_for_depth(f"table.{i}", 1)
+        before = management_api.requests
+
+        by_pattern = handle_get_queues_info(admin, pattern="^table\\.")
+        requests = management_api.requests - before
+        by_name = handle_get_queues_info(
+            admin, names=["table.1", "nope"], fields=["name", "messages"]
+        )
+
+        assert requests == 1
+        assert [row[0] for row in by_pattern["rows"]] == ["table.0", "table.1", "table.2"]
+        assert by_pattern["rows"][0][by_pattern["columns"].index("messages")] == 1
+        assert by_name["rows"] == [["table.1", 1]]
+        assert by_name["missing"] == ["nope"]
+
+    def test_purge_and_delete(self, broker, admin, enqueue):
+        """Test that purge empties a queue and delete removes it."""
+        enqueue("scratch", "m")
+        enqueue("tmp.a", "m")
+        enqueue("tmp.b", "m")
+        broker.wait_for_depth("scratch", 1)
+
+        handle_purge_queue(admin, "scratch")
+        assert broker.queue_depth("scratch") == 0
+        handle_delete_queue(admin, "scratch")
+        result = handle_bulk_delete_queues(admin, pattern="^tmp\\.")
+
+        assert result["succeeded"] == 2
+        assert broker.queues == {}
+
+    def test_topology_snapshot(self, pool, admin):
+        """Test that bindings declared over AMQP show up in the topology graph."""
+        _setup(
+            pool,
+            queues=["created"],
+            bindings=[("created", "events", "topic", "*.created")],
+        )
+
+        snapshot = handle_topology_snapshot(admin)
+
+        graph = snapshot["vhosts"]["/"]
+        assert graph["exchanges"]["events"]["bindings"] == [
+            {"destination": "created", "destination_type": "queue", "routing_key": "*.created"}
+        ]
+        assert graph["queues"]["created"]["bound_from"] == ["events"]
+        assert snapshot["overview"]["object_totals"]["queues"] == 1
+
+
+class TestSampleExchangeIntegration:
+    """Test sampling the traffic of an exchange."""
+
+    def _publish_until(self, pool, done, exchange, routing_keys):
+        with pool.acquire() as pooled:
+            i = 0
+            while not done.is_set():
+                key = routing_keys[i % len(routing_keys)]
+                pooled.channel.basic_publish(exchange, key, f"{key}-{i}".encode())
+                i += 1
+                time.sleep(0.001)
+
+    def _sample(self, pool, admin, exchange, routing_keys, **kwargs):
+        done = threading.Event()
+        publisher = threading.Thread(
+            target=self._publish_until, args=(pool, done, exchange, routing_keys)
+        )
+        publisher.start()
+        try:
+            return handle_sample_exchange(pool, admin, exchange, **kwargs)
+        finally:
+            done.set()
+            publisher.join()
+
+    def test_topic_exchange(self, broker, pool, admin):
+        """Test that every routing key is seen, the sample is bounded and the queue removed."""
+        _setup(pool, queues=["created"], bindings=[("created", "events", "topic", "*.created")])
+
+        result = self._sample(
+            pool,
+            admin,
+            "events",
+            ["order.created", "order.updated"],
+            max_messages=50,
+            sample_size=5,
+            max_body_bytes=5,
+        )
+
+        assert result["type"] == "topic"
+        assert result["bindings"] == [{"routing_key": "#", "arguments": None}]
+        assert result["stopped"] == "max_messages"
+        assert result["received"] == 50
+        assert len(result["sample"]) == 5
+        assert all(message["truncated"] for message in result["sample"])
+        assert {entry["routing_key"] for entry in result["routing_keys"]} == {
+            "order.created",
+            "order.updated",
+        }
+        assert result["messages_per_second"] > 0
+        # The exchange's own queue still gets its copies, and the sample queue is gone
+        assert broker.queue_depth("created") > 0
+        assert set(broker.queues) == {"created"}
+
+    def test_direct_exchange_mirrors_bindings(self, broker, pool, admin):
+        """Test that a direct exchange is sampled on the routing keys its queues are bound with."""
+        _setup(
+            pool,
+            queues=["eu", "us"],
+            bindings=[("eu", "regions", "direct", "eu"), ("us", "regions", "direct", "us")],
+        )
+
+        result = self._sample(pool, admin, "regions", ["eu", "us", "asia"], duration=0.5)
+
+        assert [b["routing_key"] for b in result["bindings"]] == ["eu", "us"]
+        assert result["stopped"] == "duration"
+        assert result["received"] > 0
+        assert {entry["routing_key"] for entry in result["routing_keys"]} == {"eu", "us"}
+        assert set(broker.queues) == {"eu", "us"}
+
+    def test_sampling_leaves_the_pool_free(self, broker, pool, admin):
+        """Test that a sample runs on its own connection while every pooled one is leased."""
+        pool.acquire_timeout = 0.1
+        _setup(pool, queues=["created"], bindings=[("created", "events", "topic", "#")])
+
+        # The publisher holds one pooled connection and this test the other
+        with pool.acquire():
+            result = self._sample(pool, admin, "events", ["a"], max_messages=5)
+
+        assert result["received"] == 5
+        assert pool.size == 2
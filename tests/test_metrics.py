@@ -0,0 +1,112 @@
+"""Tests for the metrics module."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from mcp_server_rabbitmq.admin import RabbitMQAdmin
+from mcp_server_rabbitmq.metrics import (
+    HTTP_ERRORS,
+    TOOL_DURATION,
+    TOOL_ERRORS,
+    Counter,
+    Histogram,
+    Registry,
+    instrument_tool,
+)
+
+
+class TestHistogram:
+    """Test the Histogram and Counter classes."""
+
+    def test_prometheus_rendering(self):
+        """Test that buckets are cumulative and labels are escaped in the text format."""
+        registry = Registry()
+        histogram = registry.register(
+            Histogram("latency_seconds", "Latency", ["tool"], buckets=(0.1, 1.0))
+        )
+        counter = registry.register(Counter("errors_total", "Errors", ["tool"]))
+        histogram.observe(0.05, tool='a"b')
+        histogram.observe(0.5, tool='a"b')
+        histogram.observe(5.0, tool='a"b')
+        counter.inc(tool="x")
+
+        assert registry.render().splitlines() == [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{tool="a\\"b",le="0.1"} 1',
+            'latency_seconds_bucket{tool="a\\"b",le="1"} 2',
+            'latency_seconds_bucket{tool="a\\"b",le="+Inf"} 3',
+            'latency_seconds_sum{tool="a\\"b"} 5.55',
+            'latency_seconds_count{tool="a\\"b"} 3',
+            "# HELP errors_total Errors",
+            "# TYPE errors_total counter",
+            'errors_total{tool="x"} 1',
+        ]
+
+    def test_quantiles_interpolate_within_buckets(self):
+        """Test that snapshot percentiles are estimated from bucket counts."""
+        histogram = Histogram("latency_seconds", "Latency", buckets=(1.0, 2.0, 4.0))
+        for value in [0.5] * 50 + [1.5] * 45 + [3.0] * 5:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()["total"]
+
+        assert snapshot["count"] == 100
+        assert snapshot["p50"] == 1.0
+        assert snapshot["p95"] == 2.0
+        assert snapshot["p99"] == pytest.approx(3.6)
+
+
+class TestInstrumentTool:
+    """Test tool instrumentation."""
+
+    def test_sync_tool_failures_are_counted(self):
+        """Test that raised exceptions and "Failed" results both count as errors."""
+
+        def flaky(fail: bool) -> str:
+            if fail:
+                raise ValueError("boom")
+            return "Failed to do it"
+
+        tool = instrument_tool(flaky, name="test_flaky")
+        before = TOOL_ERRORS.value(tool="test_flaky")
+
+        assert tool(fail=False) == "Failed to do it"
+        with pytest.raises(ValueError):
+            tool(fail=True)
+
+        assert TOOL_ERRORS.value(tool="test_flaky") == before + 2
+        assert TOOL_DURATION.count(tool="test_flaky") >= 2
+
+    def test_async_tool_keeps_signature(self):
+        """Test that async tools stay coroutines with their original signature."""
+
+        async def ok(queue: str, count: int = 1) -> str:
+            return "done"
+
+        tool = instrument_tool(ok, name="test_ok")
+
+        assert asyncio.iscoroutinefunction(tool)
+        assert tool.__wrapped__ is ok
+        assert asyncio.run(tool("q")) == "done"
+        assert TOOL_ERRORS.value(tool="test_ok") == 0
+
+
+class TestHttpMetrics:
+    """Test management API instrumentation."""
+
+    def test_http_errors_are_counted_by_status(self):
+        """Test that error responses are recorded per endpoint and status code."""
+        admin = RabbitMQAdmin("localhost", 15672, "guest", "guest", False)
+        response = MagicMock(ok=False, status_code=404, content=b"{}")
+        response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+        before = HTTP_ERRORS.value(endpoint="exchanges", reason="404")
+
+        with patch.object(admin.session, "request", return_value=response):
+            with pytest.raises(requests.HTTPError):
+                admin.get_exchange_info("missing")
+
+        assert HTTP_ERRORS.value(endpoint="exchanges", reason="404") == before + 1
@@ -0,0 +1,118 @@
+"""Tests for message body encoding and compression."""
+
+import base64
+import gzip
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server_rabbitmq.models import MessageProperties
+from mcp_server_rabbitmq.payload import build_message, compress_body, encode_body
+
+
+class TestEncodeBody:
+    """Test the encode_body function."""
+
+    def test_text_is_unchanged(self):
+        """Test that a plain string is published as it is, without a content type."""
+        assert encode_body("hello") == ("hello", None)
+
+    def test_structured_payload_is_json(self):
+        """Test that objects and arrays are serialized as compact JSON."""
+        body, content_type = encode_body({"id": 1, "tags": ["a", "é"]})
+
+        assert content_type == "application/json"
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {"id": 1, "tags": ["a", "é"]}
+        assert b" " not in body
+
+    def test_json_without_orjson(self):
+        """Test that the stdlib encoder produces the same document when orjson is missing."""
+        with patch("mcp_server_rabbitmq.payload._orjson", return_value=None):
+            body, _ = encode_body([{"id": 1}, "é"])
+
+        assert body == '[{"id":1},"é"]'.encode("utf-8")
+
+    def test_base64_payload(self):
+        """Test that a base64 string is published as the bytes it encodes."""
+        raw = bytes(range(256))
+
+        body, content_type = encode_body(base64.b64encode(raw).decode(), "base64")
+
+        assert body == raw
+        assert content_type == "application/octet-stream"
+
+    def test_invalid_base64(self):
+        """Test that malformed base64 is rejected."""
+        with pytest.raises(ValueError, match="Invalid base64"):
+            encode_body("not base64!", "base64")
+
+
+class TestCompressBody:
+    """Test the compress_body function."""
+
+    def test_gzip_above_threshold(self):
+        """Test that a large body is gzipped and reports its content encoding."""
+        body = "x" * 4096
+
+        compressed, encoding = compress_body(body, "gzip", threshold=1024)
+
+        assert encoding == "gzip"
+        assert gzip.decompress(compressed) == body.encode()
+
+    def test_small_body_is_not_compressed(self):
+        """Test that bodies under the threshold are left alone."""
+        assert compress_body("x" * 100, "gzip", threshold=1024) == ("x" * 100, None)
+
+    def test_incompressible_body_is_not_compressed(self):
+        """Test that a body that would grow when compressed is published as it is."""
+        body = os.urandom(512)
+
+        assert compress_body(body, "gzip", threshold=0) == (body, None)
+
+    def test_zstd_requires_zstandard(self):
+        """Test that zstd fails clearly when the zstandard package is not installed."""
+        with patch("mcp_server_rabbitmq.payload._zstandard", return_value=None):
+            with pytest.raises(ValueError, match="zstandard"):
+                compress_body("x" * 4096, "zstd", threshold=0)
+
+
+class TestBuildMessage:
+    """Test the build_message function."""
+
+    def test_plain_text_has_no_properties(self):
+        """Test that a text message with no options is published exactly as before."""
+        assert build_message("hello") == ("hello", None)
+
+    def test_properties(self):
+        """Test that content type, encoding, headers and persistence end up on the message."""
+        body, properties = build_message(
+            {"data": "y" * 4096},
+            compression="gzip",
+            compress_threshold=1024,
+            headers={"source": "test"},
+            properties=MessageProperties(delivery_mode=2),
+        )
+
+        assert json.loads(gzip.decompress(body)) == {"data": "y" * 4096}
+        assert properties.content_type == "application/json"
+        assert properties.content_encoding == "gzip"
+        assert properties.headers == {"source": "test"}
+        assert properties.delivery_mode == 2
+
+    def test_explicit_content_type_wins(self):
+        """Test that a content type given in properties overrides the implied one."""
+        _, properties = build_message(
+            {"a": 1}, properties=MessageProperties(content_type="application/vnd.test+json")
+        )
+
+        assert properties.content_type == "application/vnd.test+json"
+
+    def test_content_encoding_conflicts_with_compression(self):
+        """Test that an explicit content_encoding can't be combined with compression."""
+        with pytest.raises(ValueError):
+            build_message(
+                "m", compression="gzip", properties=MessageProperties(content_encoding="br")
+            )
@@ -0,0 +1,170 @@
+"""Tests for publish rate limits and broker flow control."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mcp_server_rabbitmq.handlers import handle_enqueue_async, handle_publish_batch
+from mcp_server_rabbitmq.models import PublishMessage
+from mcp_server_rabbitmq.ratelimit import RateLimiter, Throttled, parse_rate_limit
+from mcp_server_rabbitmq.server import RabbitMQMCPServer
+from tests.standin import StandInBroker
+
+
+def _limiter(*specs: str) -> RateLimiter:
+    return RateLimiter([parse_rate_limit(spec) for spec in specs])
+
+
+class TestParseRateLimit:
+    """Test the parse_rate_limit function."""
+
+    def test_rate_and_burst(self):
+        """Test that the burst defaults to one second's worth of messages."""
+        assert parse_rate_limit("queue:orders.*=100:500")[1:] == ("orders.*", 100.0, 500.0)
+        assert parse_rate_limit("exchange:events=0.5").burst == 1.0
+
+    @pytest.mark.parametrize(
+        "spec", ["orders=10", "topic:orders=10", "queue:=10", "queue:orders", "queue:orders=0"]
+    )
+    def test_invalid(self, spec):
+        """Test that malformed limits are rejected."""
+        with pytest.raises(ValueError):
+            parse_rate_limit(spec)
+
+
+class TestRateLimiter:
+    """Test the RateLimiter class."""
+
+    def test_bucket_per_target(self):
+        """Test that every matching queue gets its own bucket and others aren't limited."""
+        limiter = _limiter("queue:orders.*=1:2")
+
+        with patch("mcp_server_rabbitmq.ratelimit.time.monotonic", return_value=100.0):
+            limiter.acquire({("queue", "orders.eu"): 2})
+            limiter.acquire({("queue", "orders.us"): 2})
+            limiter.acquire({("queue", "audit"): 1000})
+            with pytest.raises(Throttled) as throttled:
+                limiter.acquire({("queue", "orders.eu"): 1})
+
+        assert throttled.value.retry_after == 1.0
+        assert [b["name"] for b in limiter.stats()] == ["orders.eu", "orders.us"]
+
+    def test_refill(self):
+        """Test that tokens come back at the configured rate, up to the burst."""
+        limiter = _limiter("exchange:*=10:5")
+        clock = MagicMock(return_value=100.0)
+
+        with patch("mcp_server_rabbitmq.ratelimit.time.monotonic", clock):
+            limiter.acquire({("exchange", "events"): 5})
+            clock.return_value = 100.2
+            limiter.acquire({("exchange", "events"): 2})
+            with pytest.raises(Throttled):
+                limiter.acquire({("exchange", "events"): 1})
+            clock.return_value = 200.0
+            limiter.acquire({("exchange", "events"): 5})
+
+    def test_all_or_nothing(self):
+        """Test that a refused publish takes no tokens from the targets that had enough."""
+        limiter = _limiter("queue:a=1:5", "queue:b=1:1")
+
+        with patch("mcp_server_rabbitmq.ratelimit.time.monotonic", return_value=100.0):
+            with pytest.raises(Throttled):
+                limiter.acquire({("queue", "a"): 3, ("queue", "b"): 2})
+            limiter.acquire({("queue", "a"): 5})
+
+    def test_more_than_burst(self):
+        """Test that a batch larger than the burst is refused without a retry time."""
+        limiter = _limiter("queue:a=100:10")
+
+        with pytest.raises(Throttled, match="burst") as throttled:
+            limiter.acquire({("queue", "a"): 11})
+
+        assert throttled.value.retry_after is None
+
+
+class TestThrottledHandlers:
+    """Test that the publishing handlers honour rate limits and broker blocks."""
+
+    def test_enqueue_throttled(self):
+        """Test that a throttled enqueue never reaches the broker."""
+        mock_connection = AsyncMock()
+        mock_connection.publish.return_value = "ack"
+        limiter = _limiter("queue:q=1:1")
+
+        asyncio.run(handle_enqueue_async(mock_connection, "q", "m", rate_limiter=limiter))
+        with pytest.raises(Throttled):
+            asyncio.run(handle_enqueue_async(mock_connection, "q", "m", rate_limiter=limiter))
+
+        assert mock_connection.publish.await_count == 1
+
+    def test_publish_batch_counts_per_queue(self):
+        """Test that a batch takes one token per message from each target queue."""
+        mock_pool = MagicMock()
+        limiter = _limiter("queue:*=1:2")
+        messages = [PublishMessage(body="m", routing_key=key) for key in ("a", "a", "b", "b")]
+        mock_pool.acquire.return_value.__enter__.return_value.publish_confirmed.return_value = [
+            "ack"
+        ] * 4
+
+        handle_publish_batch(mock_pool, messages, rate_limiter=limiter)
+        with pytest.raises(Throttled):
+            handle_publish_batch(mock_pool, messages[:1], rate_limiter=limiter)
+
+        mock_pool.acquire.assert_called_once()
+
+
+class TestBrokerFlowControl:
+    """Test publishing to a stand-in broker that raises a resource alarm."""
+
+    def _server(self, broker: StandInBroker, **kwargs) -> RabbitMQMCPServer:
+        return RabbitMQMCPServer(
+            broker.host, broker.port, "guest", "guest", False, 15672, **kwargs
+        )
+
+    def test_blocked_publish_is_throttled(self):
+        """Test that publishes are refused after the blocked timeout instead of hanging."""
+        with StandInBroker() as broker:
+            server = self._server(broker, blocked_timeout=0.2)
+
+            async def run():
+                tools = await server.mcp.get_tools()
+                await tools["enqueue"].run({"queue": "alarm", "message": "before"})
+                broker.block("low on memory")
+                # Let the notification reach the client
+                await asyncio.sleep(0.1)
+                start = time.perf_counter()
+                enqueue = await tools["enqueue"].run({"queue": "alarm", "message": "during"})
+                elapsed = time.perf_counter() - start
+                batch = await tools["publish_batch"].run(
+                    {"messages": [{"body": "during", "routing_key": "alarm"}]}
+                )
+                await server.aclose()
+                return enqueue.content[0].text, elapsed, batch.structured_content
+
+            enqueue, elapsed, batch = asyncio.run(run())
+
+            assert enqueue.startswith("Throttled") and "low on memory" in enqueue
+            assert elapsed < 1.0
+            assert batch["throttled"] is True and batch["published"] == 0
+            assert broker.queue_depth("alarm") == 1
+
+    def test_publish_resumes_when_unblocked(self):
+        """Test that a publish waiting out a block goes through once the alarm clears."""
+        with StandInBroker() as broker:
+            server = self._server(broker, blocked_timeout=5.0)
+
+            async def run():
+                tools = await server.mcp.get_tools()
+                await tools["enqueue"].run({"queue": "alarm", "message": "before"})
+                broker.block()
+                await asyncio.sleep(0.1)
+                threading.Timer(0.2, broker.unblock).start()
+                result = await tools["enqueue"].run({"queue": "alarm", "message": "after"})
+                await server.aclose()
+                return result.content[0].text
+
+            assert asyncio.run(run()) == "Message successfully enqueued"
+            assert broker.queue_depth("alarm") == 2
@@ -0,0 +1,80 @@
+"""Tests for reservoir sampling of message streams."""
+
+import base64
+from collections import Counter
+
+import pytest
+
+from mcp_server_rabbitmq.reservoir import (
+    MAX_TRACKED_ROUTING_KEYS,
+    OTHER_ROUTING_KEYS,
+    MessageReservoir,
+    preview,
+)
+
+
+class TestPreview:
+    """Test the preview function."""
+
+    def test_text_and_binary(self):
+        """Test that UTF-8 bodies stay text and others are base64 encoded."""
+        assert preview(b"hello", 10) == {"size": 5, "truncated": False, "body": "hello"}
+        binary = preview(b"\xff\xfe\x00", 10)
+        assert base64.b64decode(binary["body"]) == b"\xff\xfe\x00"
+        assert binary["body_encoding"] == "base64"
+
+    def test_truncation_keeps_whole_characters(self):
+        """Test that a cut through a multi-byte character drops it instead of going binary."""
+        result = preview("ab€".encode(), 4)
+
+        assert result == {"size": 5, "truncated": True, "body": "ab"}
+
+
+class TestMessageReservoir:
+    """Test the MessageReservoir class."""
+
+    def test_keeps_a_bounded_sample(self):
+        """Test that only size messages are kept, with bodies cut, whatever goes by."""
+        reservoir = MessageReservoir(5, max_body_bytes=4, seed=1)
+        for i in range(10000):
+            reservoir.add(f"key.{i % 3}", {}, b"x" * (i % 100))
+
+        stats = reservoir.stats()
+        assert stats["received"] == 10000
+        assert stats["bytes"] == sum(i % 100 for i in range(10000))
+        assert stats["size"] == {"min": 0, "max": 99, "mean": 49.5}
+        assert len(stats["sample"]) == 5
+        assert all(len(message["body"]) <= 4 for message in stats["sample"])
+        indexes = [message["index"] for message in stats["sample"]]
+        assert indexes == sorted(indexes)
+        assert {entry["routing_key"] for entry in stats["routing_keys"]} == {
+            "key.0",
+            "key.1",
+            "key.2",
+        }
+
+    def test_sample_is_uniform(self):
+        """Test that early and late messages are equally likely to be kept."""
+        kept = Counter()
+        for seed in range(2000):
+            reservoir = MessageReservoir(2, max_body_bytes=0, seed=seed)
+            for _ in range(10):
+                reservoir.add("", {}, b"")
+            kept.update(message["index"] for message in reservoir.sample)
+
+        # Each of the 10 messages is expected 400 times out of 4000 kept
+        assert all(300 < kept[i] < 500 for i in range(10))
+
+    def test_routing_keys_are_capped(self):
+        """Test that routing keys past the tracked limit are counted together."""
+        reservoir = MessageReservoir(1, max_body_bytes=0)
+        for i in range(MAX_TRACKED_ROUTING_KEYS + 50):
+            reservoir.add(f"key.{i}", {}, b"")
+
+        assert len(reservoir.routing_keys) == MAX_TRACKED_ROUTING_KEYS + 1
+        assert reservoir.routing_keys[OTHER_ROUTING_KEYS] == 50
+
+    def test_invalid_size(self):
+        """Test that an empty reservoir is rejected."""
+        with pytest.raises(ValueError, match="at least 1"):
+            MessageReservoir(0, max_body_bytes=10)
@@ -0,0 +1,68 @@
+"""Tests for tool result shaping."""
+
+from mcp_server_rabbitmq.results import compact, name_filter, project, table
+
+
+class TestCompact:
+    """Test the compact function."""
+
+    def test_drops_null_and_zero_fields(self):
+        """Test that null, zero and empty fields are removed at every level."""
+        result = compact(
+            {
+                "name": "q",
+                "messages": 0,
+                "rate": 0.0,
+                "policy": None,
+                "arguments": {},
+                "durable": False,
+                "message_stats": {"publish": 3, "ack": 0, "deliver_details": {"rate": 0.0}},
+            }
+        )
+
+        assert result == {"name": "q", "durable": False, "message_stats": {"publish": 3}}
+
+    def test_list_elements_are_kept(self):
+        """Test that list elements survive even when they compact to nothing."""
+        assert compact([{"a": 0}, 0, {"b": 1}]) == [{}, 0, {"b": 1}]
+
+
+class TestProject:
+    """Test the project function."""
+
+    def test_no_fields(self):
+        """Test that the object is returned unchanged without fields."""
+        value = {"a": 1}
+
+        assert project(value, None) is value
+
+    def test_nested_fields(self):
+        """Test that dotted fields select nested values and missing ones are skipped."""
+        value = {"a": 1, "b": {"c": 2, "d": 3}, "e": 4}
+
+        assert project(value, ["a", "b.d", "b.x", "e.f"]) == {"a": 1, "b": {"d": 3}}
+
+
+class TestTable:
+    """Test the table function."""
+
+    def test_rows(self):
+        """Test that each object becomes a row, with null for fields it lacks."""
+        items = [{"name": "a", "stats": {"rate": 1.5}}, {"name": "b", "stats": None}]
+
+        assert table(items, ["name", "stats.rate", "messages"]) == {
+            "columns": ["name", "stats.rate", "messages"],
+            "rows": [["a", 1.5, None], ["b", None, None]],
+        }
+
+
+class TestNameFilter:
+    """Test the name_filter function."""
+
+    def test_substring_and_regex(self):
+        """Test that names match as substrings, or as regular expressions with use_regex."""
+        assert name_filter()("anything")
+        assert name_filter("ord")("orders.eu")
+        assert not name_filter("^ord")("orders.eu")
+        assert name_filter("^ord", use_regex=True)("orders.eu")
+        assert not name_filter("^ord", use_regex=True)("reorders")
@@ -0,0 +1,129 @@
+"""Tests for the queue depth sampler."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_server_rabbitmq.sampler import SAMPLE_COLUMNS, QueueSampler
+
+
+def _queue(name: str, messages: int, published: int = 0, delivered: int = 0) -> dict:
+    return {
+        "name": name,
+        "vhost": "/",
+        "messages": messages,
+        "messages_ready": messages,
+        "messages_unacknowledged": 0,
+        "consumers": 1,
+        "message_stats": {"publish": published, "deliver_get": delivered},
+    }
+
+
+def _sample(sampler: QueueSampler, at: float, *queues: dict) -> None:
+    sampler.admin.iter_queues.return_value = iter(queues)
+    with patch("mcp_server_rabbitmq.sampler.time.monotonic", return_value=at):
+        sampler.sample()
+
+
+class TestQueueSampler:
+    """Test the QueueSampler class."""
+
+    def test_one_listing_per_sample(self):
+        """Test that a sample is a single columns-filtered listing of all queues."""
+        sampler = QueueSampler(MagicMock())
+
+        _sample(sampler, 100.0, _queue("a", 5), _queue("b", 0))
+
+        sampler.admin.iter_queues.assert_called_once_with(columns=SAMPLE_COLUMNS)
+        trends = {t["name"]: t for t in sampler.trends()[1]}
+        assert trends["a"]["messages"] == 5
+        # One sample gives a depth but no rates yet
+        assert trends["a"]["trend"] is None
+        assert trends["a"]["publish_rate"] is None
+
+    def test_draining_queue(self):
+        """Test the rates and time to drain of a queue consumed faster than it is fed."""
+        sampler = QueueSampler(MagicMock())
+
+        _sample(sampler, 100.0, _queue("a", 1000, published=0, delivered=0))
+        _sample(sampler, 110.0, _queue("a", 900, published=50, delivered=150))
+        _sample(sampler, 120.0, _queue("a", 800, published=100, delivered=300))
+
+        _, (trend,) = sampler.trends()
+        assert trend["trend"] == "draining"
+        assert trend["depth_rate"] == -10.0
+        assert trend["publish_rate"] == 5.0
+        assert trend["deliver_rate"] == 15.0
+        assert trend["time_to_drain_seconds"] == 80.0
+        assert (trend["samples"], trend["window_seconds"]) == (3, 20.0)
+
+    def test_growing_and_steady_queues(self):
+        """Test that growth is reported without a time to drain, and flat depth as steady."""
+        sampler = QueueSampler(MagicMock())
+
+        _sample(sampler, 100.0, _queue("grow", 10), _queue("flat", 7))
+        _sample(sampler, 110.0, _queue("grow", 50), _queue("flat", 7))
+
+        trends = {t["name"]: t for t in sampler.trends()[1]}
+        assert trends["grow"]["trend"] == "growing"
+        assert trends["grow"]["time_to_drain_seconds"] is None
+        assert trends["flat"]["trend"] == "steady"
+
+    def test_history_and_deleted_queues(self):
+        """Test that only the last samples are kept and deleted queues are forgotten."""
+        sampler = QueueSampler(MagicMock(), history=2)
+
+        _sample(sampler, 100.0, _queue("a", 0), _queue("b", 0))
+        _sample(sampler, 110.0, _queue("a", 10))
+        _sample(sampler, 120.0, _queue("a", 20))
+
+        _, (trend,) = sampler.trends()
+        assert trend["name"] == "a"
+        assert (trend["samples"], trend["window_seconds"]) == (2, 10.0)
+
+    def test_failed_sample_keeps_history(self):
+        """Test that a failed listing is reported and leaves the previous samples alone."""
+        sampler = QueueSampler(MagicMock())
+        _sample(sampler, 100.0, _queue("a", 1))
+
+        sampler.admin.iter_queues.side_effect = ConnectionError("unreachable")
+        sampler.sample()
+
+        assert sampler.last_error == "unreachable"
+        assert sampler.trends()[0] == 1
+
+    def test_filters_and_limit(self):
+        """Test that only the deepest matching queues are returned, with the full match count."""
+        sampler = QueueSampler(MagicMock())
+        queues = [_queue(f"orders.{i}", i) for i in range(10)] + [_queue("audit", 100)]
+        _sample(sampler, 100.0, *queues)
+        _sample(sampler, 110.0, *queues)
+
+        count, trends = sampler.trends(name="^orders", use_regex=True, limit=3)
+
+        assert count == 10
+        assert [t["name"] for t in trends] == ["orders.9", "orders.8", "orders.7"]
+        assert all(t["samples"] == 2 for t in trends)
+        assert sampler.trends(vhost="other") == (0, [])
+        assert sampler.trends(name="aud")[0] == 1
+
+    def test_missing_counters(self):
+        """Test that counters the listing leaves out give no rates."""
+        sampler = QueueSampler(MagicMock())
+        bare = {"name": "a", "vhost": "/", "messages": 3}
+
+        _sample(sampler, 100.0, bare)
+        _sample(sampler, 110.0, bare)
+
+        _, (trend,) = sampler.trends()
+        assert trend["publish_rate"] is None
+        assert trend["deliver_rate"] is None
+        assert trend["messages_ready"] is None
+        assert trend["trend"] == "steady"
+
+    def test_invalid_settings(self):
+        """Test that the interval and history are validated."""
+        with pytest.raises(ValueError):
+            QueueSampler(MagicMock(), interval=0)
+        with pytest.raises(ValueError):
+            QueueSampler(MagicMock(), history=1)
@@ -0,0 +1,58 @@
+"""Tests for the startup cost of the server entry point."""
+
+import re
+import subprocess
+import sys
+
+# Self time of this package's own modules at import, well above the ~30 ms they take today
+# so that only a real regression (an eager heavy import, work done at import) trips it
+PACKAGE_IMPORT_BUDGET_MS = 250
+
+DEFERRED = ("pika", "requests", "urllib3", "orjson")
+
+# Optional payload codecs; httpx (through fastmcp) probes zstandard itself, so these are checked
+# against the payload module alone
+CODECS = ("orjson", "zstandard")
+
+
+def _import_times(module: str) -> dict:
+    """Self time in microseconds of every module imported by ``module``, in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$", line)
+        if match:
+            times[match.group(2)] = int(match.group(1))
+    return times
+
+
+class TestStartup:
+    """Test what importing the server costs."""
+
+    def test_broker_clients_are_not_imported(self):
+        """Test that pika, requests and orjson are only loaded once a tool needs them."""
+        times = _import_times("mcp_server_rabbitmq.server")
+
+        loaded = {name.split(".")[0] for name in times}
+        assert "mcp_server_rabbitmq" in loaded
+        assert loaded.isdisjoint(DEFERRED)
+
+    def test_payload_codecs_are_not_imported(self):
+        """Test that the payload module imports its optional codecs on first use."""
+        times = _import_times("mcp_server_rabbitmq.payload")
+
+        loaded = {name.split(".")[0] for name in times}
+        assert "mcp_server_rabbitmq" in loaded
+        assert loaded.isdisjoint(CODECS)
+
+    def test_package_import_budget(self):
+        """Test that the package's own modules stay within their import time budget."""
+        times = _import_times("mcp_server_rabbitmq.server")
+
+        own_us = sum(us for name, us in times.items() if name.startswith("mcp_server_rabbitmq"))
+        assert own_us / 1000 < PACKAGE_IMPORT_BUDGET_MS
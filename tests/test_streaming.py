@@ -0,0 +1,54 @@
+"""Tests for the streaming JSON parser."""
+
+import json
+
+import pytest
+
+from mcp_server_rabbitmq.streaming import iter_json_array
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestIterJsonArray:
+    """Test the iter_json_array function."""
+
+    def test_items_split_across_chunks(self):
+        """Test that items are decoded whatever the chunk boundaries."""
+        items = [
+            {"name": "queue-é", "messages": 12345, "arguments": {"x-max-length": [1, 2]}},
+            "text",
+            1.5e3,
+            -42,
+            True,
+            None,
+            [],
+        ]
+        data = json.dumps(items, ensure_ascii=False).encode()
+
+        for size in (1, 2, 3, 7, len(data)):
+            assert list(iter_json_array(_chunks(data, size))) == items
+
+    def test_items_are_yielded_before_the_response_ends(self):
+        """Test that items become available as soon as their bytes have arrived."""
+
+        def chunks():
+            yield b'[{"name": "queue1"}, '
+            raise AssertionError("read past the first item")
+
+        assert next(iter_json_array(chunks())) == {"name": "queue1"}
+
+    def test_empty_array(self):
+        """Test that an empty array yields nothing."""
+        assert list(iter_json_array([b" [ ", b"]\n"])) == []
+
+    def test_truncated_array_raises(self):
+        """Test that a response cut off mid-array is an error."""
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'[{"name": "queue1"}, {"na']))
+
+    def test_non_array_raises(self):
+        """Test that a top-level object is rejected."""
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"items": []}']))
@@ -0,0 +1,98 @@
+"""Throughput tests against the stand-ins.
+
+Time limits are loose enough for a slow CI machine; what the tests pin down is how many
+connections and round trips the publishing and management paths cost.
+"""
+
+import asyncio
+import time
+
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.handlers import (
+    handle_bulk_purge_queues,
+    handle_enqueue_async,
+    handle_get_queue_info,
+    handle_get_queues_info,
+    handle_publish_batch,
+)
+from mcp_server_rabbitmq.models import PublishMessage
+
+
+class TestPublishThroughput:
+    """Test the cost of publishing many messages."""
+
+    def test_async_enqueue_multiplexes(self, broker, rabbitmq):
+        """Test that concurrent async enqueues go over one connection and are all confirmed."""
+        connection = AsyncRabbitMQConnection(rabbitmq, timeout=10)
+
+        async def run():
+            await asyncio.gather(
+                *(handle_enqueue_async(connection, "async-bulk", f"m{i}") for i in range(200))
+            )
+            await connection.close()
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        assert broker.queue_depth("async-bulk") == 200
+        assert broker.connections_opened == 1
+        assert broker.declares == 1
+        assert elapsed < 10
+
+    def test_publish_batch(self, broker, pool):
+        """Test that a large batch is published and confirmed over a single connection."""
+        messages = [PublishMessage(body=f"m{i}") for i in range(2000)]
+
+        result = handle_publish_batch(pool, messages, routing_key="batch")
+
+        assert result["acked"] == 2000
+        assert broker.queue_depth("batch") == 2000
+        assert broker.connections_opened == 1
+        assert result["elapsed_ms"] < 10_000
+
+
+class TestManagementThroughput:
+    """Test the cost of many management API calls."""
+
+    def test_keep_alive(self, admin, management_api, enqueue):
+        """Test that repeated requests reuse one pooled HTTP connection."""
+        enqueue("info", "m")
+
+        for _ in range(100):
+            handle_get_queue_info(admin, "info")
+
+        assert management_api.requests == 100
+        assert management_api.connections == 1
+
+    def test_bulk_requests_run_in_parallel(self, broker, admin, management_api, enqueue):
+        """Test that bulk operations overlap slow requests instead of running them in turn."""
+        for i in range(16):
+            enqueue(f"slow-{i}", "m")
+        management_api.latency = 0.1
+
+        start = time.perf_counter()
+        result = handle_bulk_purge_queues(
+            admin, names=[f"slow-{i}" for i in range(16)], concurrency=8
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result["succeeded"] == 16
+        # One at a time the purges would take 16 * 0.1s
+        assert elapsed < 0.8
+
+    def test_queues_info_in_parallel(self, admin, management_api, enqueue):
+        """Test that named queues are looked up concurrently over the pooled session."""
+        names = [f"info-{i}" for i in range(16)]
+        for name in names:
+            enqueue(name, "m")
+        management_api.latency = 0.1
+
+        start = time.perf_counter()
+        result = handle_get_queues_info(admin, names=names, concurrency=8)
+        elapsed = time.perf_counter() - start
+
+        assert result["count"] == 16
+        # One at a time the lookups would take 16 * 0.1s
+        assert elapsed < 0.8
+        assert management_api.connections <= 8
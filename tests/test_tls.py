@@ -0,0 +1,99 @@
+"""Tests for TLS session resumption between broker connections."""
+
+import asyncio
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+from mcp_server_rabbitmq.async_connection import AsyncRabbitMQConnection
+from mcp_server_rabbitmq.connection import RabbitMQConnection, RabbitMQConnectionPool
+from mcp_server_rabbitmq.metrics import TLS_HANDSHAKES
+from mcp_server_rabbitmq.tls import ResumingSSLContext, amqp_ssl_context
+from tests.standin import StandInBroker
+
+
+@pytest.fixture(scope="module")
+def server_context(tmp_path_factory):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to make a test certificate")
+    directory = tmp_path_factory.mktemp("tls")
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        [
+            *("openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"),
+            *("-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def _handshakes(resumed: bool) -> float:
+    return TLS_HANDSHAKES.value(client="amqp", resumed=str(resumed).lower())
+
+
+class TestResumingSSLContext:
+    """Test the ResumingSSLContext class."""
+
+    def test_resumes_session(self, server_context):
+        """Test that the second connection to a server resumes the first one's session."""
+        listener = socket.create_server(("127.0.0.1", 0))
+
+        def serve():
+            for _ in range(3):
+                conn, _ = listener.accept()
+                with server_context.wrap_socket(conn, server_side=True) as tls:
+                    tls.recv(1)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        context = amqp_ssl_context()
+        reused = []
+        for _ in range(3):
+            sock = socket.create_connection(listener.getsockname())
+            with context.wrap_socket(sock) as tls:
+                reused.append(tls.session_reused)
+                tls.sendall(b"x")
+        thread.join(timeout=5)
+        listener.close()
+
+        assert isinstance(context, ResumingSSLContext)
+        assert reused == [False, True, True]
+
+
+class TestTLSConnections:
+    """Test AMQPS connections to a stand-in broker."""
+
+    def test_connections_share_the_context(self, server_context):
+        """Test that pooled and asyncio connections resume the TLS session of the first one."""
+        with StandInBroker(ssl_context=server_context) as broker:
+            rabbitmq = RabbitMQConnection(
+                broker.host, broker.port, "guest", "guest", True, health_check_interval=0
+            )
+            pool = RabbitMQConnectionPool(rabbitmq, max_size=2, heartbeat_interval=0)
+            full, resumed = _handshakes(False), _handshakes(True)
+
+            with pool.acquire() as first, pool.acquire() as second:
+                first.queue_declare("tls-queue")
+                second.queue_declare("tls-queue")
+            connection = AsyncRabbitMQConnection(rabbitmq, timeout=5)
+
+            async def publish():
+                acked = await connection.publish("", "tls-queue", "m")
+                await connection.close()
+                return acked
+
+            assert asyncio.run(publish())
+            pool.close()
+
+            assert broker.connections_opened == 3
+            assert _handshakes(False) - full == 1
+            assert _handshakes(True) - resumed == 2
+            assert rabbitmq.parameters.ssl_options.context is rabbitmq.ssl_context